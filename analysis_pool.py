@@ -0,0 +1,156 @@
+import os
+import time
+import threading
+import multiprocessing as mp
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, CancelledError
+from concurrent.futures.process import BrokenProcessPool
+
+from scoring import score_breakdown, calculate_score, local_text_analysis, get_keyword_matcher
+from cover_letter import generate_template_application
+
+# ---------------------------------------------------------
+# PROSESSIPOOLI (raskas tekstianalyysi Streamlit-säikeen ulkopuolella)
+# ---------------------------------------------------------
+
+CHUNK_SIZE = 25             # pieni erä: tulokset virtaavat tasaisesti ja peruutus tehoaa nopeasti
+POOL_MIN_CHARS = 20_000     # tätä pidemmät yksittäiset tekstit analysoidaan poolissa
+
+
+@lru_cache(maxsize=8)
+def _cv_terms(cv_text):
+    """CV:n avainsanat; sama CV vertaillaan satoihin ilmoituksiin, joten se jäsennetään kerran per työntekijä."""
+    return frozenset(t for terms in get_keyword_matcher().terms_by_group(cv_text).values() for t in terms)
+
+
+def match_cv(cv_text, posting, with_template=False):
+    """Vertaa CV:tä yhteen ilmoitukseen: pisteet, yhteiset ja puuttuvat avainsanat (ja halutessa hakemuspohja)."""
+    title, description = posting.get("title", ""), posting.get("description", "")
+    score, hits = score_breakdown(title, posting.get("location", ""), description)
+    wanted = {t for terms in hits.values() for t in terms}
+    cv = _cv_terms(cv_text)
+    result = {
+        "title": title, "company": posting.get("company", ""), "location": posting.get("location", ""), "url": posting.get("url", ""),
+        "score": score,
+        "match": len(wanted & cv) / len(wanted) if wanted else 0.0,
+        "matched": sorted(wanted & cv),
+        "missing": sorted(wanted - cv),
+    }
+    if with_template:
+        result["template"] = generate_template_application(result["company"] or "[YRITYS]", title or "[ROOLI]", description, cv_text)
+    return result
+
+
+TASKS = {
+    "analysis": local_text_analysis,
+    "score": calculate_score,
+    "template": generate_template_application,
+    "cv_match": match_cv,
+}
+
+
+def run_chunk(kind, chunk):
+    """Työntekijäprosessin työ: [(indeksi, argumentit)] -> [(indeksi, tulos)]."""
+    task = TASKS[kind]
+    return [(i, task(*args)) for i, args in chunk]
+
+
+class BatchJob:
+    """Erissä ajettava työ. Tulokset kerätään collect()-kutsulla sitä mukaa kuin erät valmistuvat,
+    joten käyttöliittymä voi näyttää osatulokset ja edistymisen odottamatta koko työtä."""
+
+    def __init__(self, kind, futures, total):
+        self.kind = kind
+        self.total = total
+        self.results = {}
+        self.errors = []
+        self.cancelled = False
+        self.started = time.perf_counter()
+        self.finished = None
+        self._pending = list(futures)
+
+    def collect(self):
+        """Siirtää valmistuneet erät tuloksiin (ei odota). Palauttaa uusien tulosten määrän."""
+        added = 0
+        still = []
+        for future in self._pending:
+            if not future.done():
+                still.append(future)
+                continue
+            try:
+                for i, result in future.result():
+                    self.results[i] = result
+                    added += 1
+            except CancelledError:
+                pass
+            except Exception as e:
+                self.errors.append(str(e))
+        self._pending = still
+        if not still and self.finished is None: self.finished = time.perf_counter()
+        return added
+
+    def cancel(self):
+        """Peruu erät, joita ei ole vielä aloitettu; käynnissä oleva erä (enintään CHUNK_SIZE riviä) ajetaan loppuun."""
+        self.cancelled = True
+        for future in self._pending: future.cancel()
+        self.collect()
+
+    @property
+    def done(self):
+        return not self._pending
+
+    @property
+    def progress(self):
+        return len(self.results) / self.total if self.total else 1.0
+
+    @property
+    def seconds(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    def ordered(self):
+        """Valmiit tulokset syöttöjärjestyksessä."""
+        return [self.results[i] for i in sorted(self.results)]
+
+
+class AnalysisPool:
+    """Jaettu ProcessPoolExecutor analyysille, pisteytykselle ja hakemuspohjille.
+
+    Pooli käynnistetään vasta ensimmäisestä työstä. Työntekijät käynnistetään spawn-tavalla, koska
+    Streamlit-palvelimessa on useita säikeitä (fork kopioisi niiden lukot). Kaatunut pooli luodaan uudelleen.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _pool(self, reset=False):
+        with self._lock:
+            if reset and self._executor:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=mp.get_context("spawn"))
+            return self._executor
+
+    def _submit(self, *args):
+        try:
+            return self._pool().submit(*args)
+        except BrokenProcessPool:
+            return self._pool(reset=True).submit(*args)
+
+    def submit_batch(self, kind, items, chunk_size=CHUNK_SIZE):
+        """Jakaa argumenttituplet eriin ja lähettää ne pooliin. Palauttaa heti BatchJobin."""
+        indexed = list(enumerate(items))
+        chunks = [indexed[start:start + chunk_size] for start in range(0, len(indexed), chunk_size)]
+        return BatchJob(kind, [self._submit(run_chunk, kind, chunk) for chunk in chunks], len(indexed))
+
+    def run(self, kind, *args, timeout=None):
+        """Yksi työ poolissa. Kutsuja odottaa, mutta laskenta ei varaa palvelinprosessin GIL:iä,
+        joten muiden istuntojen sivut piirtyvät sillä välin."""
+        return self._submit(run_chunk, kind, [(0, args)]).result(timeout)[0][1]
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor: self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
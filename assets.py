@@ -0,0 +1,184 @@
+import time
+import base64
+import sqlite3
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from http_client import shared_client
+
+# ---------------------------------------------------------
+# PAIKALLINEN KUVAVÄLIMUISTI (faviconit ja logot data-URI:na)
+# ---------------------------------------------------------
+
+ASSETS_DB = "assets.db"
+FRESH_FOR = 7 * 24 * 3600   # logot vaihtuvat harvoin: tarkistus (ehdollinen) kerran viikossa
+RETRY_BASE = 3600           # epäonnistunut haku uudelleen tunnin päästä ...
+MAX_BACKOFF = 7 * 24 * 3600  # ... ja väli kaksinkertaistuu enintään viikkoon
+MAX_BYTES = 256 * 1024      # tätä suurempia kuvia ei upoteta sivulle
+FETCH_TIMEOUT = 5
+FETCH_WORKERS = 8
+REFRESH_INTERVAL = 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS assets (
+    url TEXT PRIMARY KEY,
+    mime TEXT,
+    data BLOB,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL,
+    failures INTEGER NOT NULL DEFAULT 0,
+    next_check_at REAL NOT NULL DEFAULT 0
+)
+"""
+
+_MAGIC = ((b"\x89PNG", "image/png"), (b"GIF8", "image/gif"), (b"\xff\xd8\xff", "image/jpeg"), (b"\x00\x00\x01\x00", "image/x-icon"), (b"RIFF", "image/webp"))
+
+
+def favicon_url(site_url, size=64):
+    """Googlen favicon-palvelun osoite sivuston domainille."""
+    return f"https://www.google.com/s2/favicons?{urllib.parse.urlencode({'domain': urllib.parse.urlsplit(site_url).netloc, 'sz': size})}"
+
+
+def sniff_mime(content, header=""):
+    """Kuvan MIME-tyyppi otsakkeesta tai sisällön alusta; None, jos kyse ei ole kuvasta (esim. HTML-virhesivu)."""
+    header = (header or "").split(";")[0].strip().lower()
+    if header.startswith("image/"): return header
+    for magic, mime in _MAGIC:
+        if content.startswith(magic): return mime
+    head = content[:256].lstrip().lower()
+    if head.startswith(b"<svg") or (head.startswith(b"<?xml") and b"<svg" in content[:1024].lower()): return "image/svg+xml"
+    return None
+
+
+def next_check_delay(ok, failures):
+    if ok: return FRESH_FOR
+    return min(RETRY_BASE * 2 ** max(failures - 1, 0), MAX_BACKOFF)
+
+
+class AssetStore:
+    """Kuvat SQLite-kannassa. Sivun piirto lukee vain kantaa (data_uri); haut tekee AssetRefresher taustalla."""
+
+    def __init__(self, path=ASSETS_DB):
+        self._lock = threading.Lock()
+        self._uris = {}             # valmiit data-URI:t: base64-koodaus kerran per kuvaversio
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(SCHEMA)
+
+    def register(self, urls):
+        with self._lock:
+            self._conn.executemany("INSERT OR IGNORE INTO assets (url) VALUES (?)", [(u,) for u in dict.fromkeys(urls)])
+
+    def retain(self, urls):
+        """Poistaa kuvat, joita sivuilla ei enää näytetä, jotta taustasäie ei päivitä niitä turhaan."""
+        keep = set(urls)
+        with self._lock:
+            gone = [(u,) for (u,) in self._conn.execute("SELECT url FROM assets") if u not in keep]
+            self._conn.executemany("DELETE FROM assets WHERE url = ?", gone)
+            for (u,) in gone: self._uris.pop(u, None)
+
+    def data_uri(self, url):
+        """Kuva data-URI:na, tai None, jos sitä ei ole vielä haettu."""
+        uri = self._uris.get(url)
+        if uri is not None: return uri
+        with self._lock:
+            row = self._conn.execute("SELECT mime, data FROM assets WHERE url = ? AND data IS NOT NULL", (url,)).fetchone()
+        if row is None: return None
+        uri = self._uris[url] = f"data:{row[0]};base64,{base64.b64encode(row[1]).decode('ascii')}"
+        return uri
+
+    def due(self, now=None):
+        now = now or time.time()
+        with self._lock:
+            return [tuple(r) for r in self._conn.execute("SELECT url, etag, last_modified FROM assets WHERE next_check_at <= ? ORDER BY next_check_at", (now,))]
+
+    def expire_all(self):
+        with self._lock:
+            self._conn.execute("UPDATE assets SET next_check_at = 0")
+
+    def store(self, url, mime, data, etag=None, last_modified=None):
+        now = time.time()
+        with self._lock:
+            self._conn.execute("UPDATE assets SET mime = ?, data = ?, etag = ?, last_modified = ?, fetched_at = ?, failures = 0, next_check_at = ? WHERE url = ?",
+                               (mime, data, etag, last_modified, now, now + FRESH_FOR, url))
+            self._uris.pop(url, None)
+
+    def touch(self, url):
+        """304: tallennettu kuva on yhä ajan tasalla."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("UPDATE assets SET failures = 0, next_check_at = ? WHERE url = ?", (now + FRESH_FOR, url))
+
+    def fail(self, url):
+        """Epäonnistunut haku: vanha kuva (jos on) säilyy käytössä, uusi yritys back-offin mukaan."""
+        with self._lock:
+            row = self._conn.execute("SELECT failures FROM assets WHERE url = ?", (url,)).fetchone()
+            failures = (row[0] if row else 0) + 1
+            self._conn.execute("UPDATE assets SET failures = ?, next_check_at = ? WHERE url = ?", (failures, time.time() + next_check_delay(False, failures), url))
+
+    def stats(self):
+        """(kuvia yhteensä, haettuja, tavuja)"""
+        with self._lock:
+            return tuple(self._conn.execute("SELECT COUNT(*), COUNT(data), COALESCE(SUM(LENGTH(data)), 0) FROM assets").fetchone())
+
+
+class AssetRefresher:
+    """Taustasäie, joka hakee puuttuvat ja vanhentuneet kuvat. Validaattorit ovat kannassa,
+    joten uudelleenkäynnistyksen jälkeenkin muuttumaton kuva vastaa 304 eikä siirry uudelleen."""
+
+    def __init__(self, store, client=None, interval=REFRESH_INTERVAL):
+        self.store = store
+        self.client = client or shared_client()
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def fetch(self, url, etag=None, last_modified=None):
+        """Hakee yhden kuvan ja päivittää kannan. Palauttaa "stored", "unchanged" tai "failed"."""
+        headers = {}
+        if etag: headers["If-None-Match"] = etag
+        if last_modified: headers["If-Modified-Since"] = last_modified
+        try:
+            reply = self.client.request("GET", url, FETCH_TIMEOUT, headers=headers, max_bytes=MAX_BYTES + 1)
+        except requests.RequestException:
+            reply = None
+        if reply is not None and reply.not_modified:
+            self.store.touch(url)
+            return "unchanged"
+        mime = reply and reply.status in (200, 206) and len(reply.content) <= MAX_BYTES and sniff_mime(reply.content, reply.headers.get("Content-Type"))
+        if not mime:
+            self.store.fail(url)
+            return "failed"
+        self.store.store(url, mime, reply.content, reply.headers.get("ETag"), reply.headers.get("Last-Modified"))
+        return "stored"
+
+    def refresh_due(self):
+        """Yksi kierros rinnakkain. Palauttaa {"stored": n, "unchanged": n, "failed": n}."""
+        counts = {"stored": 0, "unchanged": 0, "failed": 0}
+        due = self.store.due()
+        if not due: return counts
+        with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(due))) as executor:
+            for outcome in executor.map(lambda row: self.fetch(*row), due): counts[outcome] += 1
+        return counts
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh_due()
+            except Exception as e:
+                print(f"Kuvien päivitys epäonnistui: {e}")
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="asset-refresher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,133 @@
+"""Luo hakemuspohjat massana ilmoitustiedostosta ilman Streamlitiä.
+
+Kirjeet kirjoitetaan yksi kerrallaan suoraan ZIP-arkistoon tai JSON-lines-tiedostoon, joten muistissa
+ei ole koko erää. Kirjeitä ei tallenneta välimuistiin: pohjan täyttö on halvempaa kuin syötteiden tiivistäminen.
+
+Käyttö:
+    python batch_letters.py ilmoitukset.csv --cv cv.txt -o hakemukset.zip
+    python batch_letters.py linkedin.jsonl --cv cv.txt -o hakemukset.jsonl
+"""
+import os
+import re
+import sys
+import json
+import time
+import zipfile
+import argparse
+import tempfile
+import datetime
+
+from cover_letter import render_letter
+from postings import iter_postings, normalize_posting
+
+PROGRESS_EVERY = 250
+FORMATS = {".zip": "zip", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+ARCHIVE_DIR = os.path.join(tempfile.gettempdir(), "hub_hakemukset")
+ARCHIVE_KEEP = 8            # arkistoja hakemistossa enintään (uusimmat jäävät)
+ARCHIVE_MAX_AGE = 3600      # vanhemmat (s) poistetaan aina
+_UNSAFE = re.compile(r"[^\w\-]+")
+
+
+def new_archive(fmt, directory=ARCHIVE_DIR, keep=ARCHIVE_KEEP, max_age=ARCHIVE_MAX_AGE):
+    """Uusi arkistopolku yhteisessä hakemistossa; vanhat arkistot karsitaan ensin.
+
+    Istunnot eivät siivoa jälkiään (välilehti suljetaan, palvelin käynnistyy uudelleen),
+    joten hakemistossa on kerrallaan enintään keep arkistoa eikä yhtään max_age-ikää vanhempaa.
+    """
+    os.makedirs(directory, exist_ok=True)
+    archives = []
+    for entry in os.scandir(directory):
+        try:
+            if entry.is_file(): archives.append((entry.stat().st_mtime, entry.path))
+        except FileNotFoundError: continue
+    archives.sort(reverse=True)
+    cutoff = time.time() - max_age
+    for i, (mtime, path) in enumerate(archives):
+        if i >= keep - 1 or mtime < cutoff:
+            try: os.remove(path)
+            except FileNotFoundError: pass
+    fd, path = tempfile.mkstemp(prefix="hakemukset_", suffix=f".{fmt}", dir=directory)
+    os.close(fd)
+    return path
+
+
+def letter_rows(postings):
+    """(yritys, rooli, ilmoitusteksti) normalisoiduista ilmoituksista; puuttuvat kentät kuten Hakemus-välilehdellä."""
+    for p in postings: yield p.get("company") or "[YRITYS]", p.get("title") or "[ROOLI]", p.get("description") or ""
+
+
+def read_rows(path):
+    """Ilmoitustiedoston rivit laiskasti (CSV, JSON-lines, JSON tai HTML, ks. postings.iter_postings)."""
+    return letter_rows(normalize_posting(row, os.path.basename(path)) for row in iter_postings(path))
+
+
+def count_rows(path):
+    """Rivien määrä edistymispalkkia varten (yksi kevyt lukukierros ilman kirjeitä)."""
+    return sum(1 for _ in iter_postings(path))
+
+
+def store_rows(store, query, limit=None):
+    """(rivit, määrä) ilmoitusvaraston hakuosumista; rivit luetaan sivuittain (PostingStore.iter_matches)."""
+    total = store.count_matches(query)
+    if limit is not None: total = min(total, limit)
+    return letter_rows(store.iter_matches(query, limit=limit)), total
+
+
+def iter_letters(rows, cv, date_str=None):
+    """(indeksi, yritys, rooli, kirje) yksi kerrallaan. Päivämäärä lasketaan kerran koko erälle."""
+    date_str = date_str or datetime.date.today().strftime("%d.%m.%Y")
+    for i, (company, role, text) in enumerate(rows):
+        yield i, company, role, render_letter(company, role, text, cv, date_str)
+
+
+def letter_filename(i, company, role):
+    slug = _UNSAFE.sub("_", f"{company}_{role}").strip("_")[:60] or "hakemus"
+    return f"{i + 1:05d}_{slug}.txt"
+
+
+def write_letters(letters, out, fmt, progress=None, total=None):
+    """Kirjoittaa kirjeet polkuun tai binääritiedosto-olioon ("zip" tai "jsonl"). Palauttaa määrän.
+
+    progress(valmiit, yhteensä tai None) kutsutaan PROGRESS_EVERY kirjeen välein ja lopuksi.
+    """
+    count = 0
+    if fmt == "zip":
+        with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for count, (i, company, role, letter) in enumerate(letters, start=1):
+                archive.writestr(letter_filename(i, company, role), letter)
+                if progress and count % PROGRESS_EVERY == 0: progress(count, total)
+    else:
+        f = open(out, "wb") if isinstance(out, (str, os.PathLike)) else out
+        try:
+            for count, (i, company, role, letter) in enumerate(letters, start=1):
+                f.write(json.dumps({"index": i, "company": company, "role": role, "letter": letter}, ensure_ascii=False).encode("utf-8") + b"\n")
+                if progress and count % PROGRESS_EVERY == 0: progress(count, total)
+        finally:
+            if f is not out: f.close()
+    if progress: progress(count, total)
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Luo hakemuspohjat ilmoitustiedostosta (ZIP tai JSON-lines).")
+    parser.add_argument("input", help="Ilmoitukset: .csv, .jsonl, .json tai .html")
+    parser.add_argument("--cv", required=True, help="Oma tausta / CV tekstitiedostona")
+    parser.add_argument("-o", "--output", default="hakemukset.zip", help="Tulostiedosto: .zip tai .jsonl")
+    args = parser.parse_args(argv)
+
+    fmt = FORMATS.get(os.path.splitext(args.output)[1].lower())
+    if fmt is None: parser.error("tulostiedoston pääte: .zip tai .jsonl")
+    with open(args.cv, "r", encoding="utf-8") as f:
+        cv = f.read()
+
+    started = time.perf_counter()
+    report = lambda done, total: print(f"\r{done} kirjettä", end="", file=sys.stderr)
+    written = write_letters(iter_letters(read_rows(args.input), cv), args.output, fmt, progress=report)
+    seconds = time.perf_counter() - started
+    rate = written / seconds if seconds else 0.0
+    print(f"\rLuotu {written} hakemuspohjaa {seconds:.2f} s ({rate:,.0f} kirjettä/s) → {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
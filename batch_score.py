@@ -0,0 +1,237 @@
+"""Pisteyttää suuren määrän työpaikkailmoituksia tiedostosta ilman Streamlitiä.
+
+Käyttö:
+    python batch_score.py ilmoitukset.csv -o tulokset.jsonl
+    python batch_score.py linkedin.jsonl -o top.csv --top 200 --workers 4
+"""
+import os
+import re
+import sys
+import csv
+import json
+import time
+import heapq
+import argparse
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from scoring import score_breakdown
+
+CHUNK_SIZE = 2000
+READ_CHUNK = 64 * 1024      # JSON-taulukon lukupuskuri (merkkiä)
+MERGE_FAN_IN = 64           # yhdistettäviä ajotiedostoja (= avoimia tiedostoja) kerrallaan
+TITLE_FIELDS = ("title", "otsikko", "job_title", "position")
+LOCATION_FIELDS = ("location", "sijainti", "city")
+DESCRIPTION_FIELDS = ("description", "kuvaus", "text", "job_description")
+
+
+_DECODER = json.JSONDecoder()
+_SKIP = re.compile(r"[\s,]*")
+
+
+def iter_json_array(f, read_chunk=READ_CHUNK):
+    """JSON-taulukon alkiot yksi kerrallaan (raw_decode puskurista): muistissa on puskuri ja yksi alkio, ei koko taulukkoa."""
+    buf = f.read(read_chunk).lstrip()
+    if not buf.startswith("["): raise ValueError("JSON-tiedosto ei ala taulukolla")
+    pos, eof = 1, False
+    while True:
+        pos = _SKIP.match(buf, pos).end()
+        if buf.startswith("]", pos): return
+        try:
+            item, end = _DECODER.raw_decode(buf, pos)
+            # Luku voi jatkua seuraavassa palassa ("1.5" + "e3"): valmis vasta erottimen kohdalla
+            complete = eof or isinstance(item, (dict, list, str)) or (end < len(buf) and buf[end] in ",] \t\r\n")
+        except json.JSONDecodeError:
+            if eof: raise
+            complete = False
+        if complete:
+            yield item
+            pos = end
+            if pos < len(buf) or eof: continue
+        if eof: raise ValueError("JSON-taulukko päättyi kesken")
+        # Alkio jatkuu seuraavassa palassa: käsitelty osa pois ja lisää perään
+        more = f.read(read_chunk)
+        eof = not more
+        buf, pos = buf[pos:] + more, 0
+
+
+def read_postings(path):
+    """Lukee ilmoitukset virtana (CSV, JSON-lines tai JSON-taulukko) – koko tiedostoa ei ladata muistiin."""
+    lower = path.lower()
+    if lower.endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            head = f.read(1024).lstrip()
+        if head.startswith("["):
+            with open(path, "r", encoding="utf-8") as f:
+                yield from iter_json_array(f)
+            return
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if lower.endswith((".jsonl", ".ndjson", ".json")):
+            for line in f:
+                line = line.strip()
+                if line: yield json.loads(line)
+        else:
+            yield from csv.DictReader(f)
+
+
+def iter_chunks(rows, size=CHUNK_SIZE):
+    chunk = []
+    for i, row in enumerate(rows):
+        chunk.append((i, row))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk: yield chunk
+
+
+def _pick(row, fields):
+    for field in fields:
+        if row.get(field): return str(row[field])
+    return ""
+
+
+def score_chunk(chunk):
+    """Prosessipoolin työ: palauttaa (pisteet, rivinumero, tulosrivi) pisteiden mukaan järjestettynä."""
+    results = []
+    for i, row in chunk:
+        score, hits = score_breakdown(_pick(row, TITLE_FIELDS), _pick(row, LOCATION_FIELDS), _pick(row, DESCRIPTION_FIELDS))
+        out = {k: v for k, v in row.items() if k not in DESCRIPTION_FIELDS}
+        out["score"] = score
+        out["keywords"] = hits
+        results.append((-score, i, out))
+    results.sort(key=lambda r: (r[0], r[1]))
+    return results
+
+
+def scored_chunks(path, workers, chunk_size):
+    """Ajaa chunkit prosessipoolissa; jonossa on kerrallaan vain muutama chunk, joten muisti pysyy rajattuna."""
+    if workers <= 1:
+        for chunk in iter_chunks(read_postings(path), chunk_size): yield score_chunk(chunk)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque()
+        for chunk in iter_chunks(read_postings(path), chunk_size):
+            in_flight.append(pool.submit(score_chunk, chunk))
+            if len(in_flight) >= workers * 2: yield in_flight.popleft().result()
+        while in_flight: yield in_flight.popleft().result()
+
+
+def _write_run(results, tmp_dir):
+    fd, run_path = tempfile.mkstemp(suffix=".jsonl", dir=tmp_dir)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        for neg_score, i, out in results: f.write(json.dumps([neg_score, i, out], ensure_ascii=False) + "\n")
+    return run_path
+
+
+def _read_run(run_path):
+    with open(run_path, "r", encoding="utf-8") as f:
+        for line in f: yield tuple(json.loads(line))
+
+
+def _merge(runs):
+    return heapq.merge(*(_read_run(r) for r in runs), key=lambda r: (r[0], r[1]))
+
+
+def _reduce_runs(runs, tmp_dir, fan_in=MERGE_FAN_IN):
+    """Yhdistää ajoja fan_in kerrallaan uusiksi ajoiksi, kunnes niitä on enintään fan_in.
+    Näin avoimien tiedostojen määrä pysyy rajattuna syötteen koosta riippumatta."""
+    while len(runs) > fan_in:
+        reduced = []
+        for start in range(0, len(runs), fan_in):
+            group = runs[start:start + fan_in]
+            if len(group) == 1:
+                reduced.append(group[0])
+                continue
+            reduced.append(_write_run(_merge(group), tmp_dir))
+            for r in group: os.remove(r)
+        runs = reduced
+    return runs
+
+
+def rank(path, workers=1, chunk_size=CHUNK_SIZE, top=None, tmp_dir=None):
+    """Palauttaa (järjestetyt tulokset -iteraattori, tilasto).
+
+    top=None: jokainen chunk kirjoitetaan järjestettynä väliaikaistiedostoon ja ne
+    yhdistetään heapq.mergellä enintään MERGE_FAN_IN kerrallaan (ulkoinen lajittelu,
+    toimii muistia suuremmille syötteille). top=K: pidetään muistissa vain K parasta.
+
+    Tilastossa score_seconds on pisteytys ja merge_seconds välikierrosten yhdistäminen;
+    viimeinen yhdistäminen tapahtuu vasta, kun tulokset luetaan (ks. main).
+    """
+    if top is not None and top < 1: raise ValueError(f"top on oltava vähintään 1 (annettu {top})")
+    stats = {"postings": 0, "score_seconds": 0.0, "merge_seconds": 0.0}
+    started = time.perf_counter()
+    if top is not None:
+        best = []
+        for results in scored_chunks(path, workers, chunk_size):
+            stats["postings"] += len(results)
+            for neg_score, i, out in results:
+                item = (-neg_score, -i, out)
+                if len(best) < top: heapq.heappush(best, item)
+                elif item[:2] > best[0][:2]: heapq.heapreplace(best, item)
+        stats["score_seconds"] = time.perf_counter() - started
+        ordered = sorted(best, key=lambda r: (-r[0], -r[1]))
+        return (out for _, _, out in ordered), stats
+
+    tmp_dir = tempfile.mkdtemp(prefix="batch_score_", dir=tmp_dir)
+    runs = []
+    for results in scored_chunks(path, workers, chunk_size):
+        stats["postings"] += len(results)
+        runs.append(_write_run(results, tmp_dir))
+    stats["score_seconds"] = time.perf_counter() - started
+    started = time.perf_counter()
+    runs = _reduce_runs(runs, tmp_dir)
+    stats["merge_seconds"] = time.perf_counter() - started
+
+    def merged():
+        try:
+            for _, _, out in _merge(runs): yield out
+        finally:
+            for r in runs: os.remove(r)
+            os.rmdir(tmp_dir)
+    return merged(), stats
+
+
+def write_results(results, out_path):
+    """Kirjoittaa tulokset (rank, score, keywords + alkuperäiset kentät) CSV- tai JSON-lines-muodossa."""
+    count = 0
+    with open(out_path, "w", encoding="utf-8", newline="") as f:
+        writer = None
+        for count, out in enumerate(results, start=1):
+            row = {"rank": count, **out}
+            if out_path.endswith(".csv"):
+                row["keywords"] = "; ".join(f"{g}: {', '.join(t)}" for g, t in sorted(out["keywords"].items()))
+                if writer is None:
+                    writer = csv.DictWriter(f, fieldnames=list(row.keys()), extrasaction="ignore")
+                    writer.writeheader()
+                writer.writerow(row)
+            else:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pisteytä työpaikkailmoitukset tiedostosta (CSV / JSON-lines / JSON).")
+    parser.add_argument("input", help="Ilmoitukset: .csv, .jsonl tai .json")
+    parser.add_argument("-o", "--output", default="scored.jsonl", help="Tulostiedosto: .jsonl tai .csv")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Prosessien määrä (1 = ei poolia)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--top", type=int, default=None, help="Kirjoita vain K parasta")
+    args = parser.parse_args(argv)
+    if args.top is not None and args.top < 1: parser.error("--top: vähintään 1")
+
+    started = time.perf_counter()
+    results, stats = rank(args.input, workers=args.workers, chunk_size=args.chunk_size, top=args.top)
+    # Viimeinen yhdistäminen ja kirjoitus tapahtuvat samassa läpikäynnissä
+    written = write_results(results, args.output)
+    seconds = time.perf_counter() - started
+    rate = stats["postings"] / seconds if seconds else 0.0
+    output_seconds = seconds - stats["score_seconds"] - stats["merge_seconds"]
+    print(f"Pisteytetty {stats['postings']} ilmoitusta {seconds:.2f} s ({rate:,.0f} ilmoitusta/s; pisteytys {stats['score_seconds']:.2f} s, "
+          f"välikierrokset {stats['merge_seconds']:.2f} s, yhdistäminen ja kirjoitus {output_seconds:.2f} s), kirjoitettu {written} → {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
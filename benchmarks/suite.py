@@ -0,0 +1,497 @@
+"""Hubin kuumien polkujen suorituskykymittaukset ja vertailu tallennettuun perustasoon.
+
+Jokainen tapaus ajetaan useaan kertaan ja tuloksena on mediaaniaika operaatiota kohden. Jos aika
+ylittää perustason yli kynnyksen verran (oletus 30 %), tapaus merkitään regressioksi ja
+paluuarvo on 1. Perustaso on konekohtainen: tallenna se uudelleen, kun vaihdat konetta.
+
+Käyttö:
+    python -m benchmarks.suite                    # kaikki tapaukset, vertailu perustasoon
+    python -m benchmarks.suite --quick            # ilman 100k-kokoja
+    python -m benchmarks.suite --only tracker     # vain nimeen osuvat tapaukset
+    python -m benchmarks.suite --save-baseline    # tallenna nykyiset tulokset perustasoksi
+"""
+import io
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import zipfile
+import argparse
+import platform
+import tempfile
+import datetime
+import statistics
+import threading
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import scoring
+from scoring import calculate_score, local_text_analysis
+from records import Tracker
+from storage import TrackerStore
+from http_client import HttpClient, PROBE_BYTES
+from link_checker import LinkChecker
+from visitors import VisitorLog
+from assets import AssetStore, AssetRefresher
+import html_cards
+import batch_letters
+from datasets import AI_STUDIES
+from link_health import LinkHealthStore
+from pipeline_analytics import PipelineAnalytics
+from postings import PostingStore, SEARCH_CANDIDATES
+from benchmarks.synthetic import postings, posting_text, tracker_items
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "baselines.json")
+THRESHOLD = 0.30
+REPEAT = 5
+TRACKER_SIZES = (10, 1_000, 100_000)
+QUICK_MAX_SIZE = 1_000
+STUB_LATENCY = 0.05         # injektoitu viive per pyyntö (s)
+STUB_LINKS = 40
+STUB_BROKEN_EVERY = 5       # joka viides linkki palauttaa 404
+STUB_PAGE_BYTES = 256 * 1024    # /nohead/-sivun koko; HEAD palauttaa 405, joten tarkistus tekee GETin
+STUB_SHEET_ROWS = 2000
+STUB_ETAG = '"v1"'
+STUB_IMAGES = 40
+STORE_POSTINGS = 1200       # täytesana "tiimi" on lähes jokaisessa, joten hakuun osuu yli SEARCH_CANDIDATES riviä
+STUB_PNG = bytes.fromhex("89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+                         "1f15c4890000000d49444154789c6360000002000001e221bc330000000049454e44ae426082")
+
+CASES = []
+
+
+def case(name, size=None, repeat=REPEAT, setup=None):
+    """Rekisteröi mittauksen. Funktio saa setupin paluuarvon ja palauttaa operaatioiden määrän."""
+    def register(fn):
+        CASES.append({"name": name, "size": size, "repeat": repeat, "setup": setup, "fn": fn})
+        return fn
+    return register
+
+
+# --- HTTP-TYNKÄ ---
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Vastaa viiveellä kuten oikeat sivut:
+    /ok/... 200 ja ETag (If-None-Match -> 304), /broken/... 404,
+    /nohead/... HEAD 405 ja iso GET-runko, joka noudattaa Range-otsaketta (206),
+    /sheet?...offset N CSV-loki riveistä N alkaen, ETagilla, /img/... PNG-kuva ETagilla."""
+    protocol_version = "HTTP/1.1"   # keep-alive, kuten oikeilla palvelimilla
+
+    def _send(self, status, body=b"", headers=(), send_body=True):
+        time.sleep(self.server.latency)
+        self.send_response(status)
+        for name, value in headers: self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body: self.wfile.write(body)
+
+    def _reply(self, send_body):
+        path = self.path
+        if path.startswith("/broken/"): return self._send(404, b"ei loydy", send_body=send_body)
+        if path.startswith("/nohead/"):
+            if not send_body: return self._send(405, send_body=False)
+            body = b"x" * STUB_PAGE_BYTES
+            ranged = self.headers.get("Range", "").removeprefix("bytes=").split("-")
+            if len(ranged) == 2 and ranged[0].isdigit() and ranged[1].isdigit():
+                return self._send(206, body[int(ranged[0]):int(ranged[1]) + 1])
+            return self._send(200, body)
+        if self.headers.get("If-None-Match") == STUB_ETAG: return self._send(304, send_body=False)
+        if path.startswith("/img/"): return self._send(200, STUB_PNG, [("ETag", STUB_ETAG), ("Content-Type", "image/png")], send_body)
+        body = self.server.sheet_csv(path) if path.startswith("/sheet") else b"ok"
+        self._send(200, body, [("ETag", STUB_ETAG)], send_body)
+
+    def do_HEAD(self): self._reply(False)
+    def do_GET(self): self._reply(True)
+    def log_message(self, *args): pass
+
+
+def _sheet_csv(path):
+    offset = int(path.rsplit("offset", 1)[1]) if "offset" in path else 0
+    rows = [f"2026-01-{1 + i % 28:02d} 12:00:{i % 60:02d},kävijä {i},Yritys {i % 40} Oy" for i in range(offset, STUB_SHEET_ROWS)]
+    return "\n".join(["aika,vierailija,yritys", *rows]).encode("utf-8")
+
+
+STUB = None                 # HttpStub, käynnissä main()-ajon ajan
+
+
+class HttpStub:
+    def __init__(self, latency=STUB_LATENCY):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        self.server.daemon_threads = True
+        self.server.latency = latency
+        self.server.sheet_csv = _sheet_csv
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def urls(self, n):
+        host, port = self.server.server_address
+        return [f"http://{host}:{port}/{'broken' if i % STUB_BROKEN_EVERY == 0 else 'ok'}/{i}" for i in range(n)]
+
+    def url(self, path):
+        host, port = self.server.server_address
+        return f"http://{host}:{port}{path}"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+# --- TAPAUKSET ---
+
+POSTINGS = postings(500, seed=1)
+
+
+@case("score.calculate_score")
+def bench_calculate_score(_):
+    for p in POSTINGS: calculate_score(p["title"], p["location"], p["description"])
+    return len(POSTINGS)
+
+
+def _fresh_texts():
+    scoring._analysis_cache.clear()
+    rng = random.Random(time.perf_counter_ns())
+    return [posting_text(rng, 300) for _ in range(200)]
+
+
+@case("analysis.local_text_analysis.cold", setup=_fresh_texts)
+def bench_analysis_cold(texts):
+    for text in texts: local_text_analysis(text)
+    return len(texts)
+
+
+@case("analysis.local_text_analysis.cached")
+def bench_analysis_cached(_):
+    text = POSTINGS[0]["description"]
+    for _ in range(1000): local_text_analysis(text)
+    return 1000
+
+
+class _TrackerDir:
+    """Väliaikainen kanta; valmiiksi täytetty, jos items annetaan."""
+
+    def __init__(self, items=None):
+        self.dir = tempfile.mkdtemp(prefix="hub_bench_")
+        self.store = TrackerStore(os.path.join(self.dir, "tracker.db"))
+        self.items = items
+        if items: self.store.replace_all([dict(i) for i in items])
+
+    def close(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+
+@lru_cache(maxsize=None)
+def _items(size):
+    return tracker_items(size, seed=2)
+
+
+def _tracker_cases(size):
+    edits = min(size, 50)
+    label = f"{size:,}".replace(",", "_")
+
+    @case(f"tracker.save_local_data.{label}", size, repeat=REPEAT if size <= QUICK_MAX_SIZE else 1, setup=lambda: _TrackerDir())
+    def save(env):
+        # main.save_local_data: koko lista yhdessä transaktiossa
+        env.store.replace_all([dict(i) for i in _items(size)])
+        return 1
+
+    @case(f"tracker.load_local_data.{label}", size, repeat=REPEAT if size <= QUICK_MAX_SIZE else 2, setup=lambda: _TrackerDir(_items(size)))
+    def load(env):
+        # main.load_local_data: rivit kannasta indeksoiduksi Trackeriksi
+        Tracker.from_dicts(env.store.load_all())
+        return 1
+
+    @case(f"tracker.save_item.{label}", size, repeat=REPEAT if size <= QUICK_MAX_SIZE else 2, setup=lambda: _TrackerDir(_items(size)))
+    def save_item(env):
+        # main.save_item: yksi muokkaus (versiotarkistus + muutosloki) täydessä kannassa
+        for item in env.items[:edits]:
+            item = env.store.get(item["id"])
+            item["status"] = "Keskustelu"
+            env.store.upsert(item)
+        return edits
+
+    @case(f"analytics.badges.{label}", size, setup=lambda: Tracker.from_dicts(_items(size)))
+    def badges(tracker):
+        # Korvaa vanhan safe_deadline_blockin: merkit koko listalle kerralla
+        PipelineAnalytics(tracker, datetime.date.today()).badges
+        return 1
+
+
+for _size in TRACKER_SIZES: _tracker_cases(_size)
+
+
+def _probe_ok(checker, urls):
+    """{url: ok} kuten LinkHealthRefresher tallentaa; aikarajan ylittänyt linkki on rikki."""
+    return {url: bool(result and result["ok"]) for url, result in checker.iter_probes(urls)}
+
+
+@case("links.iter_probes.stub", setup=lambda: LinkChecker(client=HttpClient()))
+def bench_link_checker(checker):
+    # Taustapäivittäjän polku: rinnakkaiset tarkistukset viivästettyä tynkäpalvelinta vasten
+    results = _probe_ok(checker, STUB.urls(STUB_LINKS))
+    broken = sum(1 for ok in results.values() if not ok)
+    assert broken == (STUB_LINKS + STUB_BROKEN_EVERY - 1) // STUB_BROKEN_EVERY, f"väärä määrä rikkinäisiä: {broken}"
+    return STUB_LINKS
+
+
+class _HealthDir:
+    """Väliaikainen linkkivälimuisti, johon tynkäpalvelimen linkit on jo tarkistettu."""
+
+    def __init__(self):
+        self.dir = tempfile.mkdtemp(prefix="hub_bench_")
+        self.store = LinkHealthStore(os.path.join(self.dir, "link_health.db"))
+        for url, result in LinkChecker(client=HttpClient()).iter_probes(STUB.urls(STUB_LINKS)): self.store.record(url, result)
+
+    def close(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+
+@case("links.validate_link", setup=_HealthDir)
+def bench_validate_link(env):
+    # main.validate_link: sivun piirto lukee vain välimuistitaulua
+    urls = STUB.urls(STUB_LINKS)
+    for _ in range(25):
+        for url in urls: env.store.is_ok(url)
+    return 25 * len(urls)
+
+
+@case("http.probe_fallback_get.stub", setup=lambda: LinkChecker(client=HttpClient()))
+def bench_probe_fallback(checker):
+    # HEAD 405 -> GET Range-otsakkeella: sivusta siirtyy vain alku, ei koko runkoa
+    urls = [STUB.url(f"/nohead/{i}") for i in range(STUB_LINKS)]
+    results = _probe_ok(checker, urls)
+    stats = checker.client.stats()
+    assert all(results.values()), "rajattu GET ei kelvannut"
+    assert stats["requests"] == 2 * STUB_LINKS, f"pyyntöjä {stats['requests']}"
+    assert stats["bytes"] <= STUB_LINKS * PROBE_BYTES, f"siirtyi {stats['bytes']} tavua, raja {STUB_LINKS * PROBE_BYTES}"
+    return STUB_LINKS
+
+
+@case("http.probe_revalidate.stub", setup=lambda: LinkChecker(client=HttpClient()))
+def bench_probe_revalidate(checker):
+    # Toinen tarkistuskierros: HEAD lähettää ETagin takaisin ja muuttumaton sivu vastaa 304
+    urls = [STUB.url(f"/ok/{i}") for i in range(STUB_LINKS)]
+    for _ in range(2): results = dict(checker.iter_probes(urls))
+    stats = checker.client.stats()
+    assert all(r["ok"] for r in results.values()), "304 ei kelvannut"
+    assert stats["not_modified"] == STUB_LINKS and stats["bytes"] == 0, f"mittarit {stats}"
+    return 2 * STUB_LINKS
+
+
+class _VisitorDir:
+    """Väliaikainen vierailijaloki tynkäpalvelimen Sheetistä. Ensimmäinen synkronointi hakee kaiken,
+    toinen viimeisen rivin (uusi offset-osoite, ETag talteen); vasta sen jälkeen haut ovat ehdollisia."""
+
+    def __init__(self):
+        self.dir = tempfile.mkdtemp(prefix="hub_bench_")
+        self.client = HttpClient()
+        self.log = VisitorLog(lambda offset: STUB.url(f"/sheet?offset{offset}"), os.path.join(self.dir, "visitors.db"), client=self.client)
+        assert self.log.sync() == STUB_SHEET_ROWS and self.log.sync(force=True) == 0
+        self.client.reset_stats()
+
+    def close(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+
+@case("http.visitor_sync_unchanged.stub", setup=_VisitorDir)
+def bench_visitor_sync_unchanged(env):
+    # load_visitor_data, kun Sheet ei ole muuttunut: 304, ei CSV:tä eikä jäsennystä
+    for _ in range(10): assert env.log.sync(force=True) == 0
+    stats = env.client.stats()
+    assert stats["requests"] == stats["not_modified"] == 10 and stats["bytes"] == 0, f"mittarit {stats}"
+    return 10
+
+
+class _AssetDir:
+    """Väliaikainen kuvavälimuisti, johon tynkäpalvelimen kuvat on rekisteröity (ei vielä haettu)."""
+
+    def __init__(self):
+        self.dir = tempfile.mkdtemp(prefix="hub_bench_")
+        self.urls = [STUB.url(f"/img/{i}.png") for i in range(STUB_IMAGES)]
+        self.store = AssetStore(os.path.join(self.dir, "assets.db"))
+        self.store.register(self.urls)
+        self.client = HttpClient()
+
+    def close(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+
+@case("assets.warm_and_revalidate.stub", setup=_AssetDir)
+def bench_assets_warm(env):
+    # Lämmitys hakee jokaisen kuvan kerran; uusi prosessi (uusi asiakas) saa kannan validaattoreilla 304:t
+    assert AssetRefresher(env.store, client=env.client).refresh_due() == {"stored": STUB_IMAGES, "unchanged": 0, "failed": 0}
+    assert all(env.store.data_uri(url).startswith("data:image/png;base64,") for url in env.urls)
+    env.store.expire_all()
+    restarted = AssetRefresher(AssetStore(os.path.join(env.dir, "assets.db")), client=HttpClient())
+    assert restarted.refresh_due() == {"stored": 0, "unchanged": STUB_IMAGES, "failed": 0}
+    assert restarted.client.stats()["bytes"] == 0, f"mittarit {restarted.client.stats()}"
+    return 2 * STUB_IMAGES
+
+
+def _warm_assets():
+    env = _AssetDir()
+    AssetRefresher(env.store, client=env.client).refresh_due()
+    return env
+
+
+@case("assets.data_uri", setup=_warm_assets)
+def bench_asset_data_uri(env):
+    # Linkit-välilehden piirto: kuvat upotetaan välimuistista, ei verkkoa
+    for _ in range(25):
+        for url in env.urls: env.store.data_uri(url)
+    return 25 * STUB_IMAGES
+
+
+@case("html.grid.build", setup=lambda: html_cards._grids.clear())
+def bench_grid_build(_):
+    # Ensimmäinen piirto: koko AI-korttiruudukko yhdeksi merkkijonoksi
+    html_cards.grid("ai", AI_STUDIES)
+    return 1
+
+
+@case("html.grid.cached")
+def bench_grid_cached(_):
+    # Uudelleenajo: sisältötiiviste + haku muistista
+    for _ in range(100): html_cards.grid("ai", AI_STUDIES)
+    return 100
+
+
+class _PostingDir:
+    """Väliaikainen ilmoitusvarasto, jossa hakuun osuu enemmän rivejä kuin SEARCH_CANDIDATES."""
+
+    def __init__(self):
+        self.dir = tempfile.mkdtemp(prefix="hub_bench_")
+        self.store = PostingStore(os.path.join(self.dir, "postings.db"))
+        rows = postings(STORE_POSTINGS, seed=6, words=60)
+        self.store.ingest(rows)
+        # Hakuun "tiimi" (etuliitehaku) osuvat rivit laskettuna ilman FTS:ää
+        self.matching = sum(1 for p in rows if any(w.lower().startswith("tiimi") for w in f"{p['title']} {p['location']} {p['description']}".split()))
+        assert len(self.store) == STORE_POSTINGS and self.matching > SEARCH_CANDIDATES
+
+    def close(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+
+@case("postings.search.cv_match", setup=_PostingDir)
+def bench_posting_search(env):
+    # CV-massavertailun haku: limit (500) ylittää uudelleenjärjestettävien ehdokkaiden oletusmäärän
+    results = env.store.search("tiimi", limit=500)
+    assert len(results) == 500, f"hakutuloksia {len(results)}"
+    assert all(a["score"] >= b["score"] for a, b in zip(results, results[1:])), "ei pisteiden mukaan"
+    return 1
+
+
+LETTER_ROWS = [(p["company"], p["title"], p["description"]) for p in postings(1000, seed=4)]
+LETTER_CV = posting_text(random.Random(5), 200)
+
+
+def _bulk_letters(rows):
+    out = io.BytesIO()
+    return batch_letters.write_letters(batch_letters.iter_letters(rows, LETTER_CV, "01.01.2026"), out, "zip")
+
+
+@case("letters.bulk_zip")
+def bench_letters(_):
+    # Massahakemukset: 1000 kirjettä suoraan ZIP-virtaan
+    return _bulk_letters(LETTER_ROWS)
+
+
+@case("letters.bulk_zip.store", setup=_PostingDir)
+def bench_letters_store(env):
+    # Massavienti varaston hakuosumista: jokainen osuma päätyy arkistoon, ei vain SEARCH_CANDIDATES ensimmäistä
+    rows, total = batch_letters.store_rows(env.store, "tiimi", limit=20_000)
+    out = io.BytesIO()
+    count = batch_letters.write_letters(batch_letters.iter_letters(rows, LETTER_CV, "01.01.2026"), out, "zip")
+    with zipfile.ZipFile(out) as archive: names = archive.namelist()
+    assert count == total == len(names) == len(set(names)) == env.matching, f"kirjeitä {count}, osumia {total}/{env.matching}, tiedostoja {len(names)}"
+    return count
+
+
+# --- AJO & VERTAILU ---
+
+def run_case(c):
+    times = []
+    for _ in range(c["repeat"]):
+        env = c["setup"]() if c["setup"] else None
+        try:
+            started = time.perf_counter()
+            ops = c["fn"](env)
+            times.append((time.perf_counter() - started) / ops)
+        finally:
+            if hasattr(env, "close"): env.close()
+    return statistics.median(times)
+
+
+def machine():
+    return {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()}
+
+
+def load_baseline(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    """{nimi: (nyt, perustaso tai None, suhde tai None, regressio?)}"""
+    base = (baseline or {}).get("results", {})
+    out = {}
+    for name, now in results.items():
+        before = base.get(name)
+        ratio = now / before if before else None
+        out[name] = (now, before, ratio, ratio is not None and ratio > 1 + threshold)
+    return out
+
+
+def _fmt(seconds):
+    if seconds >= 1: return f"{seconds:8.2f} s "
+    if seconds >= 1e-3: return f"{seconds * 1e3:8.2f} ms"
+    return f"{seconds * 1e6:8.1f} µs"
+
+
+def main(argv=None):
+    global STUB
+    parser = argparse.ArgumentParser(description="Hubin suorituskykymittaukset.")
+    parser.add_argument("--quick", action="store_true", help=f"Ohita yli {QUICK_MAX_SIZE}-kokoiset tapaukset")
+    parser.add_argument("--only", default="", help="Aja vain tapaukset, joiden nimessä on tämä")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="Sallittu hidastuminen (0.3 = 30 %%)")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="Tallenna tulokset perustasoksi (yhdistää aiempiin)")
+    args = parser.parse_args(argv)
+
+    selected = [c for c in CASES if args.only in c["name"] and not (args.quick and (c["size"] or 0) > QUICK_MAX_SIZE)]
+    baseline = load_baseline(args.baseline)
+    if baseline and baseline.get("machine") != machine():
+        print(f"Huom: perustaso on mitattu eri ympäristössä ({baseline.get('machine')})", file=sys.stderr)
+
+    STUB = HttpStub()
+    results = {}
+    try:
+        for c in selected:
+            results[c["name"]] = run_case(c)
+            print(f"  {c['name']:42s} {_fmt(results[c['name']])}/op", file=sys.stderr)
+    finally:
+        STUB.close()
+
+    if args.save_baseline:
+        merged = {**(baseline or {}).get("results", {}), **results}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"machine": machine(), "saved_at": datetime.datetime.now().isoformat(timespec="seconds"), "results": merged}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Perustaso tallennettu: {args.baseline} ({len(results)} tapausta)")
+        return 0
+
+    regressions = 0
+    print(f"{'tapaus':42s} {'nyt':>11s} {'perustaso':>11s} {'muutos':>8s}")
+    for name, (now, before, ratio, regressed) in compare(results, baseline, args.threshold).items():
+        change = f"{(ratio - 1) * 100:+7.0f}%" if ratio else "     uusi"
+        print(f"{name:42s} {_fmt(now)} {_fmt(before) if before else ' ' * 11} {change}{'  ← REGRESSIO' if regressed else ''}")
+        regressions += regressed
+    if regressions: print(f"{regressions} regressiota (kynnys {args.threshold:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+"""Toistettavat synteettiset aineistot suorituskykymittauksiin (sama siemen -> sama data)."""
+import random
+import datetime
+
+from scoring import TARGET_ROLES, TECH_KEYWORDS, ANALYSIS_KEYWORDS
+from pipeline_analytics import STATUSES
+
+LOCATIONS = ["Helsinki", "Espoo", "Vantaa", "Tampere", "Turku", "Remote", "Oulu"]
+FILLER = ("tiimi asiakas kehittää vastuu rooli yritys kasvu työ osaaminen mahdollisuus kokemus "
+          "palvelu toimisto hybridi etätyö innostus laatu yhteistyö tavoite kehitys ratkaisu").split()
+
+
+def _vocabulary():
+    words = [*TARGET_ROLES, *TECH_KEYWORDS]
+    for terms in ANALYSIS_KEYWORDS.values(): words.extend(terms)
+    return words
+
+
+def posting_text(rng, words=300, keyword_share=0.05):
+    """Ilmoitusteksti: enimmäkseen täytesanoja, joukossa avainsanoja noin keyword_share-osuudella."""
+    vocabulary = _vocabulary()
+    return " ".join(rng.choice(vocabulary) if rng.random() < keyword_share else rng.choice(FILLER) for _ in range(words))
+
+
+def postings(n, seed=0, words=300):
+    """n ilmoitusta dictinä (title, location, company, url, description)."""
+    rng = random.Random(seed)
+    return [{
+        "title": f"{rng.choice(TARGET_ROLES).title()} {rng.choice(['', 'Senior ', 'Junior '])}".strip(),
+        "location": rng.choice(LOCATIONS),
+        "company": f"Yritys {rng.randrange(5000)} Oy",
+        "url": f"https://example.com/jobs/{i}",
+        "description": posting_text(rng, words),
+    } for i in range(n)]
+
+
+def tracker_items(n, seed=0, today=None):
+    """n seurattavaa hakemusta tallennusmuodossa (ISO-päivämäärät, kuten records.ApplicationRecord.to_dict)."""
+    rng = random.Random(seed)
+    today = today or datetime.date.today()
+    items = []
+    for i in range(n):
+        applied = today - datetime.timedelta(days=rng.randrange(120))
+        status = rng.choice(STATUSES)
+        interview = applied + datetime.timedelta(days=rng.randrange(5, 40)) if status == "Haastattelu" else None
+        items.append({
+            "id": f"item{i:07d}", "company": f"Yritys {i} Oy", "role": rng.choice(TARGET_ROLES), "status": status,
+            "date": applied.isoformat(), "interview_date": interview.isoformat() if interview else None,
+            "contact_name": "Testi Henkilö", "contact_email": f"rekry{i}@example.com",
+        })
+    return items
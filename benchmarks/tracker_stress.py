@@ -0,0 +1,94 @@
+"""Monen prosessin rasitusajo TrackerStorelle: ei kadonneita päivityksiä, nimiavaruudet erillään.
+
+Jokainen prosessi kasvattaa samaa jaettua laskuria optimistisella lukituksella (luku -> muutos ->
+upsert, ConflictError -> uusi yritys) ja lisää omia hakemuksiaan omaan nimiavaruuteensa.
+Seuraajaprosessi lukee muutokset changes_since-kutsulla kuten selainistunto.
+
+Käyttö:
+    python -m benchmarks.tracker_stress --procs 4 --ops 200
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import multiprocessing as mp
+
+from storage import TrackerStore, ConflictError
+
+SHARED_USER = "shared"
+COUNTER_ID = "counter"
+
+
+def worker(path, index, ops, start):
+    store = TrackerStore(path)
+    start.wait()
+    conflicts = 0
+    for i in range(ops):
+        while True:
+            item = store.get(COUNTER_ID, SHARED_USER)
+            item["count"] += 1
+            try:
+                store.upsert(item, SHARED_USER)
+                break
+            except ConflictError:
+                conflicts += 1
+        store.upsert({"company": f"Yritys {index}-{i}", "status": "Odottaa"}, f"user{index}")
+    return conflicts
+
+
+def follower(path, target, timeout, result):
+    """Seuraa jaettua nimiavaruutta muutosvirrasta kirjoitusten aikana, kunnes laskuri on valmis."""
+    store = TrackerStore(path)
+    deadline = time.monotonic() + timeout
+    seq, seen, polls = 0, 0, 0
+    while seen < target and time.monotonic() < deadline:
+        seq, changed = store.changes_since(seq, SHARED_USER)
+        polls += 1
+        if changed and changed.get(COUNTER_ID): seen = changed[COUNTER_ID]["count"]
+        time.sleep(0.005)
+    result.put((seen, polls))
+
+
+def run(procs, ops):
+    path = os.path.join(tempfile.mkdtemp(prefix="tracker_stress_"), "tracker.db")
+    store = TrackerStore(path)
+    store.upsert({"id": COUNTER_ID, "company": "laskuri", "count": 0}, SHARED_USER)
+    ctx = mp.get_context("spawn")
+    with ctx.Manager() as manager:
+        start = manager.Event()
+        result = ctx.Queue()
+        watcher = ctx.Process(target=follower, args=(path, procs * ops, 120, result))
+        watcher.start()
+        with ctx.Pool(procs) as pool:
+            pending = [pool.apply_async(worker, (path, i, ops, start)) for i in range(procs)]
+            started = time.perf_counter()
+            start.set()
+            conflicts = sum(p.get() for p in pending)
+        seconds = time.perf_counter() - started
+        seen, polls = result.get()
+        watcher.join()
+
+    counter = store.get(COUNTER_ID, SHARED_USER)
+    checks = {
+        "laskuri == prosessit * operaatiot": counter["count"] == procs * ops,
+        "versio == 1 + päivitykset": counter["version"] == 1 + procs * ops,
+        "nimiavaruudet erillään": all(len(store.load_all(f"user{i}")) == ops for i in range(procs)),
+        "seuraaja näki lopputilan": seen == procs * ops,
+    }
+    return {"seconds": seconds, "writes": procs * ops * 2, "conflicts": conflicts, "polls": polls, "checks": checks}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="TrackerStore-rasitusajo usealla prosessilla.")
+    parser.add_argument("--procs", type=int, default=4)
+    parser.add_argument("--ops", type=int, default=200)
+    args = parser.parse_args(argv)
+    r = run(args.procs, args.ops)
+    print(f"{r['writes']} kirjoitusta {r['seconds']:.2f} s ({r['writes'] / r['seconds']:,.0f}/s), ristiriitoja {r['conflicts']} (uudelleenyritetty)")
+    for name, ok in r["checks"].items(): print(f"  {'OK ' if ok else 'VIRHE'} {name}")
+    return 0 if all(r["checks"].values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
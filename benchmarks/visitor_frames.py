@@ -0,0 +1,80 @@
+"""Vertaa vierailijalokin vanhaa (kaikki sarakkeet object-tyyppisinä) ja tyypitettyä latausta.
+
+Käyttö:
+    python -m benchmarks.visitor_frames --rows 200000
+"""
+import io
+import sys
+import time
+import random
+import argparse
+import datetime
+
+import pandas as pd
+
+from visitors import read_visitor_csv
+
+COMPANIES = [f"Yritys {i} Oy" for i in range(300)]
+VISITORS = [f"Vierailija {i}" for i in range(2000)]
+
+
+def synthetic_csv(rows, seed=0):
+    """Sheetin kaltainen CSV: aikaleima, vierailija, yritys + ylimääräisiä tekstisarakkeita."""
+    rng = random.Random(seed)
+    start = datetime.datetime(2024, 1, 1)
+    out = io.StringIO()
+    out.write("Aikaleima,Nimi,Yritys,Sähköposti,Viesti\n")
+    for i in range(rows):
+        ts = start + datetime.timedelta(minutes=7 * i + rng.randrange(7))
+        visitor = rng.choice(VISITORS)
+        out.write(f"{ts.day}.{ts.month}.{ts.year} {ts.hour}.{ts.minute:02d}.{ts.second:02d},{visitor},{rng.choice(COMPANIES)},{visitor.replace(' ', '.').lower()}@example.com,Kävin katsomassa portfoliota {i}\n")
+    return out.getvalue()
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def legacy_load(text):
+    """Nykyinen tapa: kaikki sarakkeet objekteina."""
+    return pd.read_csv(io.StringIO(text), dtype=object)
+
+
+def legacy_aggregate(df):
+    """Sarakkeet sijainnin mukaan, päivä merkkijonon pilkkomisella."""
+    cols = df.columns
+    return df[cols[2]].value_counts().head(7), df[cols[0]].map(lambda ts: str(ts).split(" ")[0]).value_counts().sort_index()
+
+
+def typed_aggregate(df):
+    return df["company"].value_counts().head(7), df.groupby(df["timestamp"].dt.normalize()).size()
+
+
+def run(rows):
+    text = synthetic_csv(rows)
+    variants = {
+        "legacy": (legacy_load, legacy_aggregate),
+        "typed": (lambda t: read_visitor_csv(io.StringIO(t)), typed_aggregate),
+        "typed_chunked": (lambda t: read_visitor_csv(io.StringIO(t), chunksize=50_000), typed_aggregate),
+    }
+    results = {}
+    for name, (load, aggregate) in variants.items():
+        df, load_s = _timed(lambda: load(text))
+        _, aggregate_s = _timed(lambda: aggregate(df))
+        results[name] = {"memory_mb": df.memory_usage(deep=True).sum() / 1e6, "load_s": load_s, "aggregate_s": aggregate_s}
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Vierailijalokin muisti- ja aggregointivertailu.")
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args(argv)
+    for name, r in run(args.rows).items():
+        print(f"{name:14s} muisti {r['memory_mb']:8.1f} MB   lataus {r['load_s']:6.2f} s   aggregointi {r['aggregate_s'] * 1000:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+import datetime
+
+# ---------------------------------------------------------
+# HAKEMUSPOHJAT (ilman Streamlitiä, joten myös prosessipoolin työntekijät voivat tuoda tämän)
+# ---------------------------------------------------------
+
+USER_NAME = "Mission Jobs Commander"
+FUTURE_MAKER_LINK = "https://janmyllymaki.wixsite.com/future-maker/fi"
+HIGHLIGHTS = (("ai", "tekoälyosaamiseni"), ("visuaalinen", "visuaalisen silmäni"), ("projekti", "kokemukseni projektinhallinnasta"))
+BACKGROUND_CHARS = 150
+
+LETTER_TEMPLATE = """
+    {user_name}
+    Helsinki | {date}
+
+    Vastaanottaja: Rekrytointitiimi / {company}
+
+    HAKEMUS: {role_upper}
+
+    Hei,
+
+    Luin innostuneena ilmoituksenne, jossa haette {role}-osaajaa. Seuraan aktiivisesti {company}:n toimintaa ja uskon, että taustani toisi tiimiinne juuri oikeanlaista lisäarvoa.
+
+    MIKSI MINÄ?
+    Olen luovan alan ammattilainen, joka yhdistää visuaalisen suunnittelun ja modernit teknologiat. Ilmoituksessanne korostui tarve ratkaisukeskeiselle tekijälle.
+    
+    Omaan vahvan taustan, johon kuuluu:
+    - {background}... (Täydennä CV:stäsi)
+    - Kyky hyödyntää tekoälyä luovassa prosessissa
+    - Halu oppia uutta ja kehittää prosesseja
+
+    MITÄ TUON TALOON?
+    Uskon, että voisin hyödyntää {highlights} heti ensimmäisestä päivästä alkaen. Olen tottunut työskentelemään itsenäisesti, mutta nautin tiimityöstä, jossa sparraillaan ideoita.
+
+    Odotan innolla mahdollisuutta kertoa lisää osaamisestani haastattelussa.
+
+    Ystävällisin terveisin,
+
+    {user_name}
+    Portfolio: {portfolio}
+    """
+
+
+def _escape(value):
+    return value.replace("{", "{{").replace("}", "}}")
+
+
+# Pohja käännetään kerran: vakio-osat (nimi, portfoliolinkki) ovat valmiina, ja kirjeen
+# täyttö on yksi format_map-kutsu. Arvot lisätään sellaisinaan, joten ilmoitusten aaltosulkeet eivät haittaa.
+_COMPILED = LETTER_TEMPLATE.replace("{user_name}", _escape(USER_NAME)).replace("{portfolio}", _escape(FUTURE_MAKER_LINK))
+
+
+def highlight_text(job_text):
+    """Ilmoituksen korostukset; teksti muutetaan pieniksi kirjaimiksi kerran, ei jokaista hakusanaa kohden."""
+    text = job_text.lower()
+    highlights = [phrase for needle, phrase in HIGHLIGHTS if needle in text]
+    return " sekä ".join(highlights) if highlights else "monipuolisen osaamiseni"
+
+
+def render_letter(company, role, job_text, user_background, date_str):
+    return _COMPILED.format_map({
+        "company": company, "role": role, "role_upper": role.upper(), "date": date_str,
+        "background": user_background[:BACKGROUND_CHARS], "highlights": highlight_text(job_text),
+    })
+
+
+def generate_template_application(company, role, job_text, user_background):
+    """Luo älykkään hakemuspohjan ilman APIa."""
+    return render_letter(company, role, job_text, user_background, datetime.datetime.now().strftime("%d.%m.%Y"))
+
@@ -0,0 +1,203 @@
+from scoring import calculate_score
+
+# ---------------------------------------------------------
+# STAATTISET AINEISTOT (ladataan kerran per prosessi; main.py ajetaan uudelleen joka kerta)
+# ---------------------------------------------------------
+
+AI_STUDIES = [
+    {
+        "name": "Generative AI Learning Path",
+        "provider": "Google Cloud",
+        "url": "https://www.cloudskillsboost.google/paths/118",
+        "desc": "Googlen virallinen ja ilmainen polku generatiivisen tekoälyn syvälliseen ymmärtämiseen.",
+        "type": "SERTIFIKAATTI"
+    },
+    {
+        "name": "Opin.fi: Tekoäly & Luova osaaminen",
+        "provider": "Suomen Korkeakoulut (Digivisio)",
+        "url": "https://opin.fi/fi/search?q=teko%C3%A4ly",
+        "desc": "Kokoava haku. Kriteerit: Laskennallinen luovuus, XR, Visual Culture, Palvelumuotoilu & AI.",
+        "type": "HAKUPALVELU"
+    },
+    {
+        "name": "Elements of AI",
+        "provider": "Helsingin Yliopisto & Reaktor",
+        "url": "https://www.elementsofai.com/fi",
+        "desc": "Suomalainen klassikko. Pakollinen pohjatieto kaikille alalla toimiville.",
+        "type": "MOOC / ETÄ"
+    },
+    {
+        "name": "HY Avoin: Tekoäly & Data",
+        "provider": "Helsingin Yliopisto",
+        "url": "https://www.helsinki.fi/fi/hakeminen-ja-opetus/etsi-koulutuksia-ja-kursseja?s_format=mooc%2Cdistance_or_online_teaching&s_itg=open_university&s_q=ai",
+        "desc": "Helsingin yliopiston avoimet tekoälykurssit. MOOC-toteutuksia ja etäopintoja joustavasti.",
+        "type": "YLIOPISTO / MOOC"
+    },
+    {
+        "name": "FiTech - Tekoäly (Koko Suomi)",
+        "provider": "Yliopistoverkosto (Aalto ym.)",
+        "url": "https://fitech.io/fi/opinnot/?s=teko%C3%A4ly",
+        "desc": "Suomen laajin ilmainen tekniikan tarjonta. Etäopintoja Aallosta, LUTista ja Oulusta.",
+        "type": "YLIOPISTO / ETÄ"
+    },
+    {
+        "name": "Aalto Avoin: Art & Media",
+        "provider": "Aalto Arts",
+        "url": "https://www.aalto.fi/fi/taiteiden-ja-suunnittelun-korkeakoulu",
+        "desc": "Seuraa Aalto Artsin avoimia kursseja. Usein AI- ja mediayhteyksiä.",
+        "type": "YLIOPISTO (HKI)"
+    },
+    {
+        "name": "3AMK (AI & Future)",
+        "provider": "Metropolia, Haaga-Helia, Laurea",
+        "url": "https://www.3amk.fi/",
+        "desc": "Pääkaupunkiseudun korkeakoulujen yhteiset tulevaisuuskurssit.",
+        "type": "AMK (HKI)"
+    },
+    {
+        "name": "DeepLearning.AI: AI for Everyone",
+        "provider": "DeepLearning.AI",
+        "url": "https://www.deeplearning.ai/courses/ai-for-everyone/",
+        "desc": "Andrew Ng:n kurssi bisnespuolelle ja tuottajille. Ei vaadi koodausta.",
+        "type": "KV / ETÄ"
+    }
+]
+
+AGENCIES = {
+    "Avidly": "https://www.avidlyagency.com/fi/ura-avidlylla",
+    "Bob the Robot": "https://www.bobtherobot.fi/",
+    "Futurice": "https://www.futurice.com/careers",
+    "hasan & partners": "https://www.hasanpartners.fi/contact",
+    "Kuulu": "https://www.kuulu.fi/",
+    "Miltton": "https://miltton.com/career",
+    "N2 Creative": "https://n2.fi/",
+    "Reaktor": "https://www.reaktor.com/careers",
+    "SEK": "https://sek.io/en/careers/",
+    "Siili Solutions": "https://www.siili.com/join-us",
+    "TBWA\\Helsinki": "https://www.tbwa.fi/",
+    "Valve": "https://www.valve.fi/join-us",
+    "Vincit": "https://www.vincit.com/careers",
+}
+
+SCHOOLS_DATA = [
+    {
+        "name": "Aalto-yliopisto (Taiteet & Suunnittelu)", 
+        "url": "https://www.aalto.fi/fi/taiteiden-ja-suunnittelun-korkeakoulu", 
+        "logo": "https://www.aalto.fi/themes/custom/aalto/logo.svg",
+        "status": "⭐ HUIPPU"
+    },
+    {
+        "name": "HEO Kansanopisto (Graafinen & Kuvallinen)", 
+        "url": "https://www.heo.fi/kulttuuri-ja-taide/", 
+        "logo": "https://www.heo.fi/wp-content/themes/heo/images/logo.png",
+        "status": "Portfolio"
+    },
+    {
+        "name": "Metropolia AMK (Viestintä & Muotoilu)", 
+        "url": "https://www.metropolia.fi/fi/opiskelu/amk-tutkinnot/viestinta", 
+        "logo": "https://www.metropolia.fi/themes/custom/metropolia/logo.svg",
+        "status": "AMK / Haku"
+    },
+    {
+        "name": "Haaga-Helia (Journalismi & Digi)", 
+        "url": "https://www.haaga-helia.fi/fi/koulutus/media-ja-viestinta", 
+        "logo": "https://www.haaga-helia.fi/themes/custom/hh/logo.svg",
+        "status": "AMK / Haku"
+    },
+    {
+        "name": "Humak (Kulttuurituottaja)", 
+        "url": "https://www.humak.fi/koulutus/kulttuurituottaja/", 
+        "logo": "https://www.humak.fi/wp-content/themes/humak/images/logo.svg",
+        "status": "AMK / Tuottaja"
+    },
+    {
+        "name": "Taitotalo (Media-alan PT)", 
+        "url": "https://www.taitotalo.fi/koulutus/media-alan-ja-kuvallisen-ilmaisun-perustutkinto", 
+        "logo": "https://www.taitotalo.fi/themes/custom/taitotalo/logo.svg",
+        "status": "Ammatillinen"
+    },
+    {
+        "name": "Stadin AO (Media & Kuvallinen)", 
+        "url": "https://stadinao.fi/koulutustarjonta/media-alan-ja-kuvallisen-ilmaisun-perustutkinto/", 
+        "logo": "https://stadinao.fi/wp-content/themes/stadinao/assets/images/logo.svg",
+        "status": "Jatkuva haku"
+    },
+    {
+        "name": "Varia (Media-ala)", 
+        "url": "https://www.vantaa.fi/fi/palveluhakemisto/palvelu/media-alan-ja-kuvallisen-ilmaisun-perustutkinto-varia", 
+        "logo": "https://www.vantaa.fi/themes/custom/vantaa/logo.svg",
+        "status": "Vantaa"
+    },
+    {
+        "name": "Omnia (Media)", 
+        "url": "https://www.omnia.fi/koulutushaku/media-alan-ja-kuvallisen-ilmaisun-perustutkinto", 
+        "logo": "https://www.omnia.fi/themes/custom/omnia/logo.svg",
+        "status": "Espoo"
+    },
+    {
+        "name": "Business College Helsinki (Digi)", 
+        "url": "https://bc.fi/koulutukset/tieto-ja-viestintatekniikan-perustutkinto/", 
+        "logo": "https://bc.fi/wp-content/themes/bch/images/logo.svg",
+        "status": "Helsinki"
+    },
+    {
+        "name": "Rastor-instituutti (Markkinointi)", 
+        "url": "https://www.rastorinst.fi/koulutus/markkinointi-ja-viestinta", 
+        "logo": "https://www.rastorinst.fi/themes/custom/rastor/logo.svg",
+        "status": "Aikuis"
+    },
+    {
+        "name": "Careeria (Media)", 
+        "url": "https://careeria.fi/koulutus/media-alan-ja-kuvallisen-ilmaisun-perustutkinto/", 
+        "logo": "https://careeria.fi/wp-content/themes/careeria/assets/images/logo.svg",
+        "status": "Hki/Vantaa"
+    }
+]
+
+STARTUPS_PK = {
+    "Aalto Startup Center": "https://startupcenter.aalto.fi/",
+    "Kiuas Accelerator": "https://www.kiuas.com/",
+    "Maria 01 (Careers)": "https://maria.io/careers/",
+    "Supercell Careers": "https://supercell.com/en/careers/",
+    "The Hub (Helsinki Jobs)": "https://thehub.io/jobs?location=Helsinki",
+    "Wolt Careers": "https://careers.wolt.com/en"
+}
+
+SITES_INTL = {
+    "Behance Jobs": "https://www.behance.net/joblist",
+    "Design Jobs Board": "https://www.designjobsboard.com/",
+    "Krop": "https://www.krop.com/"
+}
+
+SITES_FI_NORDIC = {
+    "Journalistiliitto (Etusivu)": "https://journalistiliitto.fi/",
+    "Kuntarekry (Kulttuuri)": "https://www.kuntarekry.fi/fi/tyopaikat/kulttuuri-ja-museoala/",
+    "Medialiitto (Työpaikat)": "https://www.medialiitto.fi/medialiitto/tyopaikat/",
+    "TAKU ry": "https://taku.fi/avainsana/tyopaikat/"
+}
+
+SITES_MEDIA = {
+    "Media Match": "https://www.media-match.com/",
+    "ProductionHUB": "https://www.productionhub.com/jobs"
+}
+
+# Johdetut rakenteet lasketaan kerran tuonnin yhteydessä
+
+ALL_SITE_URLS = tuple(dict.fromkeys([
+    *AGENCIES.values(), *STARTUPS_PK.values(),
+    *(s['url'] for s in SCHOOLS_DATA), *(c['url'] for c in AI_STUDIES),
+    *SITES_INTL.values(), *SITES_FI_NORDIC.values(), *SITES_MEDIA.values(),
+]))
+
+def image_urls():
+    """Sivuilla näytettävät kuvat: mainostoimistojen faviconit (assets.py hakee ne taustalla)."""
+    from assets import favicon_url
+    return [favicon_url(url) for url in AGENCIES.values()]
+
+
+def recommendation_candidates():
+    """Koulut ja start-upit pisteytettyinä (ilman linkkitarkistusta ja suodatusta)."""
+    candidates = [{"name": school['name'], "url": school['url'], "cat": "🎓 Koulutus"} for school in SCHOOLS_DATA]
+    candidates += [{"name": name, "url": url, "cat": "💼 Työ / Hub"} for name, url in STARTUPS_PK.items()]
+    for cand in candidates: cand['score'] = calculate_score(cand['name'], "Helsinki")
+    return candidates
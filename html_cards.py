@@ -0,0 +1,116 @@
+import hashlib
+import threading
+from functools import lru_cache
+from collections import OrderedDict
+
+from instrumentation import cache_event
+
+# ---------------------------------------------------------
+# HTML-KORTIT (tyylit kerran, ruudukko yhtenä markdown-elementtinä)
+# ---------------------------------------------------------
+# Kortti per st.markdown -kutsu tarkoitti kymmeniä delta-viestejä ja <style>-lohkon jokaisella
+# välilehdellä. Nyt jokainen ruudukko on yksi elementti (CSS grid st.columnsin sijaan), ja valmis
+# HTML muistetaan aineiston sisältötiivisteellä: sama aineisto -> sama merkkijono ilman uudelleenrakennusta.
+
+GRID_CACHE_SIZE = 64
+
+STYLES = {
+    "base": """
+    .stApp { overflow-x: hidden; }
+    @media (max-width: 768px) {
+        .block-container { padding: 1rem; }
+        .stButton button { width: 100%; }
+        .ai-card, .rec-card { min-height: auto; }
+        .card-grid { grid-template-columns: 1fr !important; }
+    }
+    .cta-container { display: flex; justify-content: center; margin: 20px 0; }
+    .cta-button {
+        background-color: #0a66c2; color: white !important; padding: 16px 32px;
+        border-radius: 8px; font-weight: bold; text-decoration: none; text-align: center;
+        box-shadow: 0 4px 6px rgba(0,0,0,0.1); display: inline-block;
+    }
+    .cta-button.dark { background-color: #333; }""",
+    "grid": """
+    .card-grid { display: grid; grid-template-columns: repeat(var(--cols, 3), minmax(0, 1fr)); gap: 1rem; margin-bottom: 1rem; }
+    .card-grid.tight { gap: 0 1rem; }""",
+    "link": """
+    .responsive-link-btn {
+        display: flex; align-items: center; justify-content: center; padding: 12px;
+        background: #262730; border: 1px solid #464b5f; border-radius: 8px;
+        margin-bottom: 8px; text-decoration: none; color: white !important; width: 100%;
+        transition: background 0.2s; font-weight: 500;
+        box-sizing: border-box;
+    }
+    .responsive-link-btn:hover { background: #363740; }
+    .responsive-link-btn img { width: 20px; height: 20px; margin-right: 10px; object-fit: contain; }""",
+    "metric": """
+    .metric-card { background: linear-gradient(135deg, #2b2d42 0%, #1e1e24 100%); border: 1px solid #464b5f; border-radius: 10px; padding: 15px; text-align: center; box-shadow: 0 4px 6px rgba(0,0,0,0.3); }
+    .metric-value { font-size: 1.8rem; font-weight: bold; color: #4DA6FF; margin: 0; }
+    .metric-label { font-size: 0.9rem; color: #b0b0b0; text-transform: uppercase; letter-spacing: 1px; }""",
+    "rec": """
+    .rec-card { background-color: #262730; border: 1px solid #464b5f; border-radius: 10px; padding: 15px; margin-bottom: 10px; transition: box-shadow 0.3s; }
+    .rec-card:hover { box-shadow: 0 4px 15px rgba(0,0,0,0.3); border-color: #777; }
+    .rec-title { font-size: 1.1rem; font-weight: bold; color: white; margin-bottom: 5px; }
+    .rec-cat { font-size: 0.8rem; text-transform: uppercase; color: #aaa; letter-spacing: 1px; }
+    .rec-badge { background-color: #0a66c2; color: white; padding: 2px 8px; border-radius: 4px; font-size: 0.8rem; font-weight: bold; }""",
+    "ai": """
+    .ai-card { background: linear-gradient(135deg, #2b2d42 0%, #1e1e24 100%); border: 1px solid #4DA6FF; border-radius: 12px; padding: 20px; min-height: 300px; height: 100%; box-sizing: border-box; display: flex; flex-direction: column; justify-content: space-between; box-shadow: 0 4px 6px rgba(0,0,0,0.3); }
+    .ai-type { color: #00d4ff !important; font-size: 0.75em; font-weight: bold; text-transform: uppercase; }
+    .ai-title { color: white !important; font-size: 1.2rem; font-weight: bold; margin: 5px 0; }
+    .ai-provider { color: #b0b0b0 !important; font-size: 0.9rem; font-style: italic; margin-bottom: 10px; }
+    .ai-desc { color: #e0e0e0 !important; font-size: 0.9rem; flex-grow: 1; }
+    .ai-link { background: #4DA6FF; color: white !important; padding: 8px 16px; border-radius: 20px; text-decoration: none; font-weight: bold; display: inline-block; white-space: nowrap; font-size: 0.9rem; }
+    .ai-link:hover { background: #008cff; }""",
+}
+
+
+@lru_cache(maxsize=None)
+def stylesheet(*kinds):
+    """Perustyylit ja annettujen korttien tyylit yhtenä <style>-lohkona (sama lohko vain kerran).
+    Lisätään kerran per ajo, joten välilehti ei lähetä muiden välilehtien sääntöjä."""
+    return "<style>" + "\n".join(dict.fromkeys(STYLES[kind].rstrip() for kind in ("base", *kinds))) + "\n</style>"
+
+
+# --- KORTIT ---
+
+def link_button(item):
+    return f"""<a href="{item['url']}" target="_blank" class="responsive-link-btn"><img src="{item['logo']}">{item['name']}</a>"""
+
+def metric_card(item):
+    return f"""<div class="metric-card"><div class="metric-value">{item['value']}</div><div class="metric-label">{item['label']}</div></div>"""
+
+def ai_card(course):
+    return f"""<div class="ai-card"><div><div class="ai-type">{course['type']}</div><div class="ai-title">{course['name']}</div><div class="ai-provider">{course['provider']}</div><div class="ai-desc">{course['desc']}</div></div><div style="text-align:right; margin-top:20px;"><a href="{course['url']}" target="_blank" class="ai-link">Tutustu ➜</a></div></div>"""
+
+def rec_card(sug):
+    """Suosituskortti; napit ovat Streamlit-widgettejä, joten kortit piirretään yksitellen (ei ruudukkona)."""
+    return f"""<div class="rec-card"><div class="rec-cat">{sug['cat']}</div><div class="rec-title">{sug['name']} <span class="rec-badge">{sug['score']}/5</span></div><a href="{sug['url']}" target="_blank" style="color:#4da6ff; text-decoration:none;">🔗 Avaa sivu</a></div>"""
+
+CARDS = {"link": link_button, "metric": metric_card, "ai": ai_card}
+
+
+# --- RUUDUKOT ---
+
+_grids = OrderedDict()
+_lock = threading.Lock()
+
+
+def content_hash(items):
+    """Aineiston tiiviste; repr riittää, koska kortit rakennetaan samassa järjestyksessä samoista dicteistä."""
+    return hashlib.sha1(repr(items).encode("utf-8")).hexdigest()
+
+
+def grid(kind, items, columns=3, tight=False):
+    """Kortit yhtenä HTML-merkkijonona (CSS grid). Muistetaan (kind, sarakkeet, sisältötiiviste) -avaimella."""
+    key = (kind, columns, tight, content_hash(items))
+    with _lock:
+        html = _grids.get(key)
+        if html is not None: _grids.move_to_end(key)
+    cache_event(f"grid:{kind}", html is not None)
+    if html is not None: return html
+    card = CARDS[kind]
+    html = f"""<div class="card-grid{' tight' if tight else ''}" style="--cols: {columns}">{''.join(f'<div>{card(item)}</div>' for item in items)}</div>"""
+    with _lock:
+        _grids[key] = html
+        while len(_grids) > GRID_CACHE_SIZE: _grids.popitem(last=False)
+    return html
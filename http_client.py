@@ -0,0 +1,155 @@
+import threading
+from collections import OrderedDict, defaultdict
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# ---------------------------------------------------------
+# JAETTU HTTP-ASIAKAS (keep-alive, ehdolliset pyynnöt, mittarit)
+# ---------------------------------------------------------
+
+HEADERS = {'User-Agent': 'Mozilla/5.0'}
+POOL_HOSTS = 32             # hostikohtaisia yhteyspooleja muistissa
+POOL_PER_HOST = 8           # keep-alive-yhteyksiä per host (= linkkitarkistuksen rinnakkaisuus)
+PROBE_BYTES = 4096          # HEADin korvaava GET pyytää ja lukee korkeintaan näin monta tavua
+VALIDATOR_LIMIT = 5000      # muistettujen ETag/Last-Modified-parien enimmäismäärä
+READ_CHUNK = 16 * 1024
+
+
+class Reply:
+    """Luettu vastaus. not_modified=True tarkoittaa 304:ää: sisältö on sama kuin edellisellä haulla, content on tyhjä."""
+    __slots__ = ("status", "url", "headers", "content", "not_modified")
+
+    def __init__(self, status, url, headers, content=b""):
+        self.status, self.url, self.headers, self.content = status, url, headers, content
+        self.not_modified = status == 304
+
+    @property
+    def ok(self):
+        return self.status in (200, 206, 304)
+
+    def text(self, encoding="utf-8"):
+        return self.content.decode(encoding, errors="replace")
+
+    def raise_for_status(self):
+        if self.status >= 400: raise requests.HTTPError(f"{self.status} {self.url}")
+
+
+class HttpClient:
+    """Yksi Session koko hubille: urllib3 pitää oman keep-alive-poolin jokaiselle hostille.
+
+    Vastausten ETag/Last-Modified muistetaan, ja ehdollinen pyyntö lähettää ne takaisin; 304 palautuu
+    Replyna (not_modified), jolloin kutsuja tietää, ettei mitään tarvitse käsitellä uudelleen.
+    Pyynnöt ja vastaanotetut tavut (siirretyt, ennen purkua) lasketaan hostikohtaisesti.
+    """
+
+    def __init__(self, headers=HEADERS, pool_hosts=POOL_HOSTS, pool_per_host=POOL_PER_HOST, probe_bytes=PROBE_BYTES):
+        self.probe_bytes = probe_bytes
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_per_host)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._validators = OrderedDict()
+        self._stats = defaultdict(lambda: defaultdict(int))
+        self._lock = threading.Lock()
+
+    # --- PYYNNÖT ---
+
+    def request(self, method, url, timeout, conditional=False, max_bytes=None, headers=None, allow_redirects=True):
+        """Tekee pyynnön ja lukee rungon (korkeintaan max_bytes tavua). Verkkovirheet nousevat requests-poikkeuksina."""
+        headers = dict(headers or {})
+        if conditional: headers.update(self._conditional_headers(url))
+        if max_bytes: headers.setdefault("Range", f"bytes=0-{max_bytes - 1}")
+        self._count(url, "requests")
+        try:
+            response = self.session.request(method, url, headers=headers, timeout=timeout, allow_redirects=allow_redirects, stream=True)
+            # Runko luetaan saman käsittelijän sisällä: kesken rungon katkeava yhteys on myös virhe
+            with response:
+                try:
+                    content = b"" if method == "HEAD" else self._read(response, max_bytes)
+                finally:
+                    self._count(url, "bytes", response.raw.tell())
+        except requests.RequestException:
+            self._count(url, "errors")
+            raise
+        if response.status_code == 304: self._count(url, "not_modified")
+        elif response.status_code == 200: self._remember(url, response.headers)
+        return Reply(response.status_code, response.url, response.headers, content)
+
+    def _read(self, response, max_bytes):
+        """Lukee rungon paloina. Jos palvelin ei välitä Range-otsakkeesta, lukeminen katkaistaan rajaan
+        ja yhteys suljetaan (sitä ei palauteta pooliin puoliksi luettuna)."""
+        chunks, size = [], 0
+        for chunk in response.iter_content(READ_CHUNK):
+            chunks.append(chunk)
+            size += len(chunk)
+            if max_bytes and size >= max_bytes: break
+        content = b"".join(chunks)
+        return content[:max_bytes] if max_bytes else content
+
+    def get(self, url, timeout, conditional=True):
+        """Koko runko; oletuksena ehdollinen (304 -> Reply.not_modified)."""
+        return self.request("GET", url, timeout, conditional=conditional)
+
+    def probe(self, url, timeout):
+        """Linkin tila: HEAD, ja jos se ei kelpaa (esim. 403/405), rajattu GET, josta luetaan vain alku.
+        Aiemmin tarkistettu sivu, joka ei ole muuttunut, vastaa 304 eikä siirrä runkoa lainkaan."""
+        reply = self.request("HEAD", url, timeout, conditional=True)
+        if reply.status not in (200, 304):
+            reply = self.request("GET", url, timeout, conditional=True, max_bytes=self.probe_bytes)
+        return reply
+
+    # --- VALIDAATTORIT ---
+
+    def _conditional_headers(self, url):
+        with self._lock:
+            etag, modified = self._validators.get(url, (None, None))
+        headers = {}
+        if etag: headers["If-None-Match"] = etag
+        if modified: headers["If-Modified-Since"] = modified
+        return headers
+
+    def _remember(self, url, headers):
+        etag, modified = headers.get("ETag"), headers.get("Last-Modified")
+        if not (etag or modified): return
+        with self._lock:
+            self._validators[url] = (etag, modified)
+            self._validators.move_to_end(url)
+            while len(self._validators) > VALIDATOR_LIMIT: self._validators.popitem(last=False)
+
+    def forget(self, url):
+        """Unohtaa osoitteen validaattorit: seuraava haku on ehdoton (esim. kun edellistä vastausta ei saatu käsiteltyä)."""
+        with self._lock:
+            self._validators.pop(url, None)
+
+    # --- MITTARIT ---
+
+    def _count(self, url, key, n=1):
+        host = urlsplit(url).netloc
+        with self._lock:
+            self._stats[host][key] += n
+
+    def stats(self):
+        """{"requests", "bytes", "not_modified", "errors", "hosts": {host: samat avaimet}}"""
+        with self._lock:
+            hosts = {host: dict(counts) for host, counts in self._stats.items()}
+        totals = {key: sum(h.get(key, 0) for h in hosts.values()) for key in ("requests", "bytes", "not_modified", "errors")}
+        return {**totals, "hosts": hosts}
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats.clear()
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_client():
+    """Prosessin yhteinen asiakas: linkkitarkistukset ja vierailijaloki käyttävät samoja yhteyksiä ja validaattoreita."""
+    global _shared
+    with _shared_lock:
+        if _shared is None: _shared = HttpClient()
+        return _shared
@@ -0,0 +1,171 @@
+import io
+import os
+import time
+import json
+import pstats
+import cProfile
+import tempfile
+import threading
+from functools import wraps
+from collections import deque, defaultdict
+
+# ---------------------------------------------------------
+# INSTRUMENTOINTI (ajojen aikajanat, Chrome trace ja cProfile)
+# ---------------------------------------------------------
+
+# Päällä koko prosessille (myös taustasäikeet), jos HUB_PROFILE=1; muuten vain istunnoissa,
+# jotka aloittavat ajon itse (start_rerun), esim. ?debug=1.
+ENABLED = os.environ.get("HUB_PROFILE", "") not in ("", "0")
+BACKGROUND_KEEP = 2000      # taustasäikeiden viimeisimmät välit (linkkitarkistukset, ajastetut päivitykset)
+
+_local = threading.local()
+_background = deque(maxlen=BACKGROUND_KEEP)
+_PID = os.getpid()
+
+
+class Trace:
+    """Yhden sivuajon välit: (nimi, kategoria, alku ns, kesto ns, säie, lisätiedot)."""
+
+    def __init__(self, label=""):
+        self.label = label
+        self.started = time.perf_counter_ns()
+        self.tid = threading.get_ident()
+        self.spans = []
+        self.events = []       # välimuistin osumat/ohitukset: (nimi, kategoria, aika ns, osuma)
+        self.duration_ns = None
+
+    @property
+    def ms(self):
+        return (self.duration_ns or time.perf_counter_ns() - self.started) / 1e6
+
+    def breakdown(self):
+        """Kokonaisaika ja kutsumäärä (kategoria, nimi) -pareittain, hitain ensin. Sisäkkäiset välit lasketaan molempiin."""
+        totals = defaultdict(lambda: [0, 0])
+        for name, category, _, duration, _, _ in self.spans:
+            totals[category, name][0] += duration
+            totals[category, name][1] += 1
+        rows = [{"kategoria": c, "nimi": n, "ms": ns / 1e6, "kertaa": k} for (c, n), (ns, k) in totals.items()]
+        return sorted(rows, key=lambda r: -r["ms"])
+
+    def cache_stats(self):
+        """{välimuisti: (osumat, ohitukset)}"""
+        stats = defaultdict(lambda: [0, 0])
+        for name, _, _, hit in self.events: stats[name][0 if hit else 1] += 1
+        return {name: tuple(v) for name, v in stats.items()}
+
+
+class _Span:
+    __slots__ = ("name", "category", "args", "trace", "started", "ms")
+
+    def __init__(self, name, category, args, trace):
+        self.name, self.category, self.args, self.trace = name, category, args, trace
+
+    def __enter__(self):
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        duration = time.perf_counter_ns() - self.started
+        self.ms = duration / 1e6
+        record = (self.name, self.category, self.started, duration, threading.get_ident(), self.args)
+        if self.trace is not None: self.trace.spans.append(record)
+        else: _background.append(record)
+        return False
+
+
+class _NullSpan:
+    """Pois päältä: ei aikaleimoja eikä tallennusta, vain ms=0 yhteensopivuuden vuoksi."""
+    ms = 0.0
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+
+
+_NULL = _NullSpan()
+
+
+def span(name, category="app", **args):
+    """Aikaväli with-lohkona. Kirjataan säikeen käynnissä olevaan ajoon tai (HUB_PROFILE) taustapuskuriin.
+
+    Pois päältä ollessa kustannus on yksi attribuuttihaku, joten kutsut voivat jäädä koodiin pysyvästi.
+    """
+    trace = getattr(_local, "trace", None)
+    if trace is None and not ENABLED: return _NULL
+    return _Span(name, category, args, trace)
+
+
+def timed(category, name=None):
+    """Funktiodekoraattori: koko kutsu yhtenä välinä."""
+    def decorate(fn):
+        label = name or fn.__name__
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(label, category):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def cache_event(name, hit, category="cache"):
+    """Välimuistin osuma tai ohitus (näkyy aikajanalla hetkellisenä tapahtumana)."""
+    trace = getattr(_local, "trace", None)
+    if trace is not None: trace.events.append((name, category, time.perf_counter_ns(), hit))
+
+
+def start_rerun(label=""):
+    _local.trace = Trace(label)
+    return _local.trace
+
+
+def finish_rerun():
+    trace = getattr(_local, "trace", None)
+    _local.trace = None
+    if trace is not None: trace.duration_ns = time.perf_counter_ns() - trace.started
+    return trace
+
+
+def background_spans():
+    return list(_background)
+
+
+# --- VIENTI ---
+
+def chrome_trace(traces, background=()):
+    """Chrome trace-event -muoto (chrome://tracing, ui.perfetto.dev): yksi rivi per säie, ajot peräkkäin."""
+    events = []
+    threads = {}
+    for trace in traces:
+        threads[trace.tid] = "sivuajo"
+        events.append({"name": f"ajo {trace.label}", "cat": "rerun", "ph": "X", "ts": trace.started / 1e3, "dur": trace.ms * 1e3, "pid": _PID, "tid": trace.tid})
+        for name, category, at, hit in trace.events:
+            events.append({"name": f"{name} {'osuma' if hit else 'ohitus'}", "cat": category, "ph": "i", "s": "t", "ts": at / 1e3, "pid": _PID, "tid": trace.tid})
+    spans = [s for trace in traces for s in trace.spans] + list(background)
+    for name, category, started, duration, tid, args in spans:
+        threads.setdefault(tid, "tausta")
+        events.append({"name": name, "cat": category, "ph": "X", "ts": started / 1e3, "dur": duration / 1e3, "pid": _PID, "tid": tid, "args": args})
+    events.extend({"name": "thread_name", "ph": "M", "pid": _PID, "tid": tid, "args": {"name": f"{kind} {tid}"}} for tid, kind in threads.items())
+    return json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}, ensure_ascii=False, default=str)
+
+
+class Profiler:
+    """cProfile yhdelle ajolle; tulos .prof-tiedostona (snakeviz, pstats) ja lyhyenä tekstiyhteenvetona."""
+
+    def __init__(self):
+        self._profile = cProfile.Profile()
+
+    def __enter__(self):
+        self._profile.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self._profile.disable()
+        return False
+
+    def dump(self):
+        with tempfile.NamedTemporaryFile(suffix=".prof") as tmp:
+            self._profile.dump_stats(tmp.name)
+            return tmp.read()
+
+    def summary(self, limit=25):
+        out = io.StringIO()
+        pstats.Stats(self._profile, stream=out).sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
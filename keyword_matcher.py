@@ -0,0 +1,92 @@
+import re
+from collections import namedtuple, defaultdict
+
+# ---------------------------------------------------------
+# AVAINSANAHAKU (yksi käännetty regex kaikille sanoille)
+# ---------------------------------------------------------
+
+# Lyhyet termit (esim. "ai", "XR", "ICT") vaativat kokonaisen sanan, muuten ne osuisivat
+# sanojen sisään ("kaikki", "extra"). Pidemmät termit osuvat myös yhdyssanoihin ja
+# taivutusmuotoihin ("projektipäällikkö", "strategia"), kuten ennenkin.
+WHOLE_WORD_MAX_LEN = 3
+
+Hit = namedtuple("Hit", ["term", "start", "end", "groups"])
+
+
+def normalize_term(term):
+    return " ".join(term.split()).lower()
+
+
+class KeywordMatcher:
+    """Etsii kaikki ryhmien termit tekstistä yhdellä läpikäynnillä."""
+
+    def __init__(self, groups):
+        self.groups = {name: [normalize_term(t) for t in terms] for name, terms in groups.items()}
+        self.term_groups = defaultdict(set)
+        for name, terms in self.groups.items():
+            for term in terms: self.term_groups[term].add(name)
+        # Pisin ensin, jotta samasta kohdasta alkavista termeistä regex valitsee pisimmän;
+        # lyhyemmät etuliitetermit tarkistetaan erikseen (prefixes)
+        terms = sorted(self.term_groups, key=len, reverse=True)
+        self.prefixes = {t: [s for s in terms if s != t and t.startswith(s)] for t in terms}
+        # Termit puurakenteena (trie), jolloin regex vertaa jokaisessa kohdassa vain
+        # yhteisiä etuliitteitä eikä kokeile jokaista termiä erikseen
+        free = [t for t in terms if not self._needs_boundary(t)]
+        bounded = [t for t in terms if self._needs_boundary(t)]
+        alternatives = []
+        if free: alternatives.append(self._trie_pattern(self._build_trie(free)))
+        if bounded: alternatives.append(r"\b(?:" + self._trie_pattern(self._build_trie(bounded)) + r")\b")
+        source = "(?=(" + "|".join(alternatives) + "))"
+        # Teksti muutetaan pieniksi kirjaimiksi kerran; IGNORECASE on selvästi hitaampi.
+        # Varalla, jos lower() muuttaa tekstin pituutta (sijainnit eivät silloin täsmäisi).
+        self.pattern = re.compile(source)
+        self._ignorecase_pattern = re.compile(source, re.IGNORECASE)
+
+    @staticmethod
+    def _needs_boundary(term):
+        return len(term) <= WHOLE_WORD_MAX_LEN
+
+    @staticmethod
+    def _build_trie(terms):
+        root = {}
+        for term in terms:
+            node = root
+            for ch in term: node = node.setdefault(ch, {})
+            node[""] = True
+        return root
+
+    @classmethod
+    def _trie_pattern(cls, node):
+        terminal = "" in node
+        alts = [re.escape(ch) + cls._trie_pattern(child) for ch, child in sorted(node.items()) if ch]
+        if not alts: return ""
+        body = alts[0] if len(alts) == 1 and not terminal else "(?:" + "|".join(alts) + ")"
+        # Ahne "?" kokeilee ensin pidempää termiä ja palaa tarvittaessa lyhyempään
+        return body + "?" if terminal else body
+
+    @staticmethod
+    def _is_word_char(text, i):
+        return 0 <= i < len(text) and (text[i].isalnum() or text[i] == "_")
+
+    def find_all(self, text):
+        """Palauttaa kaikki osumat (myös päällekkäiset) sijainteineen."""
+        hits = []
+        lowered = text.lower()
+        matches = self.pattern.finditer(lowered) if len(lowered) == len(text) else self._ignorecase_pattern.finditer(text)
+        for m in matches:
+            start = m.start()
+            matched = m.group(1).lower()
+            term = matched if matched in self.term_groups else normalize_term(matched)
+            hits.append(Hit(term, start, start + len(matched), frozenset(self.term_groups[term])))
+            for prefix in self.prefixes.get(term, ()):
+                end = start + len(prefix)
+                if self._needs_boundary(prefix) and (self._is_word_char(text, start - 1) or self._is_word_char(text, end)): continue
+                hits.append(Hit(prefix, start, end, frozenset(self.term_groups[prefix])))
+        return hits
+
+    def terms_by_group(self, text):
+        """{ryhmä: {löydetyt termit}} tekstille."""
+        found = defaultdict(set)
+        for hit in self.find_all(text):
+            for group in hit.groups: found[group].add(hit.term)
+        return found
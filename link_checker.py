@@ -0,0 +1,68 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import requests
+
+from http_client import shared_client
+from instrumentation import span
+
+# ---------------------------------------------------------
+# RINNAKKAINEN LINKKIEN TARKISTUS
+# ---------------------------------------------------------
+
+REQUEST_TIMEOUT = 2
+MAX_WORKERS = 8
+BATCH_DEADLINE = 6.0
+
+
+class LinkChecker:
+    """Tarkistaa linkkejä rinnakkain hubin yhteisen HTTP-asiakkaan (http_client) yhteyspoolien kautta.
+    Tulokset tallentaa link_health.LinkHealthStore; tällä luokalla ei ole omaa välimuistia."""
+
+    def __init__(self, max_workers=MAX_WORKERS, timeout=REQUEST_TIMEOUT, deadline=BATCH_DEADLINE, client=None):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.deadline = deadline
+        self.client = client or shared_client()
+
+    def probe(self, url):
+        """Tarkistaa linkin ja palauttaa tilan, viiveen ja lopullisen osoitteen.
+
+        Kelvollisia ovat 200, 206 (rajattu GET) ja 304 (ennallaan edellisestä tarkistuksesta).
+        """
+        started = time.monotonic()
+        try:
+            with span(url, "network"):
+                reply = self.client.probe(url, self.timeout)
+            ok, status, final_url = reply.ok, reply.status, reply.url
+        except requests.RequestException:
+            ok, status, final_url = False, None, url
+        return {"ok": ok, "status": status, "latency_ms": (time.monotonic() - started) * 1000, "final_url": final_url}
+
+    def _run_parallel(self, fn, urls, deadline):
+        """Ajaa fn(url) rinnakkain; aikarajan ylittäneet palautetaan tuloksella None."""
+        if not urls: return
+        ends_at = time.monotonic() + deadline
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls)))
+        futures = {executor.submit(fn, url): url for url in urls}
+        try:
+            while futures:
+                remaining = ends_at - time.monotonic()
+                if remaining <= 0: break
+                done, _ = wait(futures, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield futures.pop(future), future.result()
+            for url in futures.values():
+                yield url, None
+        finally:
+            # Ei jäädä odottamaan hitaita hosteja; käynnissä olevat päättyvät omaan timeoutiinsa
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def iter_probes(self, urls, deadline=None):
+        """Tarkistaa listan rinnakkain ja palauttaa (url, probe()-tulos) -pareja valmistumisjärjestyksessä.
+
+        Kokonaisaikarajan jälkeen keskeneräiset linkit palautetaan tuloksella None.
+        """
+        deadline = self.deadline if deadline is None else deadline
+        yield from self._run_parallel(self.probe, list(dict.fromkeys(urls)), deadline)
+
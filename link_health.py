@@ -0,0 +1,145 @@
+import time
+import sqlite3
+import threading
+
+from link_checker import LinkChecker
+
+# ---------------------------------------------------------
+# PYSYVÄ LINKKIEN TERVEYSVÄLIMUISTI
+# ---------------------------------------------------------
+
+HEALTH_DB = "link_health.db"
+STALE_AFTER = 3600          # onnistunut tarkistus on tuore tunnin
+RETRY_BASE = 300            # epäonnistuneen linkin ensimmäinen uusinta 5 min päästä
+MAX_BACKOFF = 24 * 3600     # ... ja väli kaksinkertaistuu enintään vuorokauteen
+REFRESH_INTERVAL = 30
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS link_health (
+    url TEXT PRIMARY KEY,
+    ok INTEGER,
+    status INTEGER,
+    latency_ms REAL,
+    final_url TEXT,
+    checked_at REAL,
+    failures INTEGER NOT NULL DEFAULT 0,
+    next_check_at REAL NOT NULL DEFAULT 0
+)
+"""
+
+
+def next_check_delay(ok, failures):
+    """Seuraavan tarkistuksen viive: tuoreusaika tai eksponentiaalinen back-off."""
+    if ok: return STALE_AFTER
+    return min(RETRY_BASE * 2 ** max(failures - 1, 0), MAX_BACKOFF)
+
+
+class LinkHealthStore:
+    """SQLite-taulu, johon tallennetaan jokaisen linkin viimeisin tarkistus."""
+
+    def __init__(self, path=HEALTH_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(SCHEMA)
+
+    def register(self, urls):
+        """Lisää uudet linkit seurantaan (olemassa olevat säilyvät ennallaan)."""
+        with self._lock:
+            self._conn.executemany("INSERT OR IGNORE INTO link_health (url) VALUES (?)", [(u,) for u in dict.fromkeys(urls)])
+
+    def get(self, url):
+        """Palauttaa tallennetun rivin dictinä tai None."""
+        with self._lock:
+            cur = self._conn.execute("SELECT * FROM link_health WHERE url = ?", (url,))
+            row = cur.fetchone()
+        if row is None: return None
+        return dict(zip([c[0] for c in cur.description], row))
+
+    def is_ok(self, url, default=True):
+        """Stale-while-revalidate: palauttaa viimeisimmän tiedon heti, myös vanhentuneen.
+
+        Pelkkä luku: linkit rekisteröidään käynnistyksessä (resources.get_link_refresher).
+        Tarkistamaton tai tuntematon linkki näytetään oletuksena (default).
+        """
+        row = self.get(url)
+        if row is None or row["checked_at"] is None: return default
+        return bool(row["ok"])
+
+    def expire_all(self):
+        """Merkitsee kaikki linkit erääntyneiksi (ajastettu täyspäivitys)."""
+        with self._lock:
+            self._conn.execute("UPDATE link_health SET next_check_at = 0")
+
+    def due(self, now=None, limit=50):
+        """Linkit, joiden tarkistus on erääntynyt."""
+        now = time.time() if now is None else now
+        with self._lock:
+            rows = self._conn.execute("SELECT url FROM link_health WHERE next_check_at <= ? ORDER BY next_check_at LIMIT ?", (now, limit)).fetchall()
+        return [r[0] for r in rows]
+
+    def record(self, url, result, now=None):
+        """Tallentaa probe()-tuloksen ja laskee seuraavan tarkistusajan."""
+        now = time.time() if now is None else now
+        with self._lock:
+            row = self._conn.execute("SELECT failures FROM link_health WHERE url = ?", (url,)).fetchone()
+            failures = 0 if result["ok"] else (row[0] if row else 0) + 1
+            self._conn.execute(
+                "INSERT OR REPLACE INTO link_health (url, ok, status, latency_ms, final_url, checked_at, failures, next_check_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, int(result["ok"]), result["status"], result["latency_ms"], result["final_url"], now, failures, now + next_check_delay(result["ok"], failures)),
+            )
+
+
+class LinkHealthRefresher:
+    """Taustasäie, joka tarkistaa erääntyneet linkit; sivun piirto ei koskaan odota verkkoa.
+
+    Prosessissa on yksi päivittäjä (resources.get_link_refresher). Myös ajastettu täyspäivitys
+    kutsuu sen refresh_all-metodia, ja kierrokset ajetaan vuorotellen, joten samaa linkkiä ei tarkisteta kahdesti.
+    """
+
+    def __init__(self, store, checker=None, interval=REFRESH_INTERVAL):
+        self.store = store
+        self.checker = checker or LinkChecker()
+        self.interval = interval
+        self._round = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def refresh_due(self):
+        """Yksi kierros: tarkistaa erääntyneet linkit rinnakkain. Palauttaa tarkistettujen määrän."""
+        with self._round:
+            urls = self.store.due()
+            checked = 0
+            for url, result in self.checker.iter_probes(urls):
+                # Aikarajan ylittänyt tarkistus lasketaan epäonnistumiseksi (back-off kasvaa)
+                if result is None: result = {"ok": False, "status": None, "latency_ms": self.checker.deadline * 1000, "final_url": url}
+                self.store.record(url, result)
+                checked += 1
+            return checked
+
+    def refresh_all(self):
+        """Tarkistaa kaikki erääntyneet linkit kierros kerrallaan, kunnes jono on tyhjä."""
+        total = 0
+        while True:
+            checked = self.refresh_due()
+            total += checked
+            if not checked: return total
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh_due()
+            except Exception as e:
+                print(f"Linkkien päivitys epäonnistui: {e}")
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="link-health-refresher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
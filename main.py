@@ -1,16 +1,25 @@
-import sys
 import os
 import urllib.parse
 import datetime
-import pandas as pd
+import time
+import tempfile
+from collections import deque
+from contextlib import nullcontext
 import streamlit as st
-import streamlit.components.v1 as components
-import requests
-import random
-import json
-import subprocess
-import re
-from collections import Counter
+from storage import ConflictError, DEFAULT_USER
+from records import ApplicationRecord, Tracker, format_date
+from recommendations import RecommendationIndex, candidate_key
+from scoring import SEARCH_KEYWORDS, calculate_score, local_text_analysis
+from cover_letter import generate_template_application, USER_NAME, FUTURE_MAKER_LINK
+from scheduler import last_success, read_snapshot
+from datasets import AI_STUDIES, AGENCIES, STARTUPS_PK, SITES_INTL, SITES_FI_NORDIC, SITES_MEDIA, recommendation_candidates
+from resources import get_tracker_store, get_visitor_log, get_link_health, get_refresh_scheduler, get_posting_store, get_analysis_pool, get_asset_store
+from assets import favicon_url
+from html_cards import stylesheet, grid, rec_card
+import instrumentation
+from instrumentation import span, timed, cache_event
+# pandas, pipeline_analytics, postings ja analysis_pool tuodaan funktioissa ensimmäisellä käytöllä:
+# oletusvälilehti piirtyy ilman niitä (ks. resources.py)
 
 # ---------------------------------------------------------
 # 0. KONFIGURAATIO (Tämän on oltava ensimmäinen st-komento)
@@ -20,460 +29,757 @@ st.set_page_config(layout="wide", page_title="Mission Jobs Hub", page_icon="🚀
 # ---------------------------------------------------------
 # AUTOMAATTINEN PÄIVITYSLOGIIKKA
 # ---------------------------------------------------------
-LOG_FILE = "/tmp/tyonhaku_update_success"
-
-def run_update():
-    try:
-        subprocess.run(["streamlit", "run", os.path.abspath(__file__), "--server.port", "0"], check=True)
-        with open(LOG_FILE, "w") as f:
-            f.write("OK")
-    except Exception as e:
-        print(f"Päivitys epäonnistui: {e}")
-
-now = datetime.datetime.now()
-weekday = now.weekday()
-hour = now.hour
-
-# Ajetaan päivitys arkisin klo 8 tai klo 11, jos ei ole vielä ajettu
-if 0 <= weekday <= 4 and hour == 8:
-    run_update()
-elif 0 <= weekday <= 4 and hour == 11:
-    if not os.path.exists(LOG_FILE):
-        run_update()
-
-if os.path.exists(LOG_FILE):
-    last_update = datetime.datetime.fromtimestamp(os.path.getmtime(LOG_FILE))
-    if datetime.datetime.now() - last_update > datetime.timedelta(hours=24):
-        st.warning("⚠️ Päivitystä ei ole tehty viimeisen 24 tunnin aikana")
-
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+# Päivitys ajetaan taustasäikeessä arkisin klo 8 ja 11 (ks. resources.get_refresh_scheduler / scheduler.py),
+# ei koskaan sivun piirron aikana.
+last_update = last_success()
+if last_update and datetime.datetime.now() - last_update > datetime.timedelta(hours=24):
+    st.warning("⚠️ Päivitystä ei ole tehty viimeisen 24 tunnin aikana")
 
 # ---------------------------------------------------------
 # 1. ASETUKSET & DATA
 # ---------------------------------------------------------
 
-USER_NAME = "Mission Jobs Commander"
-STORAGE_FILE = "local_storage.json"
-SHEET_ID = "12_hQ54nccgljOCbDGPOvFzYBQ6KhQkdk1GDdpaNTGyM"
+TRACKER_POLL_SECONDS = 10
 
-def load_local_data():
-    if os.path.exists(STORAGE_FILE):
-        try:
-            with open(STORAGE_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except:
-            return []
-    return []
+def current_user():
+    """Käyttäjän nimiavaruus: kirjautunut käyttäjä, ?user=-parametri tai oletus."""
+    if getattr(st.user, "is_logged_in", False): return st.user.get("email") or DEFAULT_USER
+    return st.query_params.get("user") or DEFAULT_USER
 
+@timed("storage")
+def load_local_data():
+    """Lataa käyttäjän seurantalistan indeksoituna Tracker-oliona."""
+    store = get_tracker_store()
+    # Järjestysnumero luetaan ennen listaa: väliin osuneet muutokset haetaan uudelleen, eivät katoa
+    st.session_state.tracker_seq = store.last_change()
+    return Tracker.from_dicts(store.load_all(current_user()))
+
+@timed("storage")
+def sync_tracker():
+    """Päivittää istunnon listaan muiden istuntojen ja prosessien muutokset (vain muuttuneet rivit)."""
+    store = get_tracker_store()
+    tracker = st.session_state.tracked_companies
+    seq, changed = store.changes_since(st.session_state.tracker_seq, current_user())
+    if changed is None:
+        st.session_state.tracked_companies = load_local_data()
+        return
+    st.session_state.tracker_seq = seq
+    for item_id, data in changed.items():
+        local = tracker.get(item_id)
+        if data is None:
+            tracker.remove(item_id)
+        elif local is None or local.version < data["version"]:
+            tracker.replace(ApplicationRecord.from_dict(data))
+
+@st.fragment(run_every=TRACKER_POLL_SECONDS)
+def watch_tracker():
+    """Muutosilmoitus: ajaa sivun uudelleen, kun joku muu on muuttanut tämän käyttäjän listaa."""
+    if get_tracker_store().last_change(current_user()) > st.session_state.tracker_seq: st.rerun(scope="app")
+
+@timed("storage")
 def save_local_data(data):
+    """Kirjoittaa koko listan kerralla. Yksittäisille muutoksille käytä save_item/delete_item."""
+    get_tracker_store().replace_all([item.to_dict() for item in data], current_user())
+    sync_tracker()
+
+def _reload_item(item):
+    latest = get_tracker_store().get(item.id, current_user())
+    if latest: st.session_state.tracked_companies.replace(ApplicationRecord.from_dict(latest))
+    else: st.session_state.tracked_companies.remove(item.id)
+    st.warning(f"⚠️ {item['company']}: hakemusta muutettiin toisaalla samaan aikaan – näytetään tallennettu versio.")
+
+@timed("storage")
+def save_item(item):
+    """Tallentaa yhden hakemuksen. Palauttaa False, jos joku muu ehti muuttaa sitä (paikallinen kopio päivitetään)."""
     try:
-        with open(STORAGE_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
-    except Exception as e:
-        print(f"Virhe tallennuksessa: {e}")
-
-@st.cache_data(ttl=60)
-def load_visitor_data():
-    url = f"https://docs.google.com/spreadsheets/d/{SHEET_ID}/export?format=csv"
-    try:
-        df = pd.read_csv(url)
-        return df
-    except Exception as e:
-        return None
+        item.version = get_tracker_store().upsert(item.to_dict(), current_user())
+    except ConflictError:
+        _reload_item(item)
+        return False
+    # Oma muutos kuitataan nähdyksi (tracker_seq eteenpäin), ettei watch_tracker aja sivua turhaan uudelleen;
+    # synkronointi hakee samalla väliin osuneet muiden muutokset, joten niitä ei ohiteta
+    sync_tracker()
+    return True
 
-@st.cache_data(ttl=3600, show_spinner=False)
-def validate_link(url):
+@timed("storage")
+def delete_item(item):
     try:
-        headers = {'User-Agent': 'Mozilla/5.0'}
-        response = requests.head(url, headers=headers, timeout=2, allow_redirects=True)
-        if response.status_code == 200: return True
-        response = requests.get(url, headers=headers, timeout=2)
-        return response.status_code == 200
-    except:
+        get_tracker_store().delete(item.id, current_user(), version=item.version)
+    except ConflictError:
+        _reload_item(item)
         return False
+    sync_tracker()
+    return True
 
-# --- AIKAEROT ---
-def calculate_days_diff(date_str, is_future=False):
-    """Laskee päivien erotuksen nykyhetkeen."""
-    if not date_str: return 0
-    now = datetime.datetime.now()
+@timed("network")
+def load_visitor_data():
+    """Synkronoi lokin (korkeintaan kerran minuutissa) ja palauttaa tunnusluvut, tai None."""
+    log = get_visitor_log()
     try:
-        # Jos kyseessä on haastattelu (YYYY-MM-DD)
-        if "-" in str(date_str):
-            dt = datetime.datetime.strptime(str(date_str), "%Y-%m-%d")
-            diff = (dt - now).days + 1 # +1 jotta huominen on 1
-            return diff
-        
-        # Jos kyseessä on hakemus (dd.mm.)
-        full_date = f"{date_str}{now.year}"
-        dt = datetime.datetime.strptime(full_date, "%d.%m.%Y")
-        return (now - dt).days
-    except:
-        return 0
-
-# --- LOCAL INTELLIGENCE ENGINE ---
-
-def local_text_analysis(text):
-    """Analysoi tekstin sisäisellä logiikalla."""
-    text = text.lower()
-    keywords = {
-        "Luova": ["photoshop", "illustrator", "indesign", "figma", "video", "editointi", "visuaalinen", "brändi", "sommittelu", "creative", "art director"],
-        "Tekninen/AI": ["ai ", "tekoäly", "chatgpt", "midjourney", "python", "html", "css", "wordpress", "promp", "genai"],
-        "Soft Skills": ["tiimityö", "oma-aloitteisuus", "paineensieto", "kommunikointi", "projektinhallinta", "analyyttinen", "koordinoi"]
-    }
-    
-    found_stats = {}
-    missing_words = []
-    total_score = 0
-    
-    for category, words in keywords.items():
-        count = 0
-        for word in words:
-            if word in text:
-                count += 1
-                total_score += 1
-            else:
-                if random.random() > 0.85: missing_words.append(word)
-        found_stats[category] = count
-
-    final_score = min(total_score, 10)
-    return found_stats, final_score, missing_words
-
-def generate_template_application(company, role, job_text, user_background):
-    """Luo älykkään hakemuspohjan ilman APIa."""
-    date_str = datetime.datetime.now().strftime("%d.%m.%Y")
-    highlights = []
-    if "ai" in job_text.lower(): highlights.append("tekoälyosaamiseni")
-    if "visuaalinen" in job_text.lower(): highlights.append("visuaalisen silmäni")
-    if "projekti" in job_text.lower(): highlights.append("kokemukseni projektinhallinnasta")
-    
-    highlight_text = " sekä ".join(highlights) if highlights else "monipuolisen osaamiseni"
-
-    template = f"""
-    {USER_NAME}
-    Helsinki | {date_str}
-
-    Vastaanottaja: Rekrytointitiimi / {company}
-
-    HAKEMUS: {role.upper()}
-
-    Hei,
-
-    Luin innostuneena ilmoituksenne, jossa haette {role}-osaajaa. Seuraan aktiivisesti {company}:n toimintaa ja uskon, että taustani toisi tiimiinne juuri oikeanlaista lisäarvoa.
-
-    MIKSI MINÄ?
-    Olen luovan alan ammattilainen, joka yhdistää visuaalisen suunnittelun ja modernit teknologiat. Ilmoituksessanne korostui tarve ratkaisukeskeiselle tekijälle.
-    
-    Omaan vahvan taustan, johon kuuluu:
-    - {user_background[:150]}... (Täydennä CV:stäsi)
-    - Kyky hyödyntää tekoälyä luovassa prosessissa
-    - Halu oppia uutta ja kehittää prosesseja
-
-    MITÄ TUON TALOON?
-    Uskon, että voisin hyödyntää {highlight_text} heti ensimmäisestä päivästä alkaen. Olen tottunut työskentelemään itsenäisesti, mutta nautin tiimityöstä, jossa sparraillaan ideoita.
-
-    Odotan innolla mahdollisuutta kertoa lisää osaamisestani haastattelussa.
+        log.sync()
+    except Exception as e:
+        print(f"Vierailijalokin haku epäonnistui: {e}")
+    return log.summary()
 
-    Ystävällisin terveisin,
+def validate_link(url):
+    """Lukee linkin tilan välimuistista – sivun piirto ei tee verkkokutsuja."""
+    return get_link_health().is_ok(url)
+
+# --- SEURANNAN SUODATUS & SIVUTUS ---
+TRACKER_PAGE_SIZE = 10
+TRACKER_SORTS = ["Uusin ensin", "Vanhin ensin", "Yritys A–Ö", "Tila"]
+
+def get_pipeline_analytics():
+    """Seurantalistan analytiikkakehys; rakennetaan uudelleen vain, kun lista muuttuu tai päivä vaihtuu."""
+    from pipeline_analytics import PipelineAnalytics
+    tracker = st.session_state.tracked_companies
+    analytics = st.session_state.get("pipeline_analytics")
+    hit = analytics is not None and analytics.is_current(tracker)
+    cache_event("pipeline_analytics", hit)
+    if not hit:
+        with span("PipelineAnalytics", "cache"):
+            analytics = st.session_state.pipeline_analytics = PipelineAnalytics(tracker)
+    return analytics
+
+def filter_tracked(frame, statuses=None, company="", date_range=None):
+    """Suodattaa seurantalistan (analytiikkakehys) ennen kuin yhtään widgettiä luodaan."""
+    import pandas as pd
+    mask = pd.Series(True, index=frame.index)
+    if statuses: mask &= frame["status"].isin(statuses)
+    company = company.strip().lower()
+    if company: mask &= frame["company_key"].str.contains(company, regex=False)
+    if date_range:
+        mask &= frame["applied"].between(pd.Timestamp(date_range[0]), pd.Timestamp(date_range[-1]))
+    return frame[mask]
+
+def sort_tracked(frame, sort_by):
+    if sort_by == "Yritys A–Ö": return frame.sort_values("company_key", kind="stable")
+    if sort_by == "Tila": return frame.sort_values("status", key=lambda s: s.astype(str), kind="stable")
+    if sort_by == "Vanhin ensin": return frame.sort_values("applied", kind="stable", na_position="last")
+    return frame.sort_values("applied", ascending=False, kind="stable", na_position="last")
+
+def get_recommendation_index():
+    """Istunnon suositusindeksi. Rakennetaan kerran; seurantalistan muutokset tuodaan siihen erotuksena."""
+    tracker = st.session_state.tracked_companies
+    index = st.session_state.get("recommendation_index")
+    cache_event("recommendation_index", index is not None)
+    if index is None:
+        candidates = read_snapshot("recommendations") or recommendation_candidates()
+        index = st.session_state.recommendation_index = RecommendationIndex(candidates, dismissed=get_tracker_store().dismissed(current_user()))
+    if st.session_state.get("recommendation_tracker") != (id(tracker), tracker.version):
+        index.sync_tracked(record.company for record in tracker)
+        st.session_state.recommendation_tracker = (id(tracker), tracker.version)
+    return index
 
-    {USER_NAME}
-    Portfolio: {FUTURE_MAKER_LINK}
-    """
-    return template
+# ---------------------------------------------------------
+# UI & LOGIIKKA
+# ---------------------------------------------------------
 
-def calculate_score(title, location, description=""):
-    score = 1.0
-    title = title.lower(); location = location.lower(); desc = description.lower()
+# --- TAB 1: HAKEMUS ---
+def render_hakemus():
+    st.header("📝 Hakemusgeneraattori")
+    c1, c2 = st.columns(2)
+    with c1: 
+        company_name = st.text_input("Yrityksen nimi (Generointia varten):", key="app_company", persist_state="session")
+        role_name = st.text_input("Haettava rooli:", key="app_role", persist_state="session")
+        job_desc = st.text_area("Liitä työpaikkailmoitus tähän:", height=250, key="app_job_text", persist_state="session")
+    with c2: 
+        user_cv = st.text_area("Oma tausta / CV tiivistelmä:", height=380, key="app_cv", persist_state="session")
     
-    role_match = 0
-    for role in TARGET_ROLES:
-        if role.lower() in title: role_match += 1
-    score += min(role_match * 0.5, 2.0)
+    if st.button("🚀 LUO HAKEMUS", type="primary"):
+        if job_desc and user_cv:
+            with st.spinner("Luodaan hakemuspohjaa..."):
+                draft = generate_template_application(company_name if company_name else "[YRITYS]", role_name if role_name else "[ROOLI]", job_desc, user_cv)
+                st.subheader("📄 Hakemuspohja:")
+                st.info("💡 Tässä on älykäs pohja, jonka voit viimeistellä.")
+                st.text_area("", value=draft, height=600)
+        else:
+            st.warning("Täytä ainakin ilmoitus ja oma tausta.")
+
+    st.markdown("---")
+    render_cv_matching(user_cv)
+    st.markdown("---")
+    render_bulk_letters(user_cv)
+
+CV_MATCH_LIMIT = 500
+
+def _uploaded_postings(uploads):
+    """Ladatut ilmoitusviennit yhtenäisinä riveinä (muoto tunnistetaan tiedostopäätteestä)."""
+    from postings import iter_postings, normalize_posting
+    rows = []
+    for upload in uploads:
+        with tempfile.NamedTemporaryFile("wb", suffix=os.path.splitext(upload.name)[1], delete=False) as tmp:
+            tmp.write(upload.getbuffer())
+        try:
+            rows.extend(normalize_posting(row, upload.name) for row in iter_postings(tmp.name))
+        finally:
+            os.unlink(tmp.name)
+    return rows[:CV_MATCH_LIMIT]
+
+def render_cv_matching(user_cv):
+    """CV:n vertailu satoihin ilmoituksiin prosessipoolissa; tulokset päivittyvät fragmentissa sitä mukaa kuin ne valmistuvat."""
+    st.subheader("📚 CV vs. ilmoitukset (massavertailu)")
+    source = st.radio("Ilmoitukset:", ["Tallennetut ilmoitukset", "Tiedostot"], horizontal=True, key="cv_match_source")
+    if source == "Tallennetut ilmoitukset":
+        query = st.text_input("Hakusanat tallennetuista ilmoituksista:", key="cv_match_query")
+        uploads = None
+    else:
+        uploads = st.file_uploader("Ilmoitusviennit", type=["csv", "jsonl", "json", "html", "htm"], accept_multiple_files=True, key="cv_match_files")
+        query = ""
+    with_templates = st.checkbox("Luo myös hakemuspohjat", key="cv_match_templates")
+    job = st.session_state.get("cv_match_job")
+    running = job is not None and not job.done
+
+    if st.button("▶️ Vertaa CV:tä", disabled=running or not user_cv):
+        postings = get_posting_store().search(query, limit=CV_MATCH_LIMIT) if query else _uploaded_postings(uploads or [])
+        if postings:
+            st.session_state["cv_match_job"] = get_analysis_pool().submit_batch("cv_match", [(user_cv, p, with_templates) for p in postings])
+            st.rerun()
+        st.warning("Ei ilmoituksia vertailtavaksi.")
+    if not user_cv: st.caption("Täytä ensin oma tausta / CV yllä.")
+    if job is not None: st.fragment(show_cv_matches, run_every=1 if running else None)()
+
+def show_cv_matches():
+    job = st.session_state["cv_match_job"]
+    job.collect()
+    if not job.done:
+        c1, c2 = st.columns([4, 1])
+        c1.progress(job.progress, text=f"{len(job.results)}/{job.total} ilmoitusta ({job.seconds:.0f} s)")
+        if c2.button("⏹️ Peruuta"): job.cancel()
+    if job.done:
+        state = "peruttu" if job.cancelled else "valmis"
+        st.caption(f"Vertailu {state}: {len(job.results)}/{job.total} ilmoitusta {job.seconds:.1f} s")
+        for error in job.errors[:3]: st.error(error)
+        # Ajastettu fragmentti sammutetaan ajamalla koko sivu uudelleen
+        if st.session_state.get("cv_match_shown") is not job:
+            st.session_state["cv_match_shown"] = job
+            st.rerun(scope="app")
+    results = sorted(job.ordered(), key=lambda r: (-r["match"], -r["score"]))
+    if not results: return
+    import pandas as pd
+    df = pd.DataFrame(results)
+    df["matched"] = df["matched"].str.join(", ")
+    df["missing"] = df["missing"].str.join(", ")
+    st.dataframe(
+        df[["match", "score", "title", "company", "location", "matched", "missing", "url"]],
+        column_config={
+            "match": st.column_config.ProgressColumn("Osuvuus", format="percent", min_value=0, max_value=1),
+            "score": st.column_config.NumberColumn("Pisteet", format="%.1f"),
+            "title": "Ilmoitus", "company": "Yritys", "location": "Sijainti",
+            "matched": "CV:ssä mainittu", "missing": "Puuttuu CV:stä",
+            "url": st.column_config.LinkColumn("Linkki"),
+        },
+        hide_index=True, width="stretch",
+    )
+    if "template" in df:
+        choice = st.selectbox("Hakemuspohja:", range(len(results)), format_func=lambda i: f"{results[i]['title']} – {results[i]['company']}")
+        st.text_area("Hakemuspohja", value=results[choice]["template"], height=400, label_visibility="collapsed")
+
+BULK_LETTER_LIMIT = 20_000
+BULK_FORMATS = {"ZIP (.txt per hakemus)": "zip", "JSON-lines": "jsonl"}
+
+def _bulk_letter_source(uploads, query):
+    """(rivit-iteraattori, määrä, siivottavat väliaikaistiedostot). Tiedostot luetaan rivi kerrallaan."""
+    import batch_letters
+    if query:
+        rows, total = batch_letters.store_rows(get_posting_store(), query, limit=BULK_LETTER_LIMIT)
+        return rows, total, []
+    paths = []
+    for upload in uploads:
+        with tempfile.NamedTemporaryFile("wb", suffix=os.path.splitext(upload.name)[1], delete=False) as tmp:
+            tmp.write(upload.getbuffer())
+        paths.append(tmp.name)
+    rows = (row for path in paths for row in batch_letters.read_rows(path))
+    return rows, sum(batch_letters.count_rows(path) for path in paths), paths
+
+def render_bulk_letters(user_cv):
+    """Hakemuspohjat massana: kirjeet kirjoitetaan suoraan levyllä olevaan arkistoon, lataus luetaan vasta napautuksesta."""
+    import batch_letters
+    st.subheader("🗂️ Hakemuspohjat massana")
+    uploads = st.file_uploader("Ilmoitukset (yritys, rooli, ilmoitusteksti)", type=["csv", "jsonl", "json", "html", "htm"], accept_multiple_files=True, key="bulk_files")
+    query = st.text_input("...tai hakusanat tallennetuista ilmoituksista:", key="bulk_query")
+    fmt = BULK_FORMATS[st.radio("Muoto:", list(BULK_FORMATS), horizontal=True, key="bulk_format")]
+
+    if st.button("🗂️ Luo hakemuspohjat", disabled=not user_cv or not (uploads or query)):
+        previous = st.session_state.pop("bulk_letters", None)
+        if previous and os.path.exists(previous["path"]): os.remove(previous["path"])
+        rows, total, temp_paths = _bulk_letter_source(uploads or [], query)
+        bar = st.progress(0.0, text=f"0/{total} hakemusta")
+        def progress(done, total):
+            bar.progress(min(done / total, 1.0) if total else 1.0, text=f"{done}/{total} hakemusta")
+        path = batch_letters.new_archive(fmt)
+        started = time.perf_counter()
+        try:
+            count = batch_letters.write_letters(batch_letters.iter_letters(rows, user_cv), path, fmt, progress=progress, total=total)
+        finally:
+            for temp_path in temp_paths: os.unlink(temp_path)
+        st.session_state["bulk_letters"] = {"path": path, "format": fmt, "count": count, "seconds": time.perf_counter() - started}
+    if not user_cv: st.caption("Täytä ensin oma tausta / CV yllä.")
+
+    result = st.session_state.get("bulk_letters")
+    if result and os.path.exists(result["path"]):
+        st.caption(f"{result['count']} hakemuspohjaa {result['seconds']:.1f} s · {os.path.getsize(result['path']) / 1024:.0f} kt")
+        def read_archive(path=result["path"]):
+            # Toinen istunto voi karsia arkiston ennen latausta (batch_letters.new_archive)
+            try:
+                with open(path, "rb") as f: return f.read()
+            except FileNotFoundError: return b""
+        st.download_button("⬇️ Lataa hakemuspohjat", read_archive, file_name=f"hakemukset.{result['format']}",
+                           mime="application/zip" if result["format"] == "zip" else "application/x-ndjson")
+
+# --- TAB 2: ANALYSOI ---
+def render_analysoi():
+    st.header("📊 Analysoi Ilmoitus")
+    col1, col2 = st.columns(2)
+    with col1: input_title = st.text_input("Työnimike", key="an_title", persist_state="session")
+    with col2: input_loc = st.text_input("Sijainti", key="an_location", persist_state="session")
+    input_desc_analysis = st.text_area("Liitä ilmoitusteksti tähän analyysiä varten:", height=200, key="an_text", persist_state="session")
     
-    if any(x in title for x in ['strateg', 'lead', 'head', 'päällikkö']): score += 1.0
+    if st.button("🔍 ANALYSOI TEKSTI"):
+        # Pitkä teksti analysoidaan prosessipoolissa, jottei se varaa palvelinta muilta istunnoilta
+        from analysis_pool import POOL_MIN_CHARS
+        pool = get_analysis_pool() if len(input_desc_analysis) > POOL_MIN_CHARS else None
+        # Pisteytys (Aina toiminnassa)
+        score = pool.run("score", input_title, input_loc, input_desc_analysis) if pool else calculate_score(input_title, input_loc, input_desc_analysis)
+        st.subheader(f"Match Score: {score}/5.0")
+        st.progress(min(score/5, 1.0))
+
+        if input_desc_analysis:
+            stats, keyword_score, missing = pool.run("analysis", input_desc_analysis) if pool else local_text_analysis(input_desc_analysis)
+            c1, c2 = st.columns(2)
+            with c1:
+                st.write("✅ **Löydetyt avainsanat:**")
+                st.json(stats)
+            with c2:
+                if missing:
+                    st.write("⚠️ **Harkitse näiden mainitsemista:**")
+                    for m in missing[:5]: st.markdown(f"- {m.capitalize()}")
+            st.info("💡 Tämä on automaattinen avainsana-analyysi.")
+
+# --- TAB 3: LINKIT ---
+def render_linkit():
+    st.header("🏢 Linkkikirjasto")
+    with st.expander("Mainostoimistot", expanded=True):
+        assets = get_asset_store()
+        # Upotettu kopio paikallisesta välimuistista; ulkoinen osoite vain ennen ensimmäistä hakua
+        agencies = [{"name": name, "url": url, "logo": assets.data_uri(favicon_url(url)) or favicon_url(url)} for name, url in AGENCIES.items()]
+        st.markdown(grid("link", agencies, tight=True), unsafe_allow_html=True)
     
-    all_keywords = ['ai ', 'genai', 'technolog', 'chatgpt', 'midjourney'] + UNI_KEYWORDS + AMK_KEYWORDS
-    if any(kw.lower() in title for kw in all_keywords) or any(kw.lower() in desc for kw in all_keywords):
-        score += 1.0
-
-    if 'helsinki' in location or 'espoo' in location: score += 1.0
-    elif 'remote' in location: score += 0.8
+    c1, c2, c3 = st.columns(3)
+    with c1: 
+        st.subheader("🌍 Intl")
+        st.markdown("\n\n".join(f"[{n}]({u})" for n, u in SITES_INTL.items()))
+    with c2: 
+        st.subheader("🇫🇮 Suomi")
+        st.markdown("\n\n".join(f"[{n}]({u})" for n, u in SITES_FI_NORDIC.items()))
+    with c3: 
+        st.subheader("🎬 Media")
+        st.markdown("\n\n".join(f"[{n}]({u})" for n, u in SITES_MEDIA.items()))
+
+# --- TAB 4: TEHOHAKU ---
+def render_tehohaku():
+    st.header("⚡️ Tehohaku")
+    def generate_linkedin_url_full():
+        q = " OR ".join([f'"{r}"' for r in SEARCH_KEYWORDS])
+        params = {"keywords": f"({q})", "location": "Helsinki Metropolitan Area", "f_TPR": "r2592000", "sort": "dd"}
+        return "https://www.linkedin.com/jobs/search/?" + urllib.parse.urlencode(params)
     
-    return min(score, 5.0)
-
-def safe_deadline_block(date_input, is_future_event=False):
-    try:
-        if not date_input: return ""
-        now = datetime.datetime.now()
-        if is_future_event and "-" in str(date_input):
-            dt = datetime.datetime.strptime(str(date_input), "%Y-%m-%d")
-            diff = (dt - now).days + 1
-            if diff < 0: return "🔴 Meni jo"
-            if diff == 0: return "🔥 TÄNÄÄN"
-            if diff <= 2: return f"🔥 {diff} pv"
-            return f"📅 {diff} pv"
-        full_date = f"{date_input}{now.year}"
-        dt = datetime.datetime.strptime(full_date, "%d.%m.%Y")
-        diff = (now - dt).days
-        if diff > 21: return f"⚠️ {diff} pv (Hiljaista)"
-        if diff > 14: return f"🕒 {diff} pv"
-        return f"🆕 {diff} pv"
-    except: return ""
-
-# --- DATASETS ---
-
-AI_STUDIES = [
-    {
-        "name": "Generative AI Learning Path",
-        "provider": "Google Cloud",
-        "url": "https://www.cloudskillsboost.google/paths/118",
-        "desc": "Googlen virallinen ja ilmainen polku generatiivisen tekoälyn syvälliseen ymmärtämiseen.",
-        "type": "SERTIFIKAATTI"
-    },
-    {
-        "name": "Opin.fi: Tekoäly & Luova osaaminen",
-        "provider": "Suomen Korkeakoulut (Digivisio)",
-        "url": "https://opin.fi/fi/search?q=teko%C3%A4ly",
-        "desc": "Kokoava haku. Kriteerit: Laskennallinen luovuus, XR, Visual Culture, Palvelumuotoilu & AI.",
-        "type": "HAKUPALVELU"
-    },
-    {
-        "name": "Elements of AI",
-        "provider": "Helsingin Yliopisto & Reaktor",
-        "url": "https://www.elementsofai.com/fi",
-        "desc": "Suomalainen klassikko. Pakollinen pohjatieto kaikille alalla toimiville.",
-        "type": "MOOC / ETÄ"
-    },
-    {
-        "name": "HY Avoin: Tekoäly & Data",
-        "provider": "Helsingin Yliopisto",
-        "url": "https://www.helsinki.fi/fi/hakeminen-ja-opetus/etsi-koulutuksia-ja-kursseja?s_format=mooc%2Cdistance_or_online_teaching&s_itg=open_university&s_q=ai",
-        "desc": "Helsingin yliopiston avoimet tekoälykurssit. MOOC-toteutuksia ja etäopintoja joustavasti.",
-        "type": "YLIOPISTO / MOOC"
-    },
-    {
-        "name": "FiTech - Tekoäly (Koko Suomi)",
-        "provider": "Yliopistoverkosto (Aalto ym.)",
-        "url": "https://fitech.io/fi/opinnot/?s=teko%C3%A4ly",
-        "desc": "Suomen laajin ilmainen tekniikan tarjonta. Etäopintoja Aallosta, LUTista ja Oulusta.",
-        "type": "YLIOPISTO / ETÄ"
-    },
-    {
-        "name": "Aalto Avoin: Art & Media",
-        "provider": "Aalto Arts",
-        "url": "https://www.aalto.fi/fi/taiteiden-ja-suunnittelun-korkeakoulu",
-        "desc": "Seuraa Aalto Artsin avoimia kursseja. Usein AI- ja mediayhteyksiä.",
-        "type": "YLIOPISTO (HKI)"
-    },
-    {
-        "name": "3AMK (AI & Future)",
-        "provider": "Metropolia, Haaga-Helia, Laurea",
-        "url": "https://www.3amk.fi/",
-        "desc": "Pääkaupunkiseudun korkeakoulujen yhteiset tulevaisuuskurssit.",
-        "type": "AMK (HKI)"
-    },
-    {
-        "name": "DeepLearning.AI: AI for Everyone",
-        "provider": "DeepLearning.AI",
-        "url": "https://www.deeplearning.ai/courses/ai-for-everyone/",
-        "desc": "Andrew Ng:n kurssi bisnespuolelle ja tuottajille. Ei vaadi koodausta.",
-        "type": "KV / ETÄ"
+    st.markdown(f"""<div class="cta-container"><a href="{generate_linkedin_url_full()}" target="_blank" class="cta-button">👉 LINKEDIN (HELSINKI + CREATIVE)</a></div>""", unsafe_allow_html=True)
+
+# --- TAB 5: SEURANTA ---
+def render_seuranta():
+    st.header("📌 Hakemusten Seuranta")
+
+    STATUS_COLORS = {
+        "Odottaa": {"bg": "#FFF3CD", "text": "#856404"},
+        "Keskustelu": {"bg": "#D1ECF1", "text": "#0C5460"},
+        "Haastattelu": {"bg": "#C3E6CB", "text": "#155724"},
+        "Ei vastausta": {"bg": "#E2E3E5", "text": "#6C757D"},
+        "Hylätty": {"bg": "#F8D7DA", "text": "#721C24"},
+        "Kiinnostunut": {"bg": "#E2E3E5", "text": "#333333"}
     }
-]
-
-UNI_KEYWORDS = [
-    "laskennallinen luovuus",
-    "computational creativity",
-    "human-computer interaction",
-    "digital humanities",
-    "visual culture",
-    "mikrotutkinto",
-    "tekoäly viestinnässä"
-]
 
-AMK_KEYWORDS = [
-    "palvelumuotoilu",
-    "erikoistumiskoulutus",
-    "osaajakoulutus",
-    "mediatuotanto",
-    "visuaalinen suunnittelu",
-    "XR",
-    "virtuaalituotanto"
-]
-
-AGENCIES = {
-    "Avidly": "https://www.avidlyagency.com/fi/ura-avidlylla",
-    "Bob the Robot": "https://www.bobtherobot.fi/",
-    "Futurice": "https://www.futurice.com/careers",
-    "hasan & partners": "https://www.hasanpartners.fi/contact",
-    "Kuulu": "https://www.kuulu.fi/",
-    "Miltton": "https://miltton.com/career",
-    "N2 Creative": "https://n2.fi/",
-    "Reaktor": "https://www.reaktor.com/careers",
-    "SEK": "https://sek.io/en/careers/",
-    "Siili Solutions": "https://www.siili.com/join-us",
-    "TBWA\Helsinki": "https://www.tbwa.fi/",
-    "Valve": "https://www.valve.fi/join-us",
-    "Vincit": "https://www.vincit.com/careers",
-}
-
-SCHOOLS_DATA = [
-    {
-        "name": "Aalto-yliopisto (Taiteet & Suunnittelu)", 
-        "url": "https://www.aalto.fi/fi/taiteiden-ja-suunnittelun-korkeakoulu", 
-        "logo": "https://www.aalto.fi/themes/custom/aalto/logo.svg",
-        "status": "⭐ HUIPPU"
-    },
-    {
-        "name": "HEO Kansanopisto (Graafinen & Kuvallinen)", 
-        "url": "https://www.heo.fi/kulttuuri-ja-taide/", 
-        "logo": "https://www.heo.fi/wp-content/themes/heo/images/logo.png",
-        "status": "Portfolio"
-    },
-    {
-        "name": "Metropolia AMK (Viestintä & Muotoilu)", 
-        "url": "https://www.metropolia.fi/fi/opiskelu/amk-tutkinnot/viestinta", 
-        "logo": "https://www.metropolia.fi/themes/custom/metropolia/logo.svg",
-        "status": "AMK / Haku"
-    },
-    {
-        "name": "Haaga-Helia (Journalismi & Digi)", 
-        "url": "https://www.haaga-helia.fi/fi/koulutus/media-ja-viestinta", 
-        "logo": "https://www.haaga-helia.fi/themes/custom/hh/logo.svg",
-        "status": "AMK / Haku"
-    },
-    {
-        "name": "Humak (Kulttuurituottaja)", 
-        "url": "https://www.humak.fi/koulutus/kulttuurituottaja/", 
-        "logo": "https://www.humak.fi/wp-content/themes/humak/images/logo.svg",
-        "status": "AMK / Tuottaja"
-    },
-    {
-        "name": "Taitotalo (Media-alan PT)", 
-        "url": "https://www.taitotalo.fi/koulutus/media-alan-ja-kuvallisen-ilmaisun-perustutkinto", 
-        "logo": "https://www.taitotalo.fi/themes/custom/taitotalo/logo.svg",
-        "status": "Ammatillinen"
-    },
-    {
-        "name": "Stadin AO (Media & Kuvallinen)", 
-        "url": "https://stadinao.fi/koulutustarjonta/media-alan-ja-kuvallisen-ilmaisun-perustutkinto/", 
-        "logo": "https://stadinao.fi/wp-content/themes/stadinao/assets/images/logo.svg",
-        "status": "Jatkuva haku"
-    },
-    {
-        "name": "Varia (Media-ala)", 
-        "url": "https://www.vantaa.fi/fi/palveluhakemisto/palvelu/media-alan-ja-kuvallisen-ilmaisun-perustutkinto-varia", 
-        "logo": "https://www.vantaa.fi/themes/custom/vantaa/logo.svg",
-        "status": "Vantaa"
-    },
-    {
-        "name": "Omnia (Media)", 
-        "url": "https://www.omnia.fi/koulutushaku/media-alan-ja-kuvallisen-ilmaisun-perustutkinto", 
-        "logo": "https://www.omnia.fi/themes/custom/omnia/logo.svg",
-        "status": "Espoo"
-    },
-    {
-        "name": "Business College Helsinki (Digi)", 
-        "url": "https://bc.fi/koulutukset/tieto-ja-viestintatekniikan-perustutkinto/", 
-        "logo": "https://bc.fi/wp-content/themes/bch/images/logo.svg",
-        "status": "Helsinki"
-    },
-    {
-        "name": "Rastor-instituutti (Markkinointi)", 
-        "url": "https://www.rastorinst.fi/koulutus/markkinointi-ja-viestinta", 
-        "logo": "https://www.rastorinst.fi/themes/custom/rastor/logo.svg",
-        "status": "Aikuis"
-    },
-    {
-        "name": "Careeria (Media)", 
-        "url": "https://careeria.fi/koulutus/media-alan-ja-kuvallisen-ilmaisun-perustutkinto/", 
-        "logo": "https://careeria.fi/wp-content/themes/careeria/assets/images/logo.svg",
-        "status": "Hki/Vantaa"
-    }
-]
+    with st.expander("➕ Lisää manuaalisesti", expanded=False):
+        c1, c2 = st.columns(2)
+        with c1: cn = st.text_input("Yritys")
+        with c2: cr = st.text_input("Rooli")
+        cs = st.selectbox("Tila", ["Odottaa", "Keskustelu", "Haastattelu", "Ei vastausta", "Hylätty"])
+        interview_date = None
+        interview_time = ""
+        if cs == "Haastattelu":
+            interview_date = st.date_input("Haastattelupäivä", key="int_date")
+            interview_time = st.time_input("Haastattelun kellonaika", key="int_time")
+
+        if st.button("Tallenna", type="primary") and cn:
+            duplicate = st.session_state.tracked_companies.find_duplicate(cn, cr)
+            if duplicate:
+                st.warning(f"⚠️ {duplicate.company} ({duplicate.role}) on jo seurannassa.")
+            else:
+                new_item = ApplicationRecord(
+                    cn, cr, cs,
+                    date=datetime.date.today(),
+                    interview_date=interview_date if cs == "Haastattelu" else None,
+                    interview_time=str(interview_time) if cs == "Haastattelu" else ""
+                )
+                st.session_state.tracked_companies.add(new_item)
+                save_item(new_item)
+                st.success("✅ Hakemus tallennettu!")
+                st.rerun()
 
-STARTUPS_PK = {
-    "Aalto Startup Center": "https://startupcenter.aalto.fi/",
-    "Kiuas Accelerator": "https://www.kiuas.com/",
-    "Maria 01 (Careers)": "https://maria.io/careers/",
-    "Supercell Careers": "https://supercell.com/en/careers/",
-    "The Hub (Helsinki Jobs)": "https://thehub.io/jobs?location=Helsinki",
-    "Wolt Careers": "https://careers.wolt.com/en"
-}
-
-TARGET_ROLES = [
-    "Graafinen suunnittelija", "Sisällöntuottaja", "Visuaalinen suunnittelija",
-    "Projektipäällikkö (luovat sisällöt)", "Viestintäsuunnittelija", "Markkinointisuunnittelija",
-    "UI/UX-suunnittelija", "Creative Producer", "Content Manager", "Art Director Assistant",
-    "Junior Designer", "Video Editor"
-]
+    with st.expander("🔎 Suodata & järjestä", expanded=False):
+        f1, f2, f3 = st.columns(3)
+        with f1: status_filter = st.multiselect("Tila", list(STATUS_COLORS.keys()), key="flt_status", persist_state="session")
+        with f2: company_filter = st.text_input("Yritys sisältää", key="flt_company", persist_state="session")
+        with f3: sort_by = st.selectbox("Järjestys", TRACKER_SORTS, key="flt_sort", persist_state="session")
+        date_filter = st.date_input("Aikaväli", value=(), key="flt_dates", persist_state="session")
+
+    tracker = st.session_state.tracked_companies
+    analytics = get_pipeline_analytics()
+    visible = sort_tracked(filter_tracked(analytics.frame, status_filter, company_filter, date_filter), sort_by)
+    visible_items = [tracker.get(item_id) for item_id in visible["id"]]
+    page_count = max(1, -(-len(visible_items) // TRACKER_PAGE_SIZE))
+    page = min(st.session_state.get("tracker_page", 1), page_count)
+    if page_count > 1:
+        page = st.number_input(f"Sivu (1–{page_count})", min_value=1, max_value=page_count, value=page, step=1)
+        st.session_state.tracker_page = page
+    page_items = visible_items[(page - 1) * TRACKER_PAGE_SIZE:page * TRACKER_PAGE_SIZE]
+    if len(visible_items) != len(st.session_state.tracked_companies):
+        st.caption(f"Näytetään {len(visible_items)} / {len(st.session_state.tracked_companies)} hakemusta")
+
+    # Widgetit luodaan vain näkyvälle sivulle; avaimet sidotaan hakemuksen id:hen, ei listan paikkaan
+    for item in page_items:
+        item_id = item['id']
+        with st.container():
+            # Merkit lasketaan kerran koko listalle (analytiikkakehys), ei jokaiselle widgetille erikseen
+            time_badge, countdown_badge = analytics.badges.get(item_id, ("", ""))
+            status_color = STATUS_COLORS.get(item['status'], {"bg": "#FFFFFF", "text": "#000000"})
+            
+            c1, c2, c3 = st.columns([3, 2, 1])
+            with c1: st.markdown(f"**{item['company']}** ({item['role']})")
+            with c2: st.markdown(f"<span style='background-color:{status_color['bg']}; color:{status_color['text']}; padding:4px 8px; border-radius:6px;'>{item['status']}</span> <span style='margin-left:8px; font-size:0.9em;'>{time_badge}</span>", unsafe_allow_html=True)
+            with c3:
+                if st.button("🗑️", key=f"d_{item_id}") and delete_item(item):
+                    st.session_state.tracked_companies.remove(item_id)
+                    st.session_state.edit_states.pop(item_id, None)
+                    st.rerun()
+
+            if item['status'] == "Haastattelu" and item['interview_date']:
+                st.markdown(f"🗓️ **Haastattelu:** {format_date(item['interview_date'])} klo {item['interview_time']} → <span style='color:#d9534f; font-weight:bold;'>{countdown_badge}</span>", unsafe_allow_html=True)
+
+            is_editing = st.session_state.edit_states.get(item_id, False)
+            with st.expander("👤 Yhteystiedot"):
+                if st.button("✏️ Avaa muokkaus" if not is_editing else "🔒 Lukitse", key=f"edit_btn_{item_id}"):
+                    st.session_state.edit_states[item_id] = not is_editing
+                    st.rerun()
+                
+                disabled_status = not is_editing
+                contact_fields = (("Nimi", "contact_name", "cn"), ("Puhelin", "contact_phone", "cp"), ("Sähköposti", "contact_email", "ce"))
+                for col, (label, field, prefix) in zip(st.columns(3), contact_fields):
+                    with col:
+                        new_value = st.text_input(label, value=item[field], key=f"{prefix}_{item_id}", disabled=disabled_status)
+                        if new_value != item[field]:
+                            item[field] = new_value
+                            # Ristiriidassa kenttä palautetaan tallennettuun arvoon eikä toisen muutosta kirjoiteta yli
+                            if not save_item(item): st.session_state.pop(f"{prefix}_{item_id}", None)
+
+    if not st.session_state.tracked_companies:
+        st.info("Seurantalista on tyhjä.")
+    elif not visible_items:
+        st.info("Ei hakemuksia valituilla suodattimilla.")
+
+# --- TAB 6: AGENTTI (SMART QUOTA) ---
+def render_agentti():
+    st.header("🕵️ Ura-agentti")
+    st.info("Agentti valvoo työnhakuvelvoitetta ja aikatauluja.")
+    
+    # --- VELVOITELASKURI ---
+    MONTHLY_QUOTA = 4
+    today = datetime.date.today()
+    tracker = st.session_state.tracked_companies
+    analytics = get_pipeline_analytics()
+    apps_this_month = analytics.count_month(today.year, today.month)
+
+    quota_progress = min(apps_this_month / MONTHLY_QUOTA, 1.0)
+    remaining_quota = MONTHLY_QUOTA - apps_this_month
+
+    st.subheader("📉 Työnhakuvelvoite (Tämä kuu)")
+    if remaining_quota > 0:
+        st.warning(f"⚠️ Olet lähettänyt **{apps_this_month} / {MONTHLY_QUOTA}** hakemusta. Vielä {remaining_quota} puuttuu!")
+        st.progress(quota_progress, text=f"Valmiina: {int(quota_progress*100)}%")
+    else:
+        st.balloons()
+        st.success(f"✅ **MAHTAVAA!** Olet täyttänyt kuukauden kiintiön ({apps_this_month} / {MONTHLY_QUOTA}).")
+        st.progress(1.0, text="Velvoite täytetty 100%")
+
+    if tracker:
+        st.divider()
+        st.subheader("📊 Hakuputki")
+        p1, p2, p3 = st.columns(3)
+        with p1:
+            st.caption("Hakemukset kuukausittain")
+            monthly = analytics.monthly_counts()
+            if len(monthly): st.bar_chart(monthly.set_axis(monthly.index.strftime("%m/%Y")), color="#4DA6FF")
+        with p2:
+            st.caption("Eteneminen")
+            st.dataframe(analytics.funnel(), hide_index=True, column_config={"Osuus": st.column_config.ProgressColumn("Osuus", min_value=0, max_value=1, format="percent")})
+        with p3:
+            st.caption("Vastausta odottavat (ikä)")
+            st.bar_chart(analytics.waiting_distribution(), color="#FFC107")
+            response_days = analytics.response_days()
+            if len(response_days): st.caption(f"Hakemuksesta haastatteluun: mediaani {response_days.median():.0f} pv ({len(response_days)} kpl)")
+
+    st.divider()
+    st.subheader("🔔 Ilmoitukset")
+
+    agent_actions_found = False
+
+    # --- LOGIIKKA A: FOLLOW-UP (14 PÄIVÄÄ) ---
+    for item_id, days_since_applied in analytics.follow_up_backlog()[["id", "age_days"]].itertuples(index=False):
+        item = tracker.get(item_id)
+        days_since_applied = int(days_since_applied)
+        agent_actions_found = True
+        with st.container():
+            st.warning(f"⏳ **{item['company']}**: Hakemuksesta on kulunut {days_since_applied} päivää. Hiljaista?")
+            
+            col_a, col_b = st.columns([1, 4])
+            with col_a:
+                if st.button("📧 Kirjoita viesti", key=f"agent_email_{item.id}"):
+                    st.session_state[f"show_email_{item.id}"] = True
+            
+            with col_b:
+                if st.session_state.get(f"show_email_{item.id}", False):
+                    st.markdown("### 📝 Luonnos:")
+                    
+                    contact = item.get('contact_name', 'Rekrytointitiimi')
+                    draft_email = f"""
+Hei {contact},
 
-SEARCH_KEYWORDS = [
-    "graafinen suunnittelija", "sisällöntuottaja", "visuaalinen suunnittelija",
-    "projektipäällikkö", "viestintäsuunnittelija", "markkinointisuunnittelija",
-    "UI designer", "UX designer", "creative producer", "content manager", 
-    "mainonta", "luova ala", "graafinen suunnittelu", "digitaalinen viestintä",
-    "ICT"
-]
+Toivottavasti viikkone on sujunut hyvin!
 
-FUTURE_MAKER_LINK = "https://janmyllymaki.wixsite.com/future-maker/fi"
+Laitoin teille hakemuksen {item['role']} -tehtävään {format_date(item['date'])} ({days_since_applied} päivää sitten). 
+Olen edelleen erittäin kiinnostunut mahdollisuudesta liittyä {item['company']}:n tiimiin ja halusin tiedustella, missä vaiheessa rekrytointiprosessi etenee?
 
-SITES_INTL = {
-    "Behance Jobs": "https://www.behance.net/joblist",
-    "Design Jobs Board": "https://www.designjobsboard.com/",
-    "Krop": "https://www.krop.com/"
-}
+Vastaan mielelläni mahdollisiin lisäkysymyksiin.
 
-SITES_FI_NORDIC = {
-    "Journalistiliitto (Etusivu)": "https://journalistiliitto.fi/",
-    "Kuntarekry (Kulttuuri)": "https://www.kuntarekry.fi/fi/tyopaikat/kulttuuri-ja-museoala/",
-    "Medialiitto (Työpaikat)": "https://www.medialiitto.fi/medialiitto/tyopaikat/",
-    "TAKU ry": "https://taku.fi/avainsana/tyopaikat/"
-}
+Ystävällisin terveisin,
+{USER_NAME}
+"""
+                    st.text_area("Kopioi tästä:", value=draft_email, height=200)
+                    if st.button("Sulje", key=f"close_email_{item.id}"):
+                        st.session_state[f"show_email_{item.id}"] = False
+                        st.rerun()
 
-SITES_MEDIA = {
-    "Media Match": "https://www.media-match.com/",
-    "ProductionHUB": "https://www.productionhub.com/jobs"
-}
+    # --- LOGIIKKA B: HAASTATTELU PREP (0-2 PÄIVÄÄ) ---
+    for item_id, days_until in analytics.upcoming_interviews()[["id", "days_until_interview"]].itertuples(index=False):
+        item = tracker.get(item_id)
+        days_until = int(days_until)
+        agent_actions_found = True
+        with st.container():
+            st.error(f"🔥 **{item['company']}**: Haastattelu {days_until} pv päästä! Valmistaudutaanko?")
+            
+            col_c, col_d = st.columns([1, 4])
+            with col_c:
+                if st.button("🧠 Luo muistilista", key=f"agent_prep_{item.id}"):
+                    st.session_state[f"show_prep_{item.id}"] = True
+            
+            with col_d:
+                if st.session_state.get(f"show_prep_{item.id}", False):
+                    st.markdown("### 📋 Prep-lista:")
+                    prep_text = f"""
+1. **Tutustu yrityksen viimeisimpiin uutisiin** (LinkedIn, Verkkosivut).
+2. **Kertaa hakemuksesi:** Mitä lupasit osaavasi?
+3. **Valmistele kysymyksiä heille:** Esim. "Miltä tyypillinen työpäivä näyttää?"
+4. **Pitch:** Harjoittele 2 minuutin hissipuhe itsestäsi.
+                    """
+                    st.markdown(prep_text)
+                    if st.button("Sulje", key=f"close_prep_{item.id}"):
+                        st.session_state[f"show_prep_{item.id}"] = False
+                        st.rerun()
 
-# ---------------------------------------------------------
-# UI & LOGIIKKA
-# ---------------------------------------------------------
+    if not agent_actions_found:
+        st.success("✅ Kaikki ajan tasalla. Ei akuutteja toimenpiteitä.")
+
+# --- TAB 7: TYÖMARKKINATORI ---
+def render_tyo():
+    st.header("🇫🇮 Työmarkkinatori: Mission Jobs -haku")
+    c1, c2 = st.columns(2)
+    with c1:
+        st.subheader("💼 Työpaikat")
+        job_options = ["Kaikki luovat alat"] + SEARCH_KEYWORDS
+        selected_job_role = st.selectbox("Valitse ammattinimike:", job_options)
+        q_jobs = "%20".join(SEARCH_KEYWORDS) if selected_job_role == "Kaikki luovat alat" else selected_job_role
+        tm_jobs_url = f"https://tyomarkkinatori.fi/henkiloasiakkaat/avoimet-tyopaikat?q={q_jobs}&location=Uusimaa"
+        st.markdown(f"""<div class="cta-container"><a href="{tm_jobs_url}" target="_blank" class="cta-button">👉 HAE: {selected_job_role.upper()}</a></div>""", unsafe_allow_html=True)
+
+    with c2:
+        st.subheader("🎓 Koulutus")
+        training_topics = {
+            "Kaikki aiheet": "media viestintä", 
+            "Viestintä": "viestintä", 
+            "Graafinen": "graafinen",
+            "Osatutkinnot": "osatutkinto",
+            "Tutkinnon osat": "tutkinnon osa",
+            "Osatutkintokoulutus": "osatutkintokoulutus"
+        }
+        selected_topic = st.selectbox("Valitse ala:", list(training_topics.keys()))
+        q_training = training_topics[selected_topic]
+        tm_train_url = f"https://tyomarkkinatori.fi/henkiloasiakkaat/koulutukset-ja-palvelut?q={q_training}"
+        st.markdown(f"""<div class="cta-container"><a href="{tm_train_url}" target="_blank" class="cta-button dark">👉 HAE: {selected_topic.upper()}</a></div>""", unsafe_allow_html=True)
+
+    st.markdown("---")
+    render_saved_postings()
+
+def render_saved_postings():
+    """Tallennetut ilmoitusviennit (CSV, JSON, JSON-lines, HTML) paikalliseen varastoon ja haku niistä."""
+    st.subheader("🗂️ Tallennetut ilmoitukset")
+    store = get_posting_store()
+    with st.expander(f"📥 Tuo ilmoituksia (varastossa {len(store)})"):
+        uploads = st.file_uploader("Ilmoitusviennit", type=["csv", "jsonl", "json", "html", "htm"], accept_multiple_files=True)
+        if uploads and st.button("Tuo varastoon"):
+            progress = st.progress(0.0, text="Luetaan...")
+            for i, upload in enumerate(uploads):
+                # iter_postings tunnistaa muodon tiedostopäätteestä, joten väliaikaistiedosto saa saman päätteen
+                suffix = os.path.splitext(upload.name)[1]
+                with tempfile.NamedTemporaryFile("wb", suffix=suffix, delete=False) as tmp:
+                    tmp.write(upload.getbuffer())
+                try:
+                    s = store.ingest_file(tmp.name, progress=lambda s: progress.progress(i / len(uploads), text=f"{upload.name}: {s['read']} luettu"))
+                finally:
+                    os.unlink(tmp.name)
+                st.write(f"**{upload.name}**: {s['added']} uutta, {s['exact_duplicates'] + s['near_duplicates']} duplikaattia ohitettu ({s['seconds']:.1f} s)")
+            progress.progress(1.0, text="Valmis")
+    query = st.text_input("Hae tallennetuista ilmoituksista:", placeholder="esim. graafinen suunnittelija helsinki")
+    if query:
+        started = time.perf_counter()
+        results = store.search(query, limit=50)
+        st.caption(f"{len(results)} osumaa ({1000 * (time.perf_counter() - started):.0f} ms)")
+        if results:
+            import pandas as pd
+            st.dataframe(
+                pd.DataFrame(results)[["score", "title", "company", "location", "url"]],
+                column_config={
+                    "score": st.column_config.NumberColumn("Pisteet", format="%.1f"),
+                    "title": "Ilmoitus", "company": "Yritys", "location": "Sijainti",
+                    "url": st.column_config.LinkColumn("Linkki"),
+                },
+                hide_index=True, width="stretch",
+            )
+
+# --- TAB 8: PORTFOLIO ---
+def render_portfolio():
+    st.header("🎨 Portfolio & Data")
+    st.markdown(f"""<div class="cta-container"><a href="{FUTURE_MAKER_LINK}" target="_blank" class="cta-button dark">🚀 AVAA PORTFOLIO & CV</a></div>""", unsafe_allow_html=True)
+    st.markdown("---")
+    stats = load_visitor_data()
+    if stats:
+        metrics = [{"value": stats['count'], "label": "Vierailijat"}, {"value": stats['latest_company'], "label": "Viimeisin"}, {"value": stats['latest_date'], "label": "Päivämäärä"}]
+        st.markdown(grid("metric", metrics), unsafe_allow_html=True)
+        st.write("")
+        c1, c2 = st.columns([2, 1])
+        with c1: 
+            st.subheader("📊 Top Vierailijat")
+            if stats['top']:
+                import pandas as pd
+                st.bar_chart(pd.Series(stats['top']), color="#4DA6FF")
+        with c2: st.subheader("📋 Lokitiedot"); st.dataframe(get_visitor_log().frame(limit=200), width="stretch", height=300, column_config={"timestamp": st.column_config.DatetimeColumn("Aika", format="DD.MM.YYYY HH:mm"), "visitor": "Vierailija", "company": "Yritys"})
+    else: st.warning("⚠️ Dataa ei saatavilla...")
+
+# --- TAB 9: SUOSITUKSET ---
+REC_PAGE_SIZE = 10
+
+def render_suositukset():
+    st.header("🧠 Suositukset")
+    index = get_recommendation_index()
+    limit = st.session_state.get("rec_limit", REC_PAGE_SIZE)
+
+    # Rikkinäiset linkit suodatetaan ennen rajausta, jotta sivulla on aina täysi määrä kortteja
+    healthy = [sug for sug in index.top() if validate_link(sug['url'])]
+    for sug in healthy[:limit]:
+        with st.container():
+            c1, c2 = st.columns([4, 1])
+            with c1: st.markdown(rec_card(sug), unsafe_allow_html=True)
+            with c2:
+                st.write("")
+                if st.button("➕ Lisää", key=f"add_{sug['url']}", width="stretch"):
+                    new_item = ApplicationRecord(sug['name'], sug['cat'], "Kiinnostunut", date=datetime.date.today())
+                    st.session_state.tracked_companies.add(new_item)
+                    save_item(new_item)
+                    index.track(sug['name'])
+                    st.rerun()
+                if st.button("❌ Piilota", key=f"dis_{sug['url']}", width="stretch"):
+                    index.dismiss(sug['name'])
+                    get_tracker_store().dismiss(candidate_key(sug['name']), current_user())
+                    st.rerun()
+
+    if len(healthy) > limit and st.button(f"Näytä lisää ({len(healthy) - limit})"):
+        st.session_state.rec_limit = limit + REC_PAGE_SIZE
+        st.rerun()
+    if not len(index): st.success("Kaikki suositukset on jo käsitelty! 🚀")
+
+# --- TAB 10: AI KOULUTUS ---
+def render_ai_koulutus():
+    st.header("🤖 Tekoälykoulutukset")
+    st.markdown(grid("ai", AI_STUDIES), unsafe_allow_html=True)
+
+# Korttityylit, joita välilehti tarvitsee (html_cards.STYLES); perustyylit tulevat aina
+TAB_STYLES = {"🏢 LINKIT": ("grid", "link"), "🎨 PORTFOLIO": ("grid", "metric"), "🧠 SUOSITUKSET": ("rec",), "🤖 AI KOULUTUS": ("grid", "ai")}
+
+TABS = [
+    ("✨ HAKEMUS", render_hakemus), ("📊 ANALYSOI", render_analysoi), ("🏢 LINKIT", render_linkit),
+    ("⚡️ TEHOHAKU", render_tehohaku), ("📌 SEURANTA", render_seuranta), ("🕵️ AGENTTI", render_agentti),
+    ("🇫🇮 TYÖ", render_tyo), ("🎨 PORTFOLIO", render_portfolio), ("🧠 SUOSITUKSET", render_suositukset),
+    ("🤖 AI KOULUTUS", render_ai_koulutus)
+]
 
-st.markdown("""
-<style>
-    .stApp { overflow-x: hidden; }
-    @media (max-width: 768px) {
-        .block-container { padding: 1rem; }
-        .stButton button { width: 100%; }
-        .ai-card, .rec-card { min-height: auto; }
-    }
-    .responsive-link-btn {
-        display: flex; align-items: center; justify-content: center; padding: 12px; 
-        background: #262730; border: 1px solid #464b5f; border-radius: 8px; 
-        margin-bottom: 8px; text-decoration: none; color: white !important; width: 100%;
-        transition: background 0.2s; font-weight: 500;
-        box-sizing: border-box;
-    }
-    .responsive-link-btn:hover { background: #363740; }
-    .responsive-link-btn img { width: 20px; height: 20px; margin-right: 10px; object-fit: contain; }
-    
-    .cta-container { display: flex; justify-content: center; margin: 20px 0; }
-    .cta-button {
-        background-color: #0a66c2; color: white !important; padding: 16px 32px; 
-        border-radius: 8px; font-weight: bold; text-decoration: none; text-align: center;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1); display: inline-block;
-    }
-    .cta-button.dark { background-color: #333; }
-</style>
-""", unsafe_allow_html=True)
+DEBUG_RUNS_KEEP = 20
 
 def main():
+    """Piirtää sivun; instrumentoituna, jos HUB_PROFILE=1 tai osoitteessa on ?debug=1."""
+    if not (instrumentation.ENABLED or st.query_params.get("debug") == "1"): return render_page()
+    runs = st.session_state.setdefault("debug_runs", deque(maxlen=DEBUG_RUNS_KEEP))
+    st.session_state.debug_seq = st.session_state.get("debug_seq", 0) + 1
+    trace = instrumentation.start_rerun(str(st.session_state.debug_seq))
+    profiler = instrumentation.Profiler() if st.session_state.pop("profile_next_run", False) else None
+    try:
+        with profiler or nullcontext():
+            render_page()
+    finally:
+        # Myös st.rerun()/st.stop() keskeyttämä ajo kirjataan
+        runs.append(instrumentation.finish_rerun())
+        if profiler: st.session_state.debug_profile = (trace.label, profiler.dump(), profiler.summary())
+    render_debug_panel(trace, runs)
+
+def render_debug_panel(trace, runs):
+    """Sivupalkin erittely: mihin tämän ajon aika kului, välimuistien osumat ja vientitiedostot."""
+    with st.sidebar.expander(f"🐞 Suorituskyky: ajo {trace.label} {trace.ms:.0f} ms"):
+        breakdown = trace.breakdown()
+        if breakdown:
+            import pandas as pd
+            st.dataframe(pd.DataFrame(breakdown), hide_index=True, width="stretch",
+                         column_config={"ms": st.column_config.NumberColumn("ms", format="%.1f")})
+        for name, (hits, misses) in trace.cache_stats().items(): st.caption(f"Välimuisti {name}: {hits} osumaa, {misses} ohitusta")
+        from http_client import shared_client
+        http = shared_client().stats()
+        st.caption(f"HTTP (prosessi): {http['requests']} pyyntöä, {http['bytes'] / 1024:.0f} kt, {http['not_modified']} × 304, {http['errors']} virhettä")
+        st.download_button("⬇️ Chrome trace (JSON)", instrumentation.chrome_trace(runs, instrumentation.background_spans()),
+                           file_name="hub_trace.json", mime="application/json", help=f"Viimeiset {len(runs)} ajoa; avaa chrome://tracing tai ui.perfetto.dev")
+        if st.button("🔬 cProfile seuraavasta ajosta"):
+            st.session_state.profile_next_run = True
+            st.rerun()
+        if "debug_profile" in st.session_state:
+            label, dump, summary = st.session_state.debug_profile
+            st.download_button(f"⬇️ cProfile, ajo {label} (.prof)", dump, file_name=f"hub_run_{label}.prof")
+            st.code(summary, language=None)
+
+def render_page():
     if 'tracked_companies' not in st.session_state: st.session_state.tracked_companies = load_local_data()
     if 'edit_states' not in st.session_state: st.session_state.edit_states = {}
-    if 'dismissed_suggestions' not in st.session_state: st.session_state.dismissed_suggestions = []
+    if 'tab_timings' not in st.session_state: st.session_state.tab_timings = {}
+    sync_tracker()
+    get_refresh_scheduler()
+    get_asset_store()
 
-    with st.sidebar:
+    with st.sidebar, span("sivupalkki", "widgets"):
         st.title("⚙️ Asetukset")
         st.header("🧠 Äly")
         st.info("Logiikka: Local (Sisäinen)")
@@ -485,373 +791,26 @@ def main():
             for name, url in STARTUPS_PK.items():
                 if validate_link(url): st.markdown(f"- [{name}]({url})")
 
+        watch_tracker()
+        st.markdown("---")
+        st.markdown("**⏱️ Välilehtien piirtoajat**")
+        timing_slot = st.empty()
+
     st.title("MISSION JOBS // HUB V68.4 (Local Edition)")
     st.markdown(f"**Tila:** 🟡 LOCAL MODE | **Käyttäjä:** {USER_NAME}")
 
-    tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9, tab10 = st.tabs([
-        "✨ HAKEMUS", "📊 ANALYSOI", "🏢 LINKIT", "⚡️ TEHOHAKU", 
-        "📌 SEURANTA", "🕵️ AGENTTI", "🇫🇮 TYÖ", "🎨 PORTFOLIO", 
-        "🧠 SUOSITUKSET", "🤖 AI KOULUTUS"
-    ])
-
-    # --- TAB 1: HAKEMUS ---
-    with tab1:
-        st.header("📝 Hakemusgeneraattori")
-        c1, c2 = st.columns(2)
-        with c1: 
-            company_name = st.text_input("Yrityksen nimi (Generointia varten):")
-            role_name = st.text_input("Haettava rooli:")
-            job_desc = st.text_area("Liitä työpaikkailmoitus tähän:", height=250)
-        with c2: 
-            user_cv = st.text_area("Oma tausta / CV tiivistelmä:", height=380)
-        
-        if st.button("🚀 LUO HAKEMUS", type="primary"):
-            if job_desc and user_cv:
-                with st.spinner("Luodaan hakemuspohjaa..."):
-                    draft = generate_template_application(company_name if company_name else "[YRITYS]", role_name if role_name else "[ROOLI]", job_desc, user_cv)
-                    st.subheader("📄 Hakemuspohja:")
-                    st.info("💡 Tässä on älykäs pohja, jonka voit viimeistellä.")
-                    st.text_area("", value=draft, height=600)
-            else:
-                st.warning("Täytä ainakin ilmoitus ja oma tausta.")
-
-    # --- TAB 2: ANALYSOI ---
-    with tab2:
-        st.header("📊 Analysoi Ilmoitus")
-        col1, col2 = st.columns(2)
-        with col1: input_title = st.text_input("Työnimike")
-        with col2: input_loc = st.text_input("Sijainti")
-        input_desc_analysis = st.text_area("Liitä ilmoitusteksti tähän analyysiä varten:", height=200)
-        
-        if st.button("🔍 ANALYSOI TEKSTI"):
-            # Pisteytys (Aina toiminnassa)
-            score = calculate_score(input_title, input_loc, input_desc_analysis)
-            st.subheader(f"Match Score: {score}/5.0")
-            st.progress(min(score/5, 1.0))
-
-            if input_desc_analysis:
-                stats, keyword_score, missing = local_text_analysis(input_desc_analysis)
-                c1, c2 = st.columns(2)
-                with c1:
-                    st.write("✅ **Löydetyt avainsanat:**")
-                    st.json(stats)
-                with c2:
-                    if missing:
-                        st.write("⚠️ **Harkitse näiden mainitsemista:**")
-                        for m in missing[:5]: st.markdown(f"- {m.capitalize()}")
-                st.info("💡 Tämä on automaattinen avainsana-analyysi.")
-
-    # --- TAB 3: LINKIT ---
-    with tab3:
-        st.header("🏢 Linkkikirjasto")
-        with st.expander("Mainostoimistot", expanded=True):
-            cols = st.columns(3)
-            for i, (name, url) in enumerate(AGENCIES.items()):
-                logo = f"https://www.google.com/s2/favicons?domain={url.split('/')[2]}&sz=64"
-                with cols[i % 3]: 
-                    st.markdown(f"""<a href="{url}" target="_blank" class="responsive-link-btn"><img src="{logo}">{name}</a>""", unsafe_allow_html=True)
-        
-        c1, c2, c3 = st.columns(3)
-        with c1: 
-            st.subheader("🌍 Intl")
-            for n,u in SITES_INTL.items(): st.markdown(f"[{n}]({u})")
-        with c2: 
-            st.subheader("🇫🇮 Suomi")
-            for n,u in SITES_FI_NORDIC.items(): st.markdown(f"[{n}]({u})")
-        with c3: 
-            st.subheader("🎬 Media")
-            for n,u in SITES_MEDIA.items(): st.markdown(f"[{n}]({u})")
-
-    # --- TAB 4: TEHOHAKU ---
-    with tab4:
-        st.header("⚡️ Tehohaku")
-        def generate_linkedin_url_full():
-            q = " OR ".join([f'"{r}"' for r in SEARCH_KEYWORDS])
-            params = {"keywords": f"({q})", "location": "Helsinki Metropolitan Area", "f_TPR": "r2592000", "sort": "dd"}
-            return "https://www.linkedin.com/jobs/search/?" + urllib.parse.urlencode(params)
-        
-        st.markdown(f"""<div class="cta-container"><a href="{generate_linkedin_url_full()}" target="_blank" class="cta-button">👉 LINKEDIN (HELSINKI + CREATIVE)</a></div>""", unsafe_allow_html=True)
-
-    # --- TAB 5: SEURANTA ---
-    with tab5:
-        st.header("📌 Hakemusten Seuranta")
-
-        STATUS_COLORS = {
-            "Odottaa": {"bg": "#FFF3CD", "text": "#856404"},
-            "Keskustelu": {"bg": "#D1ECF1", "text": "#0C5460"},
-            "Haastattelu": {"bg": "#C3E6CB", "text": "#155724"},
-            "Ei vastausta": {"bg": "#E2E3E5", "text": "#6C757D"},
-            "Hylätty": {"bg": "#F8D7DA", "text": "#721C24"},
-            "Kiinnostunut": {"bg": "#E2E3E5", "text": "#333333"}
-        }
-
-        with st.expander("➕ Lisää manuaalisesti", expanded=False):
-            c1, c2 = st.columns(2)
-            with c1: cn = st.text_input("Yritys")
-            with c2: cr = st.text_input("Rooli")
-            cs = st.selectbox("Tila", ["Odottaa", "Keskustelu", "Haastattelu", "Ei vastausta", "Hylätty"])
-            interview_date = ""
-            interview_time = ""
-            if cs == "Haastattelu":
-                interview_date = st.date_input("Haastattelupäivä", key="int_date")
-                interview_time = st.time_input("Haastattelun kellonaika", key="int_time")
-
-            if st.button("Tallenna", type="primary") and cn:
-                new_item = {
-                    "company": cn, "role": cr, "status": cs,
-                    "date": datetime.datetime.now().strftime("%d.%m."),
-                    "contact_name": "", "contact_phone": "", "contact_email": "",
-                    "interview_date": str(interview_date) if cs == "Haastattelu" else "",
-                    "interview_time": str(interview_time) if cs == "Haastattelu" else ""
-                }
-                st.session_state.tracked_companies.append(new_item)
-                save_local_data(st.session_state.tracked_companies)
-                st.success("✅ Hakemus tallennettu!")
-                st.rerun()
-
-        for i, item in enumerate(st.session_state.tracked_companies):
-            with st.container():
-                for k in ["contact_name", "contact_phone", "contact_email", "interview_date", "interview_time"]:
-                    if k not in item: item[k] = ""
-
-                time_badge = safe_deadline_block(item.get('date', ''))
-                status_color = STATUS_COLORS.get(item['status'], {"bg": "#FFFFFF", "text": "#000000"})
-                
-                c1, c2, c3 = st.columns([3, 2, 1])
-                with c1: st.markdown(f"**{item['company']}** ({item['role']})")
-                with c2: st.markdown(f"<span style='background-color:{status_color['bg']}; color:{status_color['text']}; padding:4px 8px; border-radius:6px;'>{item['status']}</span> <span style='margin-left:8px; font-size:0.9em;'>{time_badge}</span>", unsafe_allow_html=True)
-                with c3:
-                    if st.button("🗑️", key=f"d{i}"): 
-                        st.session_state.tracked_companies.pop(i)
-                        save_local_data(st.session_state.tracked_companies)
-                        st.rerun()
-
-                if item['status'] == "Haastattelu" and item['interview_date']:
-                    countdown_badge = safe_deadline_block(item['interview_date'], is_future_event=True)
-                    st.markdown(f"🗓️ **Haastattelu:** {item['interview_date']} klo {item['interview_time']} → <span style='color:#d9534f; font-weight:bold;'>{countdown_badge}</span>", unsafe_allow_html=True)
-
-                is_editing = st.session_state.edit_states.get(i, False)
-                with st.expander("👤 Yhteystiedot"):
-                    if st.button("✏️ Avaa muokkaus" if not is_editing else "🔒 Lukitse", key=f"edit_btn_{i}"):
-                        st.session_state.edit_states[i] = not is_editing
-                        st.rerun()
-                    
-                    c1, c2, c3 = st.columns(3)
-                    disabled_status = not is_editing
-                    with c1:
-                        new_name = st.text_input("Nimi", value=item['contact_name'], key=f"cn_{i}", disabled=disabled_status)
-                        if new_name != item['contact_name']: item['contact_name'] = new_name; save_local_data(st.session_state.tracked_companies)
-                    with c2:
-                        new_phone = st.text_input("Puhelin", value=item['contact_phone'], key=f"cp_{i}", disabled=disabled_status)
-                        if new_phone != item['contact_phone']: item['contact_phone'] = new_phone; save_local_data(st.session_state.tracked_companies)
-                    with c3:
-                        new_email = st.text_input("Sähköposti", value=item['contact_email'], key=f"ce_{i}", disabled=disabled_status)
-                        if new_email != item['contact_email']: item['contact_email'] = new_email; save_local_data(st.session_state.tracked_companies)
-
-        if not st.session_state.tracked_companies:
-            st.info("Seurantalista on tyhjä.")
-
-    # --- TAB 6: AGENTTI (SMART QUOTA) ---
-    with tab6:
-        st.header("🕵️ Ura-agentti")
-        st.info("Agentti valvoo työnhakuvelvoitetta ja aikatauluja.")
-        
-        # --- VELVOITELASKURI ---
-        MONTHLY_QUOTA = 4
-        current_month = datetime.datetime.now().month
-        apps_this_month = 0
-        
-        for item in st.session_state.tracked_companies:
-            if item['status'] == "Kiinnostunut": continue 
-            
-            try:
-                date_parts = item.get('date', '').split('.')
-                if len(date_parts) >= 2:
-                    month_num = int(date_parts[1])
-                    if month_num == current_month:
-                        apps_this_month += 1
-            except:
-                pass 
-
-        quota_progress = min(apps_this_month / MONTHLY_QUOTA, 1.0)
-        remaining_quota = MONTHLY_QUOTA - apps_this_month
-
-        st.subheader("📉 Työnhakuvelvoite (Tämä kuu)")
-        if remaining_quota > 0:
-            st.warning(f"⚠️ Olet lähettänyt **{apps_this_month} / {MONTHLY_QUOTA}** hakemusta. Vielä {remaining_quota} puuttuu!")
-            st.progress(quota_progress, text=f"Valmiina: {int(quota_progress*100)}%")
-        else:
-            st.balloons()
-            st.success(f"✅ **MAHTAVAA!** Olet täyttänyt kuukauden kiintiön ({apps_this_month} / {MONTHLY_QUOTA}).")
-            st.progress(1.0, text="Velvoite täytetty 100%")
-
-        st.divider()
-        st.subheader("🔔 Ilmoitukset")
-
-        agent_actions_found = False
-        
-        if st.session_state.tracked_companies:
-            for i, item in enumerate(st.session_state.tracked_companies):
-                
-                # --- LOGIIKKA A: FOLLOW-UP (14 PÄIVÄÄ) ---
-                days_since_applied = calculate_days_diff(item.get('date', ''))
-                
-                if item['status'] == "Odottaa" and days_since_applied >= 14:
-                    agent_actions_found = True
-                    with st.container():
-                        st.warning(f"⏳ **{item['company']}**: Hakemuksesta on kulunut {days_since_applied} päivää. Hiljaista?")
-                        
-                        col_a, col_b = st.columns([1, 4])
-                        with col_a:
-                            if st.button("📧 Kirjoita viesti", key=f"agent_email_{i}"):
-                                st.session_state[f"show_email_{i}"] = True
-                        
-                        with col_b:
-                            if st.session_state.get(f"show_email_{i}", False):
-                                st.markdown("### 📝 Luonnos:")
-                                
-                                contact = item.get('contact_name', 'Rekrytointitiimi')
-                                draft_email = f"""
-Hei {contact},
-
-Toivottavasti viikkone on sujunut hyvin!
-
-Laitoin teille hakemuksen {item['role']} -tehtävään {item['date']} ({days_since_applied} päivää sitten). 
-Olen edelleen erittäin kiinnostunut mahdollisuudesta liittyä {item['company']}:n tiimiin ja halusin tiedustella, missä vaiheessa rekrytointiprosessi etenee?
-
-Vastaan mielelläni mahdollisiin lisäkysymyksiin.
-
-Ystävällisin terveisin,
-{USER_NAME}
-"""
-                                st.text_area("Kopioi tästä:", value=draft_email, height=200)
-                                if st.button("Sulje", key=f"close_email_{i}"):
-                                    st.session_state[f"show_email_{i}"] = False
-                                    st.rerun()
-
-                # --- LOGIIKKA B: HAASTATTELU PREP (0-2 PÄIVÄÄ) ---
-                if item['status'] == "Haastattelu" and item.get('interview_date'):
-                    days_until = calculate_days_diff(item['interview_date'], is_future=True)
-                    
-                    if 0 <= days_until <= 2:
-                        agent_actions_found = True
-                        with st.container():
-                            st.error(f"🔥 **{item['company']}**: Haastattelu {days_until} pv päästä! Valmistaudutaanko?")
-                            
-                            col_c, col_d = st.columns([1, 4])
-                            with col_c:
-                                if st.button("🧠 Luo muistilista", key=f"agent_prep_{i}"):
-                                    st.session_state[f"show_prep_{i}"] = True
-                            
-                            with col_d:
-                                if st.session_state.get(f"show_prep_{i}", False):
-                                    st.markdown("### 📋 Prep-lista:")
-                                    prep_text = f"""
-1. **Tutustu yrityksen viimeisimpiin uutisiin** (LinkedIn, Verkkosivut).
-2. **Kertaa hakemuksesi:** Mitä lupasit osaavasi?
-3. **Valmistele kysymyksiä heille:** Esim. "Miltä tyypillinen työpäivä näyttää?"
-4. **Pitch:** Harjoittele 2 minuutin hissipuhe itsestäsi.
-                                    """
-                                    st.markdown(prep_text)
-                                    if st.button("Sulje", key=f"close_prep_{i}"):
-                                        st.session_state[f"show_prep_{i}"] = False
-                                        st.rerun()
-
-        if not agent_actions_found:
-            st.success("✅ Kaikki ajan tasalla. Ei akuutteja toimenpiteitä.")
-
-    # --- TAB 7: TYÖMARKKINATORI ---
-    with tab7:
-        st.header("🇫🇮 Työmarkkinatori: Mission Jobs -haku")
-        c1, c2 = st.columns(2)
-        with c1:
-            st.subheader("💼 Työpaikat")
-            job_options = ["Kaikki luovat alat"] + SEARCH_KEYWORDS
-            selected_job_role = st.selectbox("Valitse ammattinimike:", job_options)
-            q_jobs = "%20".join(SEARCH_KEYWORDS) if selected_job_role == "Kaikki luovat alat" else selected_job_role
-            tm_jobs_url = f"https://tyomarkkinatori.fi/henkiloasiakkaat/avoimet-tyopaikat?q={q_jobs}&location=Uusimaa"
-            st.markdown(f"""<div class="cta-container"><a href="{tm_jobs_url}" target="_blank" class="cta-button">👉 HAE: {selected_job_role.upper()}</a></div>""", unsafe_allow_html=True)
-
-        with c2:
-            st.subheader("🎓 Koulutus")
-            training_topics = {
-                "Kaikki aiheet": "media viestintä", 
-                "Viestintä": "viestintä", 
-                "Graafinen": "graafinen",
-                "Osatutkinnot": "osatutkinto",
-                "Tutkinnon osat": "tutkinnon osa",
-                "Osatutkintokoulutus": "osatutkintokoulutus"
-            }
-            selected_topic = st.selectbox("Valitse ala:", list(training_topics.keys()))
-            q_training = training_topics[selected_topic]
-            tm_train_url = f"https://tyomarkkinatori.fi/henkiloasiakkaat/koulutukset-ja-palvelut?q={q_training}"
-            st.markdown(f"""<div class="cta-container"><a href="{tm_train_url}" target="_blank" class="cta-button dark">👉 HAE: {selected_topic.upper()}</a></div>""", unsafe_allow_html=True)
-
-    # --- TAB 8: PORTFOLIO ---
-    with tab8:
-        st.header("🎨 Portfolio & Data")
-        st.markdown(f"""<div class="cta-container"><a href="{FUTURE_MAKER_LINK}" target="_blank" class="cta-button dark">🚀 AVAA PORTFOLIO & CV</a></div>""", unsafe_allow_html=True)
-        st.markdown("---")
-        df_visitors = load_visitor_data()
-        if df_visitors is not None and not df_visitors.empty:
-            cols = df_visitors.columns.tolist()
-            col_time, col_company = cols[0], cols[2] if len(cols) > 2 else cols[0]
-            st.markdown("""<style>.metric-card { background: linear-gradient(135deg, #2b2d42 0%, #1e1e24 100%); border: 1px solid #464b5f; border-radius: 10px; padding: 15px; text-align: center; box-shadow: 0 4px 6px rgba(0,0,0,0.3); } .metric-value { font-size: 1.8rem; font-weight: bold; color: #4DA6FF; margin: 0; } .metric-label { font-size: 0.9rem; color: #b0b0b0; text-transform: uppercase; letter-spacing: 1px; }</style>""", unsafe_allow_html=True)
-            m1, m2, m3 = st.columns(3)
-            with m1: st.markdown(f"""<div class="metric-card"><div class="metric-value">{len(df_visitors)}</div><div class="metric-label">Vierailijat</div></div>""", unsafe_allow_html=True)
-            with m2: st.markdown(f"""<div class="metric-card"><div class="metric-value">{df_visitors.iloc[-1][col_company]}</div><div class="metric-label">Viimeisin</div></div>""", unsafe_allow_html=True)
-            with m3: st.markdown(f"""<div class="metric-card"><div class="metric-value">{str(df_visitors.iloc[-1][col_time]).split(' ')[0]}</div><div class="metric-label">Päivämäärä</div></div>""", unsafe_allow_html=True)
-            st.write("")
-            c1, c2 = st.columns([2, 1])
-            with c1: 
-                st.subheader("📊 Top Vierailijat")
-                if len(cols) > 2:
-                    st.bar_chart(df_visitors[col_company].value_counts().head(7), color="#4DA6FF")
-            with c2: st.subheader("📋 Lokitiedot"); st.dataframe(df_visitors.iloc[::-1], use_container_width=True, height=300)
-        else: st.warning("⚠️ Dataa ei saatavilla...")
-
-    # --- TAB 9: SUOSITUKSET ---
-    with tab9:
-        st.header("🧠 Suositukset")
-        st.markdown("""<style>.rec-card { background-color: #262730; border: 1px solid #464b5f; border-radius: 10px; padding: 15px; margin-bottom: 10px; transition: box-shadow 0.3s; } .rec-card:hover { box-shadow: 0 4px 15px rgba(0,0,0,0.3); border-color: #777; } .rec-title { font-size: 1.1rem; font-weight: bold; color: white; margin-bottom: 5px; } .rec-cat { font-size: 0.8rem; text-transform: uppercase; color: #aaa; letter-spacing: 1px; } .rec-badge { background-color: #0a66c2; color: white; padding: 2px 8px; border-radius: 4px; font-size: 0.8rem; font-weight: bold; }</style>""", unsafe_allow_html=True)
-        with st.spinner("Analysoidaan kohteita..."):
-            agent_suggestions = []
-            tracked_names = {item['company'] for item in st.session_state.tracked_companies}
-            for school in SCHOOLS_DATA:
-                if validate_link(school['url']):
-                    score = calculate_score(school['name'], "Helsinki")
-                    agent_suggestions.append({"name": school['name'], "url": school['url'], "cat": "🎓 Koulutus", "score": score})
-            for name, url in STARTUPS_PK.items():
-                if validate_link(url):
-                    score = calculate_score(name, "Helsinki")
-                    agent_suggestions.append({"name": name, "url": url, "cat": "💼 Työ / Hub", "score": score})
-            agent_suggestions = [s for s in agent_suggestions if s['name'] not in tracked_names and s['name'] not in st.session_state.dismissed_suggestions]
-            agent_suggestions.sort(key=lambda x: x['score'], reverse=True)
-
-            if agent_suggestions:
-                for idx, sug in enumerate(agent_suggestions):
-                    with st.container():
-                        c1, c2 = st.columns([4, 1])
-                        with c1: st.markdown(f"""<div class="rec-card"><div class="rec-cat">{sug['cat']}</div><div class="rec-title">{sug['name']} <span class="rec-badge">{sug['score']}/5</span></div><a href="{sug['url']}" target="_blank" style="color:#4da6ff; text-decoration:none;">🔗 Avaa sivu</a></div>""", unsafe_allow_html=True)
-                        with c2:
-                            st.write("")
-                            if st.button("➕ Lisää", key=f"add_{idx}", use_container_width=True):
-                                st.session_state.tracked_companies.append({"company": sug['name'], "role": sug['cat'], "status": "Kiinnostunut", "date": datetime.datetime.now().strftime("%d.%m."), "contact_name": "", "contact_phone": "", "contact_email": "", "interview_date": "", "interview_time": ""})
-                                save_local_data(st.session_state.tracked_companies)
-                                st.rerun()
-                            if st.button("❌ Piilota", key=f"dis_{idx}", use_container_width=True):
-                                st.session_state.dismissed_suggestions.append(sug['name'])
-                                st.rerun()
-            else: st.success("Kaikki suositukset on jo käsitelty! 🚀")
-
-    # --- TAB 10: AI KOULUTUS ---
-    with tab10:
-        st.header("🤖 Tekoälykoulutukset")
-        st.markdown("""<style>.ai-card { background: linear-gradient(135deg, #2b2d42 0%, #1e1e24 100%); border: 1px solid #4DA6FF; border-radius: 12px; padding: 20px; min-height: 300px; display: flex; flex-direction: column; justify-content: space-between; box-shadow: 0 4px 6px rgba(0,0,0,0.3); } .ai-type { color: #00d4ff !important; font-size: 0.75em; font-weight: bold; text-transform: uppercase; } .ai-title { color: white !important; font-size: 1.2rem; font-weight: bold; margin: 5px 0; } .ai-provider { color: #b0b0b0 !important; font-size: 0.9rem; font-style: italic; margin-bottom: 10px; } .ai-desc { color: #e0e0e0 !important; font-size: 0.9rem; flex-grow: 1; } .ai-link { background: #4DA6FF; color: white !important; padding: 8px 16px; border-radius: 20px; text-decoration: none; font-weight: bold; display: inline-block; white-space: nowrap; font-size: 0.9rem; } .ai-link:hover { background: #008cff; } </style>""", unsafe_allow_html=True)
-        cols = st.columns(3)
-        for i, course in enumerate(AI_STUDIES):
-            with cols[i % 3]:
-                st.markdown(f"""<div class="ai-card"><div><div class="ai-type">{course['type']}</div><div class="ai-title">{course['name']}</div><div class="ai-provider">{course['provider']}</div><div class="ai-desc">{course['desc']}</div></div><div style="text-align:right; margin-top:20px;"><a href="{course['url']}" target="_blank" class="ai-link">Tutustu ➜</a></div></div><div style="margin-bottom:20px;"></div>""", unsafe_allow_html=True)
+    # Laiska suoritus: vain valitun välilehden sisältö ajetaan (on_change="rerun" + tab.open),
+    # joten kirjoittaminen yhdellä välilehdellä ei aja muiden verkko- tai listaoperaatioita
+    tabs = st.tabs([label for label, _ in TABS], key="active_tab", on_change="rerun")
+    for (label, render), tab in zip(TABS, tabs):
+        if not tab.open: continue
+        with tab:
+            st.markdown(stylesheet(*TAB_STYLES.get(label, ())), unsafe_allow_html=True)
+            started = time.perf_counter()
+            with span(label, "tab"):
+                render()
+            st.session_state.tab_timings[label] = (time.perf_counter() - started) * 1000
+    timing_slot.caption(" · ".join(f"{label}: {ms:.0f} ms" for label, ms in st.session_state.tab_timings.items()))
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,126 @@
+import datetime
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+# ---------------------------------------------------------
+# HAKUPUTKEN ANALYTIIKKA (vektorisoitu, välimuistissa)
+# ---------------------------------------------------------
+
+STAGES = ["Odottaa", "Keskustelu", "Haastattelu"]       # etenemisjärjestys
+OUTCOMES = ["Ei vastausta", "Hylätty"]                   # päättyneet hakemukset
+STATUSES = ["Kiinnostunut", *STAGES, *OUTCOMES]
+QUOTA_EXCLUDED = ("Kiinnostunut",)                       # ei vielä lähetetty, ei lasketa velvoitteeseen
+FOLLOW_UP_AFTER = 14
+PREP_WINDOW = 2
+AGE_BINS = [0, 7, 14, 21, 10_000]
+AGE_LABELS = ["0–7 pv", "8–14 pv", "15–21 pv", "yli 21 pv"]
+QUIET_AFTER = 21
+
+
+def _dates(values):
+    return pd.to_datetime(pd.Series(values, dtype="object"))
+
+
+def application_badges(age_days):
+    """Hakemuksen ikämerkit koko sarakkeelle kerralla ("" jos päivä puuttuu)."""
+    days = age_days.astype("Int64").astype("string")
+    return pd.Series(np.select(
+        [age_days.isna(), age_days > QUIET_AFTER, age_days > FOLLOW_UP_AFTER],
+        ["", "⚠️ " + days + " pv (Hiljaista)", "🕒 " + days + " pv"],
+        "🆕 " + days + " pv",
+    ), index=age_days.index)
+
+
+def interview_badges(days_until):
+    """Haastattelun lähtölaskentamerkit koko sarakkeelle kerralla."""
+    days = days_until.astype("Int64").astype("string")
+    return pd.Series(np.select(
+        [days_until.isna(), days_until < 0, days_until == 0, days_until <= PREP_WINDOW],
+        ["", "🔴 Meni jo", "🔥 TÄNÄÄN", "🔥 " + days + " pv"],
+        "📅 " + days + " pv",
+    ), index=days_until.index)
+
+
+def build_frame(tracker, today):
+    """Seurantalista tyypitettynä DataFramena (yksi rivi per hakemus, lisäysjärjestyksessä)."""
+    records = list(tracker)
+    df = pd.DataFrame({
+        "id": pd.Series([r.id for r in records], dtype="string"),
+        "company": pd.Series([r.company for r in records], dtype="string"),
+        "status": pd.Categorical([r.status for r in records], categories=STATUSES),
+        "applied": _dates([r.date for r in records]),
+        "interview": _dates([r.interview_date for r in records]),
+    })
+    df["company_key"] = df["company"].str.strip().str.lower()
+    today_ts = pd.Timestamp(today)
+    df["age_days"] = (today_ts - df["applied"]).dt.days
+    df["days_until_interview"] = (df["interview"] - today_ts).dt.days
+    df["applied_badge"] = application_badges(df["age_days"])
+    df["interview_badge"] = interview_badges(df["days_until_interview"])
+    return df
+
+
+class PipelineAnalytics:
+    """Hakuputken tunnusluvut yhdestä DataFramesta.
+
+    Kehys rakennetaan kerran ja käytetään uudelleen, kunnes seurantalista muuttuu
+    (Tracker.version) tai päivä vaihtuu – ks. is_current().
+    """
+
+    def __init__(self, tracker, today=None):
+        self.today = today or datetime.date.today()
+        self.tracker = tracker
+        self.version = tracker.version
+        self.frame = build_frame(tracker, self.today)
+
+    def is_current(self, tracker, today=None):
+        return tracker is self.tracker and tracker.version == self.version and (today or datetime.date.today()) == self.today
+
+    @cached_property
+    def badges(self):
+        """{id: (hakemusmerkki, haastattelumerkki)} – lasketaan kerran päivässä / muutosta kohden."""
+        df = self.frame
+        return dict(zip(df["id"], zip(df["applied_badge"], df["interview_badge"])))
+
+    def _sent(self):
+        return self.frame[~self.frame["status"].isin(QUOTA_EXCLUDED)]
+
+    def monthly_counts(self):
+        """Lähetetyt hakemukset kuukausittain (PeriodIndex)."""
+        sent = self._sent()
+        return sent.groupby(sent["applied"].dt.to_period("M")).size()
+
+    def count_month(self, year, month):
+        return int(self.monthly_counts().get(pd.Period(year=year, month=month, freq="M"), 0))
+
+    def funnel(self):
+        """Kuinka moni lähetetty hakemus on edennyt kuhunkin vaiheeseen.
+
+        Tilahistoriaa ei tallenneta, joten vaihe päätellään nykyisestä tilasta: haastatteluvaiheessa
+        oleva on ohittanut myös aiemmat vaiheet; päättyneet lasketaan vain lähetetyiksi.
+        """
+        stage = self._sent()["status"].map({s: i for i, s in enumerate(STAGES)}).astype("float").fillna(0)
+        reached = [int((stage >= i).sum()) for i in range(len(STAGES))]
+        total = reached[0] or 1
+        return pd.DataFrame({"Vaihe": STAGES, "Määrä": reached, "Osuus": [n / total for n in reached]})
+
+    def response_days(self):
+        """Päivät hakemuksesta haastatteluun (vain hakemukset, joilla on haastattelupäivä)."""
+        df = self.frame
+        return (df["interview"] - df["applied"]).dt.days.dropna().astype(int)
+
+    def waiting_distribution(self):
+        """Vastausta odottavien hakemusten ikäjakauma."""
+        ages = self.frame.loc[self.frame["status"] == "Odottaa", "age_days"].dropna()
+        return pd.cut(ages, AGE_BINS, labels=AGE_LABELS, include_lowest=True).value_counts().reindex(AGE_LABELS, fill_value=0)
+
+    def follow_up_backlog(self, after=FOLLOW_UP_AFTER):
+        """Odottavat hakemukset, joista on kulunut vähintään `after` päivää (vanhin ensin)."""
+        df = self.frame
+        return df[(df["status"] == "Odottaa") & (df["age_days"] >= after)].sort_values("age_days", ascending=False)
+
+    def upcoming_interviews(self, window=PREP_WINDOW):
+        df = self.frame
+        return df[(df["status"] == "Haastattelu") & df["days_until_interview"].between(0, window)].sort_values("days_until_interview")
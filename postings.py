@@ -0,0 +1,410 @@
+"""Paikallinen työpaikkailmoitusten varasto: sisäänluku, lähes-duplikaattien karsinta ja kokotekstihaku.
+
+Käyttö:
+    python postings.py ingest linkedin.jsonl tallennetut/*.html
+    python postings.py search "graafinen suunnittelija" --limit 20
+"""
+import re
+import sys
+import html
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import argparse
+import threading
+from html.parser import HTMLParser
+
+import numpy as np
+
+from batch_score import read_postings, TITLE_FIELDS, LOCATION_FIELDS, DESCRIPTION_FIELDS
+from scoring import score_breakdown, get_keyword_matcher
+
+# ---------------------------------------------------------
+# ILMOITUSVARASTO (SQLite + FTS5, MinHash-duplikaatit)
+# ---------------------------------------------------------
+
+POSTINGS_DB = "postings.db"
+COMPANY_FIELDS = ("company", "yritys", "employer", "hiringOrganization")
+URL_FIELDS = ("url", "link", "linkki", "job_url")
+BATCH_SIZE = 1000
+
+# MinHash: 64 permutaatiota, LSH 16 kaistaa x 4 riviä (ehdokkaiksi päätyvät n. >0.5 samankaltaiset);
+# duplikaatiksi katsotaan, kun arvioitu Jaccard-samankaltaisuus on vähintään DUPLICATE_THRESHOLD
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+DUPLICATE_THRESHOLD = 0.8
+_PRIME = np.uint64(4294967311)   # pienin alkuluku > 2^32
+_rng = np.random.default_rng(20240101)
+_PERM_A = _rng.integers(1, 2**32, NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, 2**32, NUM_PERM, dtype=np.uint64)
+
+SEARCH_CANDIDATES = 300   # vähintään näin monta parasta FTS-osumaa järjestetään uudelleen pisteiden mukaan
+MATCH_PAGE_SIZE = 1000    # iter_matches: rivejä muistissa kerrallaan
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS postings (
+    id INTEGER PRIMARY KEY,
+    fingerprint TEXT NOT NULL UNIQUE,
+    title TEXT, location TEXT, company TEXT, url TEXT, description TEXT,
+    source TEXT, ingested_at REAL,
+    signature BLOB NOT NULL,
+    score REAL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS minhash_bands (
+    band INTEGER NOT NULL,
+    hash INTEGER NOT NULL,
+    posting_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS minhash_bands_lookup ON minhash_bands (band, hash);
+CREATE VIRTUAL TABLE IF NOT EXISTS postings_fts USING fts5(
+    title, location, description, content='postings', content_rowid='id', prefix='3'
+);
+"""
+
+_TAG = re.compile(r"<[^>]+>")
+_WORD = re.compile(r"\w+")
+
+
+def strip_html(text):
+    return " ".join(html.unescape(_TAG.sub(" ", text or "")).split())
+
+
+def _pick(row, fields):
+    for field in fields:
+        value = row.get(field)
+        if isinstance(value, dict): value = value.get("name", "")
+        if value: return str(value)
+    return ""
+
+
+def _location(row):
+    """JSON-LD:n jobLocation on sisäkkäinen rakenne; muuten tavallinen kenttä."""
+    place = row.get("jobLocation")
+    if isinstance(place, list): place = place[0] if place else None
+    if isinstance(place, dict):
+        address = place.get("address") or {}
+        if isinstance(address, dict): return ", ".join(str(address[k]) for k in ("addressLocality", "addressRegion") if address.get(k))
+    return _pick(row, LOCATION_FIELDS)
+
+
+def normalize_posting(row, source=""):
+    """Yhtenäinen ilmoitus kentistä, joita CSV-, JSON- ja HTML-viennit käyttävät."""
+    return {
+        "title": strip_html(_pick(row, TITLE_FIELDS) or row.get("name", "")),
+        "location": strip_html(_location(row)),
+        "company": strip_html(_pick(row, COMPANY_FIELDS)),
+        "url": _pick(row, URL_FIELDS),
+        "description": strip_html(_pick(row, DESCRIPTION_FIELDS)),
+        "source": source,
+    }
+
+
+# --- SISÄÄNLUKU ---
+
+class _JsonLdParser(HTMLParser):
+    """Poimii <script type="application/ld+json"> -lohkot ja sivun otsikon."""
+
+    def __init__(self):
+        super().__init__()
+        self.blocks, self.title, self._in_ld, self._in_title, self._buf = [], "", False, False, []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "script" and dict(attrs).get("type") == "application/ld+json": self._in_ld, self._buf = True, []
+        elif tag == "title": self._in_title = True
+
+    def handle_endtag(self, tag):
+        if tag == "script" and self._in_ld:
+            self._in_ld = False
+            self.blocks.append("".join(self._buf))
+        elif tag == "title": self._in_title = False
+
+    def handle_data(self, data):
+        if self._in_ld: self._buf.append(data)
+        elif self._in_title: self.title += data
+
+
+def _job_postings(node):
+    """JobPosting-oliot JSON-LD-rakenteesta (myös @graph- ja listamuodoista)."""
+    if isinstance(node, list):
+        for child in node: yield from _job_postings(child)
+    elif isinstance(node, dict):
+        kind = node.get("@type")
+        if kind == "JobPosting" or (isinstance(kind, list) and "JobPosting" in kind): yield node
+        elif "@graph" in node: yield from _job_postings(node["@graph"])
+
+
+def read_html_snapshot(path):
+    """Tallennettu ilmoitussivu: JSON-LD JobPosting, tai varalla sivun otsikko ja teksti."""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        page = f.read()
+    parser = _JsonLdParser()
+    parser.feed(page)
+    found = False
+    for block in parser.blocks:
+        try:
+            data = json.loads(block)
+        except ValueError:
+            continue
+        for posting in _job_postings(data):
+            found = True
+            yield posting
+    if not found:
+        body = re.sub(r"(?is)<(script|style)[^>]*>.*?</\1>", " ", page)
+        yield {"title": parser.title.strip(), "description": strip_html(body)}
+
+
+def iter_postings(path):
+    """Ilmoitukset tiedostosta rivi kerrallaan: CSV, JSON-lines, JSON-taulukko tai HTML-sivu."""
+    lower = path.lower()
+    if lower.endswith((".html", ".htm")):
+        yield from read_html_snapshot(path)
+        return
+    # CSV, JSON-lines ja JSON-taulukko tunnistetaan samoin kuin batch_score-komennossa
+    yield from read_postings(path)
+
+
+# --- MINHASH ---
+
+def shingle_hashes(text, size=SHINGLE_SIZE):
+    """Sanakolmikkojen (shingle) 32-bittiset tiivisteet: sanat tiivistetään kerran, kolmikot
+    yhdistetään vektorisoidusti liukuvana ikkunana."""
+    words = _WORD.findall(text.lower())
+    if not words: return np.zeros(0, dtype=np.uint64)
+    word_hashes = np.fromiter((zlib.crc32(w.encode()) for w in words), dtype=np.uint64, count=len(words))
+    size = min(size, len(words))
+    count = len(words) - size + 1
+    combined = word_hashes[:count].copy()
+    for k in range(1, size): combined = (combined * np.uint64(1000003) + word_hashes[k:k + count]) & np.uint64(0xFFFFFFFF)
+    return np.unique(combined)
+
+
+def minhash(hashes):
+    """MinHash-allekirjoitus (NUM_PERM x uint32) yhdellä numpy-laskulla kaikille permutaatioille."""
+    if not len(hashes): return np.zeros(NUM_PERM, dtype=np.uint32)
+    permuted = (np.outer(_PERM_A, hashes) % _PRIME + _PERM_B[:, None]) % _PRIME
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def band_hashes(signature):
+    """LSH: jokaisen kaistan rivit yhdeksi 63-bittiseksi avaimeksi (SQLite INTEGER)."""
+    rows = signature.reshape(BANDS, ROWS)
+    return [int.from_bytes(hashlib.blake2b(band.tobytes(), digest_size=8).digest(), "little") >> 1 for band in rows]
+
+
+def similarity(sig_a, sig_b):
+    return float(np.mean(sig_a == sig_b))
+
+
+def scoring_hash():
+    """Pisteytyksen avainsanaryhmien tiiviste: jos ryhmät muuttuvat, tallennetut pisteet lasketaan uudelleen."""
+    return hashlib.sha256(json.dumps(get_keyword_matcher().groups, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def fingerprint(posting):
+    text = " ".join(_WORD.findall(f"{posting['title']} {posting['company']} {posting['description']}".lower()))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+# --- VARASTO ---
+
+class PostingStore:
+    """Ilmoitukset SQLite-kannassa: FTS5-käänteishakemisto otsikolle, sijainnille ja kuvaukselle,
+    MinHash/LSH-kaistat lähes-duplikaattien tunnistukseen."""
+
+    def __init__(self, path=POSTINGS_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self.rescore()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+
+    def rescore(self, force=False):
+        """Laskee tallennetut pisteet uudelleen, jos pisteytyksen avainsanat ovat muuttuneet.
+
+        Pisteet lasketaan sisäänluvussa, joten haku vain järjestää valmiit luvut. Palauttaa
+        uudelleen pisteytettyjen ilmoitusten määrän.
+        """
+        current = scoring_hash()
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'scoring'").fetchone()
+            if row and row[0] == current and not force: return 0
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute("SELECT id, title, location, description FROM postings").fetchall()
+                self._conn.executemany("UPDATE postings SET score = ? WHERE id = ?", [(score_breakdown(t or "", l or "", d or "")[0], i) for i, t, l, d in rows])
+                self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('scoring', ?)", (current,))
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return len(rows)
+
+    def _near_duplicate(self, signature, bands):
+        """Onko kannassa (myös saman erän aiemmat rivit, sama transaktio) riittävän samankaltainen ilmoitus?
+
+        LSH-kaistat rajaavat vertailun muutamaan ehdokkaaseen koko kannan sijaan."""
+        candidates = set()
+        for band, value in enumerate(bands):
+            candidates.update(r[0] for r in self._conn.execute("SELECT posting_id FROM minhash_bands WHERE band = ? AND hash = ?", (band, value)))
+        for posting_id in candidates:
+            row = self._conn.execute("SELECT signature FROM postings WHERE id = ?", (posting_id,)).fetchone()
+            if similarity(signature, np.frombuffer(row[0], dtype=np.uint32)) >= DUPLICATE_THRESHOLD: return True
+        return False
+
+    def ingest(self, rows, source="", batch_size=BATCH_SIZE, progress=None):
+        """Lukee ilmoitukset virtana erissä (yksi transaktio per erä). Palauttaa tilaston."""
+        stats = {"read": 0, "added": 0, "exact_duplicates": 0, "near_duplicates": 0, "empty": 0, "seconds": 0.0}
+        started = time.perf_counter()
+        batch = []
+        for row in rows:
+            stats["read"] += 1
+            batch.append(normalize_posting(row, source))
+            if len(batch) >= batch_size:
+                self._ingest_batch(batch, stats)
+                batch = []
+                if progress: progress(stats)
+        if batch: self._ingest_batch(batch, stats)
+        stats["seconds"] = time.perf_counter() - started
+        if progress: progress(stats)
+        return stats
+
+    def _ingest_batch(self, batch, stats):
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                next_id = self._conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM postings").fetchone()[0]
+                for posting in batch:
+                    if not (posting["title"] or posting["description"]):
+                        stats["empty"] += 1
+                        continue
+                    fp = fingerprint(posting)
+                    if self._conn.execute("SELECT 1 FROM postings WHERE fingerprint = ?", (fp,)).fetchone():
+                        stats["exact_duplicates"] += 1
+                        continue
+                    signature = minhash(shingle_hashes(f"{posting['title']} {posting['company']} {posting['description']}"))
+                    bands = band_hashes(signature)
+                    if self._near_duplicate(signature, bands):
+                        stats["near_duplicates"] += 1
+                        continue
+                    posting_id = next_id
+                    next_id += 1
+                    score = score_breakdown(posting["title"], posting["location"], posting["description"])[0]
+                    self._conn.execute(
+                        "INSERT INTO postings (id, fingerprint, title, location, company, url, description, source, ingested_at, signature, score) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (posting_id, fp, posting["title"], posting["location"], posting["company"], posting["url"], posting["description"], posting["source"], now, signature.tobytes(), score),
+                    )
+                    self._conn.execute("INSERT INTO postings_fts (rowid, title, location, description) VALUES (?, ?, ?, ?)", (posting_id, posting["title"], posting["location"], posting["description"]))
+                    self._conn.executemany("INSERT INTO minhash_bands (band, hash, posting_id) VALUES (?, ?, ?)", [(b, h, posting_id) for b, h in enumerate(bands)])
+                    stats["added"] += 1
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def ingest_file(self, path, progress=None):
+        return self.ingest(iter_postings(path), source=path, progress=progress)
+
+    @staticmethod
+    def fts_query(text):
+        """Käyttäjän hakusanat FTS5-kyselyksi: jokainen sana lainausmerkeissä ja etuliitehakuna (AND)."""
+        words = _WORD.findall(text)
+        return " ".join(f'"{w}"*' for w in words)
+
+    def search(self, text, limit=50, rerank=True):
+        """Kokotekstihaku (bm25); rerank järjestää max(limit, SEARCH_CANDIDATES) parasta osumaa pisteiden mukaan.
+
+        Pisteet (score_breakdown / calculate_score) on laskettu jo sisäänluvussa, joten uudelleenjärjestys
+        on pelkkä lajittelu. Osuvuuden avainsanat lasketaan vain palautettaville riveille.
+        """
+        query = self.fts_query(text)
+        if not query: return []
+        with self._lock:
+            cur = self._conn.execute(
+                # Järjestys ja rajaus pelkässä FTS-taulussa; vain rajatut rivit haetaan postings-taulusta
+                "SELECT p.id, p.title, p.location, p.company, p.url, p.description, p.score, m.rank "
+                "FROM (SELECT rowid, rank FROM postings_fts WHERE postings_fts MATCH ? ORDER BY rank LIMIT ?) m "
+                "JOIN postings p ON p.id = m.rowid ORDER BY m.rank",
+                (query, max(limit, SEARCH_CANDIDATES) if rerank else limit),
+            )
+            columns = [c[0] for c in cur.description]
+            results = [dict(zip(columns, row)) for row in cur.fetchall()]
+        if rerank:
+            # Pisteet ensin, tasapisteissä tekstihaun osuvuus (pienempi bm25 = parempi)
+            results.sort(key=lambda r: (-r["score"], r["rank"]))
+            results = results[:limit]
+            for r in results: r["keywords"] = score_breakdown(r["title"], r["location"], r["description"])[1]
+        return results
+
+    def count_matches(self, text):
+        query = self.fts_query(text)
+        if not query: return 0
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM postings_fts WHERE postings_fts MATCH ?", (query,)).fetchone()[0]
+
+    def iter_matches(self, text, limit=None, page_size=MATCH_PAGE_SIZE):
+        """Kaikki osumat bm25-järjestyksessä sivu kerrallaan, ilman uudelleenjärjestystä ja avainsanoja (massaviennit).
+
+        Muistissa on yksi sivu kerrallaan, eikä lukkoa pidetä sivujen välillä.
+        """
+        query = self.fts_query(text)
+        if not query: return
+        offset = 0
+        while limit is None or offset < limit:
+            size = page_size if limit is None else min(page_size, limit - offset)
+            with self._lock:
+                cur = self._conn.execute(
+                    "SELECT p.id, p.title, p.location, p.company, p.url, p.description, p.score "
+                    "FROM (SELECT rowid, rank FROM postings_fts WHERE postings_fts MATCH ? ORDER BY rank, rowid LIMIT ? OFFSET ?) m "
+                    "JOIN postings p ON p.id = m.rowid ORDER BY m.rank, m.rowid",
+                    (query, size, offset),
+                )
+                columns = [c[0] for c in cur.description]
+                page = [dict(zip(columns, row)) for row in cur.fetchall()]
+            yield from page
+            if len(page) < size: return
+            offset += size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Työpaikkailmoitusten paikallinen varasto.")
+    parser.add_argument("--db", default=POSTINGS_DB)
+    sub = parser.add_subparsers(dest="command", required=True)
+    ingest = sub.add_parser("ingest", help="Lue ilmoitukset tiedostoista (.csv, .jsonl, .json, .html)")
+    ingest.add_argument("files", nargs="+")
+    search = sub.add_parser("search", help="Hae ilmoituksia")
+    search.add_argument("query")
+    search.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    store = PostingStore(args.db)
+    if args.command == "ingest":
+        for path in args.files:
+            s = store.ingest_file(path)
+            rate = s["read"] / s["seconds"] if s["seconds"] else 0.0
+            print(f"{path}: luettu {s['read']}, lisätty {s['added']}, duplikaatit {s['exact_duplicates']} + {s['near_duplicates']} lähes samaa, {s['seconds']:.2f} s ({rate:,.0f}/s)", file=sys.stderr)
+        print(f"Varastossa {len(store)} ilmoitusta", file=sys.stderr)
+    else:
+        started = time.perf_counter()
+        results = store.search(args.query, limit=args.limit)
+        for r in results: print(f"{r['score']:>5}  {r['title']} – {r['company']} ({r['location']})")
+        print(f"{len(results)} osumaa {1000 * (time.perf_counter() - started):.1f} ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+import bisect
+
+# ---------------------------------------------------------
+# SUOSITUSINDEKSI (järjestetty, päivittyy muutos kerrallaan)
+# ---------------------------------------------------------
+
+
+def candidate_key(name):
+    """Sama normalisointi kuin Tracker.find_duplicate: kirjainkoko ja reunavälit eivät ratkaise."""
+    return name.strip().lower()
+
+
+class RecommendationIndex:
+    """Ehdokkaat pisteiden mukaan järjestetyssä listassa, josta piilotetut puuttuvat.
+
+    Piilotettu = jo seurannassa tai ohitettu. Lisäys, ohitus ja seurantaan otto etsivät kohdan
+    puolitushaulla (O(log n)) eivätkä järjestä listaa uudelleen; top(k) on pelkkä viipale.
+    Tasapisteissä säilyy ehdokaslistan alkuperäinen järjestys.
+    """
+
+    def __init__(self, candidates, tracked=(), dismissed=()):
+        self._candidates = {}
+        self._entries = {}
+        self.tracked = {candidate_key(n) for n in tracked}
+        self.dismissed = {candidate_key(n) for n in dismissed}
+        for order, candidate in enumerate(candidates):
+            key = candidate_key(candidate["name"])
+            if key in self._candidates: continue
+            self._candidates[key] = candidate
+            self._entries[key] = (-candidate["score"], order, key)
+        self._ranked = sorted(entry for key, entry in self._entries.items() if self._visible(key))
+
+    def _visible(self, key):
+        return key not in self.tracked and key not in self.dismissed
+
+    def _position(self, entry):
+        i = bisect.bisect_left(self._ranked, entry)
+        return i if i < len(self._ranked) and self._ranked[i] == entry else None
+
+    def _hide(self, key):
+        entry = self._entries.get(key)
+        i = self._position(entry) if entry else None
+        if i is not None: del self._ranked[i]
+
+    def _show(self, key):
+        entry = self._entries.get(key)
+        if entry and self._visible(key) and self._position(entry) is None: bisect.insort(self._ranked, entry)
+
+    def add_candidate(self, candidate):
+        """Lisää uuden ehdokkaan tai päivittää olemassa olevan pisteet."""
+        key = candidate_key(candidate["name"])
+        order = self._entries[key][1] if key in self._entries else len(self._entries)
+        self._hide(key)
+        self._candidates[key] = candidate
+        self._entries[key] = (-candidate["score"], order, key)
+        self._show(key)
+
+    def dismiss(self, name):
+        key = candidate_key(name)
+        self._hide(key)
+        self.dismissed.add(key)
+
+    def undismiss(self, name):
+        key = candidate_key(name)
+        self.dismissed.discard(key)
+        self._show(key)
+
+    def track(self, name):
+        key = candidate_key(name)
+        self._hide(key)
+        self.tracked.add(key)
+
+    def untrack(self, name):
+        key = candidate_key(name)
+        self.tracked.discard(key)
+        self._show(key)
+
+    def sync_tracked(self, names):
+        """Tuo seurantalistan tilan indeksiin; vain muuttuneet nimet käsitellään."""
+        current = {candidate_key(n) for n in names}
+        for key in self.tracked - current: self.untrack(key)
+        for key in current - self.tracked: self.track(key)
+
+    def top(self, k=None):
+        """k parasta näkyvää ehdokasta (kaikki, jos k=None)."""
+        return [self._candidates[key] for _, _, key in self._ranked[:k]]
+
+    def __len__(self):
+        return len(self._ranked)
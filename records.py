@@ -0,0 +1,172 @@
+import uuid
+import datetime
+from collections import defaultdict
+
+# ---------------------------------------------------------
+# HAKEMUSTIETUE & INDEKSOITU SEURANTALISTA
+# ---------------------------------------------------------
+
+DATE_FIELDS = ("date", "interview_date")
+
+
+def new_item_id():
+    return uuid.uuid4().hex
+
+
+def parse_date(value, reference=None):
+    """Päivämäärä date-oliona: ISO ("2026-10-18"), "dd.mm.yyyy" tai vanha vuodeton "dd.mm.".
+
+    Vuodettomalle päivälle valitaan viimeisin vuosi, jolla päivä ei ole referenssipäivän
+    (oletus tänään) jälkeen – hakemus ei voi olla tulevaisuudessa. Tyhjä tai tuntematon -> None.
+    """
+    if value is None or isinstance(value, datetime.date):
+        return value.date() if isinstance(value, datetime.datetime) else value
+    text = str(value).strip()
+    if not text: return None
+    try:
+        return datetime.date.fromisoformat(text[:10])
+    except ValueError:
+        pass
+    parts = [p for p in text.split(".") if p]
+    if len(parts) not in (2, 3) or not all(p.isdigit() for p in parts): return None
+    day, month = int(parts[0]), int(parts[1])
+    try:
+        if len(parts) == 3: return datetime.date(int(parts[2]), month, day)
+        reference = reference or datetime.date.today()
+        parsed = datetime.date(reference.year, month, day)
+        return parsed if parsed <= reference else parsed.replace(year=reference.year - 1)
+    except ValueError:
+        # 29.2. edellisenä vuonna tai muuten mahdoton päivä
+        return None
+
+
+def format_date(value):
+    """Käyttöliittymän esitysmuoto (dd.mm.yyyy)."""
+    return value.strftime("%d.%m.%Y") if value else ""
+
+
+class ApplicationRecord:
+    """Yksi seurattava hakemus. Tukee myös dict-tyylistä lukua (item['company']).
+
+    date ja interview_date ovat date-olioita (tai None); tallennusmuodossa ISO-merkkijonoja.
+    version on tallennetun rivin versio (0 = ei vielä tallennettu), ks. storage.TrackerStore.
+    """
+
+    __slots__ = ("id", "company", "role", "status", "date", "contact_name", "contact_phone", "contact_email", "interview_date", "interview_time", "version")
+
+    def __init__(self, company, role="", status="Odottaa", date=None, contact_name="", contact_phone="", contact_email="", interview_date=None, interview_time="", id=None, version=0):
+        self.id = id or new_item_id()
+        self.company = company
+        self.role = role
+        self.status = status
+        self.date = parse_date(date)
+        self.contact_name = contact_name
+        self.contact_phone = contact_phone
+        self.contact_email = contact_email
+        self.interview_date = parse_date(interview_date)
+        self.interview_time = interview_time
+        self.version = version
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{k: data[k] for k in cls.__slots__ if data.get(k) is not None})
+
+    @staticmethod
+    def needs_migration(data):
+        """True, jos tallennettu päivämäärä on vanhassa vuodettomassa "dd.mm."-muodossa."""
+        return any(data.get(k) and parse_date(data[k]) is not None and not str(data[k])[:4].isdigit() for k in DATE_FIELDS)
+
+    def to_dict(self):
+        data = {k: getattr(self, k) for k in self.__slots__}
+        for key in DATE_FIELDS: data[key] = data[key].isoformat() if data[key] else ""
+        return data
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        # Yritys (indeksoitu) päivitetään Tracker.update()-metodilla
+        setattr(self, key, value)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def __repr__(self):
+        return f"ApplicationRecord({self.company!r}, {self.role!r}, {self.status!r}, id={self.id!r})"
+
+
+class Tracker:
+    """Hakemukset id:n mukaan (lisäysjärjestyksessä) sekä yritysindeksi duplikaattitarkistusta varten.
+
+    Tila- ja kuukausikoosteet laskee pipeline_analytics.PipelineAnalytics. version kasvaa jokaisessa
+    add/remove/update-kutsussa; johdetut välimuistit vertaavat sitä.
+    """
+
+    def __init__(self, records=()):
+        self.version = 0
+        self._records = {}
+        self._by_company = defaultdict(set)
+        for record in records: self.add(record)
+
+    @classmethod
+    def from_dicts(cls, items):
+        return cls(ApplicationRecord.from_dict(item) for item in items)
+
+    def _index(self, record):
+        self._by_company[record.company.strip().lower()].add(record.id)
+
+    def _unindex(self, record):
+        key = record.company.strip().lower()
+        ids = self._by_company.get(key)
+        if ids is None: return
+        ids.discard(record.id)
+        if not ids: del self._by_company[key]
+
+    def add(self, record):
+        self.version += 1
+        self._records[record.id] = record
+        self._index(record)
+        return record
+
+    def remove(self, record_id):
+        record = self._records.pop(record_id, None)
+        if record is not None:
+            self.version += 1
+            self._unindex(record)
+        return record
+
+    def update(self, record_id, **changes):
+        """Muuttaa kenttiä ja pitää yritysindeksin ajan tasalla."""
+        record = self._records[record_id]
+        reindex = "company" in changes
+        if reindex: self._unindex(record)
+        for key, value in changes.items(): setattr(record, key, parse_date(value) if key in DATE_FIELDS else value)
+        if reindex: self._index(record)
+        self.version += 1
+        return record
+
+    def replace(self, record):
+        """Korvaa saman id:n tietueen (järjestys säilyy) tai lisää uuden loppuun."""
+        if record.id not in self._records: return self.add(record)
+        changes = {k: getattr(record, k) for k in ApplicationRecord.__slots__ if k != "id"}
+        return self.update(record.id, **changes)
+
+    def get(self, record_id):
+        return self._records.get(record_id)
+
+    def __iter__(self):
+        return iter(self._records.values())
+
+    def __len__(self):
+        return len(self._records)
+
+    def __bool__(self):
+        return bool(self._records)
+
+    def find_duplicate(self, company, role):
+        """Palauttaa saman yrityksen ja roolin hakemuksen, jos sellainen on jo seurannassa."""
+        for record_id in self._by_company.get(company.strip().lower(), ()):
+            record = self._records[record_id]
+            if record.role.strip().lower() == role.strip().lower(): return record
+        return None
+
@@ -0,0 +1,84 @@
+import streamlit as st
+
+from storage import TrackerStore, TRACKER_DB
+from link_health import LinkHealthStore, LinkHealthRefresher
+from scheduler import RefreshScheduler
+from datasets import ALL_SITE_URLS, recommendation_candidates, image_urls
+
+# ---------------------------------------------------------
+# PROSESSIN YHTEISET RESURSSIT (st.cache_resource)
+# ---------------------------------------------------------
+# Määritellään tuotavassa moduulissa: main.py ajetaan joka kerta alusta, jolloin jokainen
+# @st.cache_resource-koriste laskisi funktioavaimensa (lähdekoodin tokenisointi) uudelleen.
+# Raskaat riippuvuudet (pandas, numpy, prosessipooli) tuodaan vasta, kun resurssia tarvitaan.
+
+STORAGE_FILE = "local_storage.json"
+SHEET_ID = "12_hQ54nccgljOCbDGPOvFzYBQ6KhQkdk1GDdpaNTGyM"
+
+
+@st.cache_resource
+def get_tracker_store():
+    """SQLite-tallennus; vanha local_storage.json ja vuodettomat päivämäärät siirretään ensimmäisellä käynnistyksellä."""
+    store = TrackerStore(TRACKER_DB)
+    store.migrate_json(STORAGE_FILE)
+    store.migrate_dates()
+    return store
+
+
+@st.cache_resource
+def get_visitor_log():
+    """Paikallinen kopio vierailijalokista; Sheetistä haetaan vain uudet rivit."""
+    from visitors import VisitorLog, sheet_query_url
+    return VisitorLog(lambda offset: sheet_query_url(SHEET_ID, offset))
+
+
+@st.cache_resource
+def get_link_refresher():
+    """Pysyvä linkkivälimuisti ja sen ainoa taustapäivittäjä (yksi per prosessi). Kaikki sivuilla
+    näytettävät linkit rekisteröidään tässä, joten sivun piirto vain lukee taulua."""
+    store = LinkHealthStore()
+    store.register(ALL_SITE_URLS)
+    return LinkHealthRefresher(store).start()
+
+
+@st.cache_resource
+def get_link_health():
+    return get_link_refresher().store
+
+
+@st.cache_resource
+def get_asset_store():
+    """Linkit-välilehden faviconit paikallisesti; taustasäie hakee puuttuvat ja tarkistaa vanhat ehdollisesti."""
+    from assets import AssetStore, AssetRefresher
+    store = AssetStore()
+    urls = image_urls()
+    store.retain(urls)
+    store.register(urls)
+    AssetRefresher(store).start()
+    return store
+
+
+@st.cache_resource
+def get_refresh_scheduler():
+    """Ajastettu esilaskenta: linkkien terveys ja suositukset.
+    Vierailijaloki ei tarvitse omaa ajoa: Portfolio synkronoi sen itse (ehdollinen haku, vain uudet rivit)."""
+    refresher = get_link_refresher()
+    def refresh_links():
+        refresher.store.expire_all()
+        return {"checked": refresher.refresh_all()}
+    jobs = {"link_health": refresh_links, "recommendations": recommendation_candidates}
+    return RefreshScheduler(jobs).start()
+
+
+@st.cache_resource
+def get_posting_store():
+    """Paikallinen ilmoitusvarasto (postings.py); haku toimii ilman verkkoa."""
+    from postings import PostingStore, POSTINGS_DB
+    return PostingStore(POSTINGS_DB)
+
+
+@st.cache_resource
+def get_analysis_pool():
+    """Prosessipooli raskaalle analyysille (analysis_pool.py); työntekijät käynnistyvät ensimmäisestä työstä."""
+    from analysis_pool import AnalysisPool
+    return AnalysisPool()
@@ -0,0 +1,133 @@
+import os
+import json
+import time
+import fcntl
+import datetime
+import tempfile
+import threading
+
+# ---------------------------------------------------------
+# AJASTETTU PÄIVITYS (taustasäie + tiedostolukko)
+# ---------------------------------------------------------
+
+STATE_DIR = ".hub_cache"
+SUCCESS_MARKER = os.path.join(STATE_DIR, "update_success.json")
+LOCK_FILE = os.path.join(STATE_DIR, "refresh.lock")
+REFRESH_HOURS = (8, 11)     # arkisin klo 8 ja 11
+CHECK_INTERVAL = 60
+RETRY_AFTER = 15 * 60       # epäonnistunutta päivitystä yritetään uudelleen vasta tämän jälkeen
+
+
+def atomic_write_json(path, data):
+    """Kirjoittaa väliaikaistiedostoon ja vaihtaa sen paikalleen, joten lukija ei näe puolikasta tiedostoa."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path): os.remove(tmp_path)
+        raise
+
+
+def read_json(path, default=None):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def snapshot_path(name):
+    return os.path.join(STATE_DIR, f"{name}.json")
+
+
+def read_snapshot(name):
+    """Palauttaa esilasketun datan (tai None, jos päivitystä ei ole vielä ajettu)."""
+    snapshot = read_json(snapshot_path(name))
+    return snapshot["data"] if snapshot else None
+
+
+def last_success():
+    marker = read_json(SUCCESS_MARKER)
+    if not marker: return None
+    return datetime.datetime.fromisoformat(marker["finished_at"])
+
+
+def latest_slot(now=None):
+    """Viimeisin ajastettu päivitysaika (arkipäivä, REFRESH_HOURS), joka on jo mennyt."""
+    now = now or datetime.datetime.now()
+    for days_back in range(8):
+        day = now.date() - datetime.timedelta(days=days_back)
+        if day.weekday() > 4: continue
+        for hour in sorted(REFRESH_HOURS, reverse=True):
+            slot = datetime.datetime.combine(day, datetime.time(hour))
+            if slot <= now: return slot
+    return None
+
+
+def is_due(now=None):
+    slot = latest_slot(now)
+    done = last_success()
+    return slot is not None and (done is None or done < slot)
+
+
+class RefreshScheduler:
+    """Ajaa päivitystyöt ajastetusti taustasäikeessä. Tiedostolukko varmistaa, että
+    useasta prosessista vain yksi ajaa päivityksen kerrallaan."""
+
+    def __init__(self, jobs, interval=CHECK_INTERVAL):
+        self.jobs = jobs
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        self._last_attempt = None
+
+    def run_once(self, force=False):
+        """Ajaa kaikki työt, jos päivitys on erääntynyt. Palauttaa False, jos toinen prosessi ajaa jo."""
+        os.makedirs(STATE_DIR, exist_ok=True)
+        with open(LOCK_FILE, "w") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False
+            try:
+                # Tarkistetaan uudelleen lukon sisällä: toinen prosessi on voinut juuri valmistua
+                if not force and not is_due(): return True
+                started = time.perf_counter()
+                results = {}
+                for name, job in self.jobs.items():
+                    try:
+                        atomic_write_json(snapshot_path(name), {"updated_at": datetime.datetime.now().isoformat(), "data": job()})
+                        results[name] = "ok"
+                    except Exception as e:
+                        print(f"Päivitys epäonnistui ({name}): {e}")
+                        results[name] = f"virhe: {e}"
+                if all(r == "ok" for r in results.values()):
+                    atomic_write_json(SUCCESS_MARKER, {"finished_at": datetime.datetime.now().isoformat(), "seconds": round(time.perf_counter() - started, 2), "jobs": results})
+                return True
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _run(self):
+        while not self._stop.is_set():
+            retry_ok = self._last_attempt is None or time.monotonic() - self._last_attempt > RETRY_AFTER
+            if retry_ok and is_due():
+                self._last_attempt = time.monotonic()
+                try:
+                    self.run_once()
+                except Exception as e:
+                    print(f"Päivitys epäonnistui: {e}")
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="hub-refresh-scheduler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,138 @@
+import json
+import hashlib
+import threading
+from functools import lru_cache
+from collections import OrderedDict
+
+from keyword_matcher import KeywordMatcher
+from instrumentation import cache_event
+
+# ---------------------------------------------------------
+# PISTEYTYS & AVAINSANA-ANALYYSI (ilman Streamlitiä)
+# ---------------------------------------------------------
+
+ANALYSIS_KEYWORDS = {
+    "Luova": ["photoshop", "illustrator", "indesign", "figma", "video", "editointi", "visuaalinen", "brändi", "sommittelu", "creative", "art director"],
+    "Tekninen/AI": ["ai", "tekoäly", "chatgpt", "midjourney", "python", "html", "css", "wordpress", "promp", "genai"],
+    "Soft Skills": ["tiimityö", "oma-aloitteisuus", "paineensieto", "kommunikointi", "projektinhallinta", "analyyttinen", "koordinoi"]
+}
+
+SENIOR_KEYWORDS = ["strateg", "lead", "head", "päällikkö"]
+TECH_KEYWORDS = ["ai", "genai", "technolog", "chatgpt", "midjourney"]
+
+UNI_KEYWORDS = [
+    "laskennallinen luovuus",
+    "computational creativity",
+    "human-computer interaction",
+    "digital humanities",
+    "visual culture",
+    "mikrotutkinto",
+    "tekoäly viestinnässä"
+]
+
+AMK_KEYWORDS = [
+    "palvelumuotoilu",
+    "erikoistumiskoulutus",
+    "osaajakoulutus",
+    "mediatuotanto",
+    "visuaalinen suunnittelu",
+    "XR",
+    "virtuaalituotanto"
+]
+
+TARGET_ROLES = [
+    "Graafinen suunnittelija", "Sisällöntuottaja", "Visuaalinen suunnittelija",
+    "Projektipäällikkö (luovat sisällöt)", "Viestintäsuunnittelija", "Markkinointisuunnittelija",
+    "UI/UX-suunnittelija", "Creative Producer", "Content Manager", "Art Director Assistant",
+    "Junior Designer", "Video Editor"
+]
+
+SEARCH_KEYWORDS = [
+    "graafinen suunnittelija", "sisällöntuottaja", "visuaalinen suunnittelija",
+    "projektipäällikkö", "viestintäsuunnittelija", "markkinointisuunnittelija",
+    "UI designer", "UX designer", "creative producer", "content manager", 
+    "mainonta", "luova ala", "graafinen suunnittelu", "digitaalinen viestintä",
+    "ICT"
+]
+
+@lru_cache(maxsize=None)
+def get_keyword_matcher():
+    """Kaikki avainsanaryhmät yhdeksi regexiksi; käännetään kerran per prosessi."""
+    groups = {"role": TARGET_ROLES, "search": SEARCH_KEYWORDS, "senior": SENIOR_KEYWORDS, "tech": TECH_KEYWORDS + UNI_KEYWORDS + AMK_KEYWORDS}
+    groups.update(ANALYSIS_KEYWORDS)
+    return KeywordMatcher(groups)
+
+ANALYSIS_CACHE_SIZE = 512
+_analysis_cache = OrderedDict()
+_analysis_lock = threading.Lock()
+
+@lru_cache(maxsize=None)
+def _analysis_config_hash():
+    """Avainsanakonfiguraation tiiviste; muuttunut konfiguraatio ei käytä vanhoja tuloksia."""
+    return hashlib.sha256(json.dumps(ANALYSIS_KEYWORDS, sort_keys=True).encode("utf-8")).hexdigest()
+
+def _rank_missing(text, found):
+    """Järjestää puuttuvat avainsanat relevanssin mukaan.
+
+    Ensin sanat, joiden vartalo (5 ensimmäistä kirjainta) esiintyy ilmoituksessa, sitten
+    kategoriat, joita ilmoitus jo painottaa (löydettyjen osuus). Tasatilanteessa listan järjestys.
+    """
+    lowered = text.lower()
+    ranked = []
+    for category, words in ANALYSIS_KEYWORDS.items():
+        coverage = len(found.get(category, ())) / len(words)
+        for order, word in enumerate(words):
+            if word in found.get(category, ()): continue
+            stem_hit = len(word) > 5 and word[:5] in lowered
+            ranked.append((-(2.0 * stem_hit + coverage), order, word))
+    ranked.sort()
+    return [word for _, _, word in ranked]
+
+def _analyse(text):
+    found = get_keyword_matcher().terms_by_group(text)
+    found_stats = {category: len(found.get(category, ())) for category in ANALYSIS_KEYWORDS}
+    final_score = min(sum(found_stats.values()), 10)
+    return found_stats, final_score, _rank_missing(text, found)
+
+def local_text_analysis(text):
+    """Analysoi tekstin sisäisellä logiikalla.
+
+    Deterministinen: sama teksti ja konfiguraatio antavat aina saman tuloksen, joten
+    tulokset muistetaan sisällön tiivisteen mukaan (LRU, ANALYSIS_CACHE_SIZE kpl).
+    """
+    key = hashlib.sha256(f"{_analysis_config_hash()}\0{text}".encode("utf-8")).hexdigest()
+    with _analysis_lock:
+        result = _analysis_cache.get(key)
+        if result is not None: _analysis_cache.move_to_end(key)
+    cache_event("local_text_analysis", result is not None)
+    if result is None:
+        result = _analyse(text)
+        with _analysis_lock:
+            _analysis_cache[key] = result
+            if len(_analysis_cache) > ANALYSIS_CACHE_SIZE: _analysis_cache.popitem(last=False)
+    found_stats, final_score, missing_words = result
+    return dict(found_stats), final_score, list(missing_words)
+
+def score_breakdown(title, location, description=""):
+    """Pisteet sekä löydetyt avainsanat ryhmittäin (otsikko ja kuvaus yhdessä)."""
+    score = 1.0
+    matcher = get_keyword_matcher()
+    title_hits = matcher.terms_by_group(title)
+    desc_hits = matcher.terms_by_group(description) if description else {}
+    location = location.lower()
+    
+    score += min(len(title_hits.get("role", ())) * 0.5, 2.0)
+    
+    if title_hits.get("senior"): score += 1.0
+    
+    if title_hits.get("tech") or desc_hits.get("tech"):
+        score += 1.0
+
+    if 'helsinki' in location or 'espoo' in location: score += 1.0
+    elif 'remote' in location: score += 0.8
+    
+    hits = {group: sorted(set(title_hits.get(group, ())) | set(desc_hits.get(group, ()))) for group in set(title_hits) | set(desc_hits)}
+    return min(score, 5.0), hits
+
+def calculate_score(title, location, description=""):
+    return score_breakdown(title, location, description)[0]
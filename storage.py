@@ -0,0 +1,234 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from records import ApplicationRecord, new_item_id
+
+# ---------------------------------------------------------
+# HAKEMUSSEURANNAN TALLENNUS (SQLite, WAL, monta käyttäjää ja prosessia)
+# ---------------------------------------------------------
+
+TRACKER_DB = os.environ.get("HUB_TRACKER_DB", "tracker.db")
+DEFAULT_USER = "default"
+BUSY_TIMEOUT_MS = 5000
+CHANGE_LOG_KEEP = 10_000    # vanhemmat muutosrivit karsitaan; niin kauan jäljessä oleva istunto lataa kaiken
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS applications (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    user TEXT NOT NULL,
+    id TEXT NOT NULL,
+    deleted INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS dismissals (
+    user TEXT NOT NULL,
+    key TEXT NOT NULL,
+    dismissed_at REAL NOT NULL,
+    PRIMARY KEY (user, key)
+);
+"""
+# Vanhaan kantaan lisättävät sarakkeet (käyttäjän nimiavaruus ja rivin versio)
+COLUMNS = {"user": f"TEXT NOT NULL DEFAULT '{DEFAULT_USER}'", "version": "INTEGER NOT NULL DEFAULT 1"}
+INDEXES = """
+CREATE INDEX IF NOT EXISTS applications_user ON applications (user, seq);
+CREATE INDEX IF NOT EXISTS changes_user ON changes (user, seq);
+"""
+
+
+class ConflictError(Exception):
+    """Rivi on muuttunut (tai poistettu) sen jälkeen, kun se luettiin."""
+
+    def __init__(self, item_id, expected, current):
+        super().__init__(f"Hakemus {item_id} on muuttunut (odotettiin versiota {expected}, nyt {current})")
+        self.item_id = item_id
+        self.expected = expected
+        self.current = current
+
+
+def _encode(item):
+    return json.dumps({k: v for k, v in item.items() if k not in ("id", "version")}, ensure_ascii=False)
+
+
+def _decode(item_id, version, data):
+    item = json.loads(data)
+    item["id"] = item_id
+    item["version"] = version
+    return item
+
+
+class TrackerStore:
+    """Tallentaa hakemukset rivi kerrallaan käyttäjäkohtaisiin nimiavaruuksiin.
+
+    Jokaisella rivillä on versio: upsert/delete onnistuu vain, jos tallennettu versio on sama kuin
+    luettu (optimistinen lukitus), muuten nousee ConflictError. Jokainen muutos kirjataan
+    changes-tauluun, josta muut istunnot ja prosessit hakevat vain muuttuneet rivit (changes_since).
+    """
+
+    def __init__(self, path=TRACKER_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=BUSY_TIMEOUT_MS / 1000)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        with self._write() as conn:
+            for statement in SCHEMA.split(";"):
+                if statement.strip(): conn.execute(statement)
+            existing = {c[1] for c in conn.execute("PRAGMA table_info(applications)")}
+            for name, decl in COLUMNS.items():
+                if name not in existing: conn.execute(f"ALTER TABLE applications ADD COLUMN {name} {decl}")
+            for statement in INDEXES.split(";"):
+                if statement.strip(): conn.execute(statement)
+
+    @contextmanager
+    def _write(self):
+        """Kirjoitustransaktio: yksi säie kerrallaan, ja BEGIN IMMEDIATE varaa kannan heti,
+        joten toinen prosessi ei pääse lukemaan ja kirjoittamaan väliin."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _log(self, conn, user, item_id, deleted=False):
+        seq = conn.execute("INSERT INTO changes (user, id, deleted) VALUES (?, ?, ?)", (user, item_id, int(deleted))).lastrowid
+        if seq % 1000 == 0: conn.execute("DELETE FROM changes WHERE seq <= ?", (seq - CHANGE_LOG_KEEP,))
+
+    def load_all(self, user=DEFAULT_USER):
+        """Palauttaa käyttäjän hakemukset lisäysjärjestyksessä (dictit sisältävät id:n ja version)."""
+        with self._lock:
+            rows = self._conn.execute("SELECT id, version, data FROM applications WHERE user = ? ORDER BY seq", (user,)).fetchall()
+        return [_decode(*row) for row in rows]
+
+    def get(self, item_id, user=DEFAULT_USER):
+        with self._lock:
+            row = self._conn.execute("SELECT id, version, data FROM applications WHERE id = ? AND user = ?", (item_id, user)).fetchone()
+        return _decode(*row) if row else None
+
+    def upsert(self, item, user=DEFAULT_USER):
+        """Lisää tai päivittää yhden hakemuksen ja palauttaa uuden version.
+
+        item["version"] on luettu versio (0/puuttuu = uusi rivi). Jos rivi on sillä välin muuttunut
+        tai poistettu, nousee ConflictError eikä mitään kirjoiteta.
+        """
+        if not item.get("id"): item["id"] = new_item_id()
+        expected = item.get("version") or 0
+        with self._write() as conn:
+            row = conn.execute("SELECT version FROM applications WHERE id = ? AND user = ?", (item["id"], user)).fetchone()
+            current = row[0] if row else 0
+            if current != expected: raise ConflictError(item["id"], expected, current)
+            if row:
+                conn.execute("UPDATE applications SET data = ?, version = version + 1 WHERE id = ? AND user = ?", (_encode(item), item["id"], user))
+            else:
+                conn.execute("INSERT INTO applications (id, user, version, data) VALUES (?, ?, 1, ?)", (item["id"], user, _encode(item)))
+            self._log(conn, user, item["id"])
+        item["version"] = current + 1
+        return item["version"]
+
+    def delete(self, item_id, user=DEFAULT_USER, version=None):
+        """Poistaa hakemuksen; jos versio annetaan, vain jos rivi on yhä siinä versiossa."""
+        with self._write() as conn:
+            row = conn.execute("SELECT version FROM applications WHERE id = ? AND user = ?", (item_id, user)).fetchone()
+            if row is None: return False
+            if version is not None and row[0] != version: raise ConflictError(item_id, version, row[0])
+            conn.execute("DELETE FROM applications WHERE id = ? AND user = ?", (item_id, user))
+            self._log(conn, user, item_id, deleted=True)
+        return True
+
+    def replace_all(self, items, user=DEFAULT_USER):
+        """Korvaa käyttäjän koko sisällön yhdessä transaktiossa (vanhan save_local_data-rajapinnan tuki).
+
+        Ei tarkista versioita – viimeisin kirjoittaja voittaa, kuten ennenkin.
+        """
+        for item in items:
+            if not item.get("id"): item["id"] = new_item_id()
+        with self._write() as conn:
+            old = {r[0]: r[1] for r in conn.execute("SELECT id, version FROM applications WHERE user = ?", (user,))}
+            conn.execute("DELETE FROM applications WHERE user = ?", (user,))
+            for item in items:
+                item["version"] = old.get(item["id"], 0) + 1
+                conn.execute("INSERT INTO applications (id, user, version, data) VALUES (?, ?, ?, ?)", (item["id"], user, item["version"], _encode(item)))
+                self._log(conn, user, item["id"])
+            for item_id in old.keys() - {item["id"] for item in items}: self._log(conn, user, item_id, deleted=True)
+
+    def last_change(self, user=None):
+        """Viimeisimmän muutoksen järjestysnumero (koko kanta tai yksi käyttäjä; 0 = ei muutoksia)."""
+        with self._lock:
+            if user is None: return self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+            return self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM changes WHERE user = ?", (user,)).fetchone()[0]
+
+    def changes_since(self, seq, user=DEFAULT_USER):
+        """Muutokset järjestysnumeron seq jälkeen: (uusin seq, {id: dict tai None = poistettu}).
+
+        Jos välissä olevia muutoksia on jo karsittu, palauttaa (uusin seq, None): lataa kaikki uudelleen.
+        """
+        with self._lock:
+            latest, oldest = self._conn.execute("SELECT COALESCE(MAX(seq), 0), COALESCE(MIN(seq), 0) FROM changes").fetchone()
+            if latest == seq: return latest, {}
+            if seq < oldest - 1: return latest, None
+            # Yläraja latest: samaan aikaan kirjoitettu muutos jää seuraavalle kutsulle, ei katoa
+            ids = [r[0] for r in self._conn.execute("SELECT DISTINCT id FROM changes WHERE user = ? AND seq > ? AND seq <= ?", (user, seq, latest))]
+            changed = {}
+            for item_id in ids:
+                # Nykytila luetaan kannasta: useampi muutos samaan riviin = yksi haku
+                row = self._conn.execute("SELECT id, version, data FROM applications WHERE id = ? AND user = ?", (item_id, user)).fetchone()
+                changed[item_id] = _decode(*row) if row else None
+        return latest, changed
+
+    def dismiss(self, key, user=DEFAULT_USER):
+        """Tallentaa ohitetun suosituksen, jotta se pysyy piilossa myös seuraavissa istunnoissa."""
+        with self._write() as conn:
+            conn.execute("INSERT OR IGNORE INTO dismissals (user, key, dismissed_at) VALUES (?, ?, ?)", (user, key, time.time()))
+
+    def undismiss(self, key, user=DEFAULT_USER):
+        with self._write() as conn:
+            conn.execute("DELETE FROM dismissals WHERE user = ? AND key = ?", (user, key))
+
+    def dismissed(self, user=DEFAULT_USER):
+        with self._lock:
+            return [r[0] for r in self._conn.execute("SELECT key FROM dismissals WHERE user = ? ORDER BY dismissed_at", (user,))]
+
+    def is_empty(self, user=DEFAULT_USER):
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM applications WHERE user = ? LIMIT 1", (user,)).fetchone() is None
+
+    def migrate_json(self, json_path, user=DEFAULT_USER):
+        """Kertaluonteinen siirto vanhasta JSON-tiedostosta. Onnistuessa tiedosto nimetään *.migrated."""
+        if not os.path.exists(json_path) or not self.is_empty(user): return 0
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                items = json.load(f)
+        except (OSError, ValueError) as e:
+            # Rikkinäistä tiedostoa ei nimetä uudelleen, jotta sen voi korjata käsin
+            print(f"Virhe JSON-siirrossa ({json_path}): {e}")
+            return 0
+        self.replace_all(items, user)
+        os.replace(json_path, json_path + ".migrated")
+        return len(items)
+
+    def migrate_dates(self):
+        """Muuntaa vanhat vuodettomat "dd.mm."-päivämäärät ISO-muotoon (kaikki käyttäjät, yksi transaktio).
+
+        Vuosi päätellään siirtohetkestä (ks. records.parse_date). Palauttaa muutettujen rivien määrän.
+        """
+        with self._write() as conn:
+            rows = conn.execute("SELECT id, user, version, data FROM applications").fetchall()
+            migrated = 0
+            for item_id, user, version, data in rows:
+                item = _decode(item_id, version, data)
+                if not ApplicationRecord.needs_migration(item): continue
+                conn.execute("UPDATE applications SET data = ?, version = version + 1 WHERE id = ?", (_encode(ApplicationRecord.from_dict(item).to_dict()), item_id))
+                self._log(conn, user, item_id)
+                migrated += 1
+        return migrated
@@ -0,0 +1,220 @@
+import io
+import re
+import csv
+import json
+import time
+import datetime
+import sqlite3
+import threading
+import urllib.parse
+
+from http_client import shared_client
+from instrumentation import span
+
+# ---------------------------------------------------------
+# VIERAILIJALOKI (inkrementaalinen paikallinen kopio)
+# ---------------------------------------------------------
+
+VISITORS_DB = "visitors.db"
+SYNC_INTERVAL = 60
+FETCH_TIMEOUT = 10
+TIME_COL, VISITOR_COL, COMPANY_COL = 0, 1, 2   # Sheetin sarakkeet: aikaleima, vierailija, yritys
+
+# Eksplisiittinen skeema: luetaan vain nämä sarakkeet, aikaleima datetimeksi ja
+# toistuvat tekstit kategorioiksi (yksi kopio jokaisesta arvosta koodeineen)
+VISITOR_SCHEMA = {"timestamp": TIME_COL, "visitor": VISITOR_COL, "company": COMPANY_COL}
+CATEGORY_COLUMNS = ("visitor", "company")
+TIMESTAMP_FORMATS = ("%Y-%m-%d %H:%M:%S", "%d.%m.%Y %H:%M:%S", "%d.%m.%Y %H:%M", "%m/%d/%Y %H:%M:%S", "%d.%m.%Y", "%Y-%m-%d")
+_FI_TIME = re.compile(r"(\d{1,2})\.(\d{2})(?:\.(\d{2}))?$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS visits (row_num INTEGER PRIMARY KEY, ts TEXT, at TEXT, day TEXT, visitor TEXT, company TEXT, data TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS company_counts (company TEXT PRIMARY KEY, n INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS daily_counts (day TEXT PRIMARY KEY, n INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def sheet_query_url(sheet_id, offset=0):
+    """Google Sheetsin gviz-kysely, joka palauttaa CSV:nä vain rivit offsetista eteenpäin."""
+    query = f"select * offset {offset}" if offset else "select *"
+    return f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?" + urllib.parse.urlencode({"tqx": "out:csv", "headers": 1, "tq": query})
+
+
+def _normalize_ts(ts):
+    """Suomalainen kellonaika "9.31.00" -> "9:31:00"."""
+    ts = str(ts).strip()
+    return _FI_TIME.sub(lambda m: ":".join(g for g in m.groups() if g), ts) if " " in ts else ts
+
+def parse_timestamp(ts):
+    """Yksittäinen aikaleima datetimeksi, tai None."""
+    ts = _normalize_ts(ts)
+    for fmt in TIMESTAMP_FORMATS:
+        try:
+            return datetime.datetime.strptime(ts, fmt)
+        except ValueError:
+            continue
+    return None
+
+def day_of(ts):
+    """ISO-päivä (lajittuu aikajärjestykseen); tuntematon muoto palautetaan sellaisenaan."""
+    parsed = parse_timestamp(ts)
+    return parsed.date().isoformat() if parsed else str(ts).split(" ")[0]
+
+def parse_timestamps(values):
+    """Vektorisoitu aikaleimojen jäsennys (NaT, jos muotoa ei tunnisteta).
+
+    Tunnetut muodot kokeillaan yksi kerrallaan vain jäsentymättä jääneille riveille;
+    hidas rivikohtainen "mixed"-jäsennys ajetaan vain lopuille.
+    """
+    import pandas as pd   # vasta käytettäessä: synkronointi ja tunnusluvut eivät tarvitse pandasia
+    values = pd.Series(values, dtype="string").str.strip()
+    values = values.str.replace(r" (\d{1,2})\.(\d{2})\.(\d{2})$", r" \1:\2:\3", regex=True).str.replace(r" (\d{1,2})\.(\d{2})$", r" \1:\2", regex=True)
+    parsed = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+    for fmt in TIMESTAMP_FORMATS:
+        missing = parsed.isna() & values.notna()
+        if not missing.any(): return parsed
+        parsed[missing] = pd.to_datetime(values[missing], format=fmt, errors="coerce")
+    missing = parsed.isna() & values.notna()
+    if missing.any(): parsed[missing] = pd.to_datetime(values[missing], format="mixed", dayfirst=True, errors="coerce")
+    return parsed
+
+def apply_schema(df):
+    """Nimeää sarakkeet skeeman mukaan ja muuntaa tyypit (datetime + category)."""
+    df = df.rename(columns=dict(zip(df.columns, VISITOR_SCHEMA))) if not set(VISITOR_SCHEMA) <= set(df.columns) else df
+    df["timestamp"] = parse_timestamps(df["timestamp"])
+    for col in CATEGORY_COLUMNS:
+        if col in df: df[col] = df[col].astype("category")
+    return df
+
+def read_visitor_csv(source, chunksize=None):
+    """Lukee vierailija-CSV:n tyypitettynä: vain skeeman sarakkeet, paloissa jos chunksize annetaan."""
+    import pandas as pd
+    kwargs = {"usecols": list(VISITOR_SCHEMA.values()), "dtype": "string"}
+    if not chunksize: return apply_schema(pd.read_csv(source, **kwargs))
+    frames = [apply_schema(chunk) for chunk in pd.read_csv(source, chunksize=chunksize, **kwargs)]
+    if not frames: return apply_schema(pd.DataFrame(columns=list(VISITOR_SCHEMA)))
+    # Palojen kategoriat yhdistetään, jotta lopputulos pysyy kategorisena
+    for col in CATEGORY_COLUMNS:
+        categories = pd.api.types.union_categoricals([f[col] for f in frames]).categories
+        for f in frames: f[col] = f[col].cat.set_categories(categories)
+    return pd.concat(frames, ignore_index=True)
+
+
+class VisitorLog:
+    """Pitää Sheetin vierailijalokin paikallisessa SQLite-kannassa ja hakee vain uudet rivit.
+
+    url_for_offset(offset) palauttaa osoitteen, josta saa CSV:n (otsikkorivi + rivit offsetista alkaen);
+    testeissä sen voi osoittaa paikalliseen CSV-palvelimeen. Haku on ehdollinen: jos palvelin
+    antaa ETag/Last-Modified-otsakkeet, muuttumaton Sheet vastaa 304 eikä CSV:tä siirretä.
+    """
+
+    def __init__(self, url_for_offset, path=VISITORS_DB, client=None, min_interval=SYNC_INTERVAL):
+        self.url_for_offset = url_for_offset
+        self.client = client or shared_client()
+        self.min_interval = min_interval
+        self._lock = threading.Lock()         # kannan käsittely
+        self._sync_lock = threading.Lock()    # vain yksi haku kerrallaan; lukijat eivät odota verkkoa
+        self._last_sync = None
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        if "at" not in {c[1] for c in self._conn.execute("PRAGMA table_info(visits)")}:
+            # Vanha kanta (päivät merkkijonoina, ei tyypitettyjä sarakkeita):
+            # tyhjennetään, jolloin seuraava synkronointi hakee kaiken uudelleen
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.execute("DROP TABLE visits")
+                for table in ("company_counts", "daily_counts"): self._conn.execute(f"DELETE FROM {table}")
+            self._conn.executescript(SCHEMA)
+
+    def _fetch(self, offset, conditional=True):
+        """(otsikko, rivit) offsetista alkaen, tai None, jos vastaus on 304 (ei uusia rivejä)."""
+        with span("vierailijaloki", "network", offset=offset):
+            reply = self.client.get(self.url_for_offset(offset), timeout=FETCH_TIMEOUT, conditional=conditional)
+        reply.raise_for_status()
+        if reply.not_modified: return None
+        reader = csv.reader(io.StringIO(reply.text("utf-8")))
+        header = next(reader, None)
+        return header, [row for row in reader if any(row)]
+
+    def _count(self):
+        return self._conn.execute("SELECT COUNT(*) FROM visits").fetchone()[0]
+
+    def _last_ts(self):
+        row = self._conn.execute("SELECT ts FROM visits ORDER BY row_num DESC LIMIT 1").fetchone()
+        return row[0] if row else None
+
+    def sync(self, force=False):
+        """Hakee uudet rivit. Palauttaa lisättyjen rivien määrän (0, jos haku ohitettiin)."""
+        with self._sync_lock:
+            if not force and self._last_sync and time.monotonic() - self._last_sync < self.min_interval: return 0
+            self._last_sync = time.monotonic()
+            with self._lock:
+                known, last_ts = self._count(), self._last_ts()
+            # Haetaan myös viimeisin tunnettu rivi: jos se ei täsmää, Sheetiä on muokattu -> täysi synkronointi
+            offset = max(known - 1, 0)
+            fetched = self._fetch(offset)
+            if fetched is None: return 0
+            header, rows = fetched
+            reset = bool(known) and (not rows or rows[0][TIME_COL] != last_ts)
+            if reset:
+                offset = 0
+                header, rows = self._fetch(0, conditional=False)
+                known = 0
+            new_rows = rows[known - offset:] if known else rows
+            try:
+                with self._lock:
+                    self._append(header, new_rows, start=known, reset=reset)
+            except Exception:
+                # Käsittelemätön vastaus ei saa jäädä 304:n taakse
+                self.client.forget(self.url_for_offset(offset))
+                raise
+            return len(new_rows)
+
+    def _append(self, header, rows, start, reset=False):
+        if header is None: return
+        with self._conn:
+            self._conn.execute("BEGIN")
+            if reset:
+                for table in ("visits", "company_counts", "daily_counts"): self._conn.execute(f"DELETE FROM {table}")
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('columns', ?)", (json.dumps(header, ensure_ascii=False),))
+            for i, row in enumerate(rows, start=start):
+                ts = row[TIME_COL] if len(row) > TIME_COL else ""
+                visitor = row[VISITOR_COL] if len(row) > VISITOR_COL else ""
+                company = row[COMPANY_COL] if len(row) > COMPANY_COL else ts
+                # Aikaleima jäsennetään kerran tallennettaessa; luku käyttää nopeaa ISO-muotoa
+                parsed = parse_timestamp(ts)
+                day = parsed.date().isoformat() if parsed else day_of(ts)
+                at = parsed.isoformat(sep=" ") if parsed else None
+                self._conn.execute("INSERT INTO visits (row_num, ts, at, day, visitor, company, data) VALUES (?, ?, ?, ?, ?, ?, ?)", (i, ts, at, day, visitor, company, json.dumps(row, ensure_ascii=False)))
+                # Esiaggregoidut laskurit päivitetään samassa transaktiossa
+                self._conn.execute("INSERT INTO company_counts (company, n) VALUES (?, 1) ON CONFLICT(company) DO UPDATE SET n = n + 1", (company,))
+                self._conn.execute("INSERT INTO daily_counts (day, n) VALUES (?, 1) ON CONFLICT(day) DO UPDATE SET n = n + 1", (day,))
+
+    def columns(self):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'columns'").fetchone()
+        return json.loads(row[0]) if row else []
+
+    def summary(self, top=7):
+        """Tunnusluvut suoraan esiaggregoiduista tauluista (ei koko lokin läpikäyntiä)."""
+        with self._lock:
+            count = self._count()
+            if not count: return None
+            ts, company = self._conn.execute("SELECT ts, company FROM visits ORDER BY row_num DESC LIMIT 1").fetchone()
+            top_rows = self._conn.execute("SELECT company, n FROM company_counts ORDER BY n DESC, company LIMIT ?", (top,)).fetchall()
+        parsed = parse_timestamp(ts)
+        return {"count": count, "latest_company": company, "latest_date": parsed.strftime("%d.%m.%Y") if parsed else day_of(ts), "top": dict(top_rows) if len(self.columns()) > COMPANY_COL else {}}
+
+    def daily_counts(self):
+        with self._lock:
+            return dict(self._conn.execute("SELECT day, n FROM daily_counts ORDER BY day").fetchall())
+
+    def frame(self, limit=None):
+        """Loki tyypitettynä DataFramena (uusin ensin): timestamp, visitor, company."""
+        import pandas as pd
+        query = "SELECT COALESCE(at, ts) AS timestamp, visitor, company FROM visits ORDER BY row_num DESC"
+        with self._lock:
+            df = pd.read_sql_query(query + (" LIMIT ?" if limit else ""), self._conn, params=(limit,) if limit else None, dtype="string")
+        return apply_schema(df)